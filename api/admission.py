@@ -0,0 +1,64 @@
+"""
+Kokoro TTS API v2 - Admission Control
+
+Nothing bounds how much work can queue behind the MLX worker, so under
+overload every request gets slow rather than some failing fast. Before an
+interactive request is queued, its wait is predicted from the scheduler's
+queue and average service time (PriorityExecutor.estimated_wait). Above
+ADMISSION_MAX_WAIT_MS the request is rejected with 429, and Retry-After
+gives the time until the queue should be back within the budget.
+
+Rejection happens after cheaper options: responses served from the file
+cache never reach the worker, and quality degradation (api/degradation.py)
+starts well below the admission budget.
+"""
+
+import logging
+import math
+import threading
+from typing import Any, Optional
+
+from .config import ADMISSION_ENABLED, ADMISSION_MAX_WAIT_MS
+from .scheduler import Priority
+from .tts import estimated_wait, get_queue_state
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+    """Admits or rejects new work by its predicted queue wait."""
+
+    def __init__(self, max_wait_ms: float = ADMISSION_MAX_WAIT_MS, enabled: bool = ADMISSION_ENABLED):
+        self.max_wait_ms = max_wait_ms
+        self.enabled = enabled
+        self._admitted = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def check(self, priority: Priority = Priority.INTERACTIVE) -> Optional[int]:
+        """None if the work may be queued, otherwise the Retry-After in seconds."""
+        wait_ms = estimated_wait(priority) * 1000
+        if not self.enabled or wait_ms <= self.max_wait_ms:
+            with self._lock:
+                self._admitted += 1
+            return None
+        with self._lock:
+            self._rejected += 1
+        retry_after = max(1, math.ceil((wait_ms - self.max_wait_ms) / 1000))
+        logger.warning(f"Rejected request: predicted wait {wait_ms:.0f}ms "
+                       f"exceeds {self.max_wait_ms:.0f}ms (retry after {retry_after}s)")
+        return retry_after
+
+    def to_dict(self) -> dict[str, Any]:
+        """Queue state (see get_queue_state) with the budget and admission counts."""
+        with self._lock:
+            counts = {"admitted": self._admitted, "rejected": self._rejected}
+        return {
+            **get_queue_state(),
+            "enabled": self.enabled,
+            "max_wait_ms": self.max_wait_ms,
+            **counts,
+        }
+
+
+admission = AdmissionController()
@@ -0,0 +1,147 @@
+"""
+Kokoro TTS API v2 - Prepared Model Artifacts
+
+KokoroTTS.from_pretrained redoes the same work on every start: it checks
+the Hugging Face Hub for the snapshot, upcasts every bf16 tensor to float32
+and maps the 548 PyTorch weight names onto the MLX modules (transposing
+plain convolutions and summing LSTM biases on the way).
+
+On the first start, the resulting parameters are saved as one float32
+safetensors file in MODEL_CACHE_DIR. The file name is a hash of the model
+files, config, kokoro-mlx and MLX versions. Later starts resolve the
+snapshot from the local Hub cache without network access and load the
+prepared file straight into the model, so cold start is mostly file reads.
+A corrupt or unwritable artifact falls back to the normal load.
+
+set_precision lowers a loaded model to bf16 or quantized weights for
+model variants (see MODEL_VARIANTS). The vocoder, which holds most of the
+parameters, stays float32: kokoro-mlx upcasts it for numerical stability,
+so variants mostly speed up the text side (ALBERT, duration and prosody
+predictors, text encoder).
+"""
+
+import hashlib
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+
+import kokoro_mlx
+import mlx.core as mx
+import mlx.nn as nn
+from kokoro_mlx import KokoroConfig, KokoroTTS, VoiceManager
+from kokoro_mlx.model import KokoroModel
+from mlx.utils import tree_flatten, tree_map
+
+from .config import MODEL_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+_ARTIFACT_FORMAT = 1  # Bump when the layout of saved artifacts changes
+
+PRECISIONS = ("fp32", "bf16", "q8", "q4")
+_VOCODER = "decoder"
+_QUANT_GROUP_SIZE = 64
+
+
+def resolve_model_path(model_id: str) -> Path:
+    """Local directory for a model path or Hub repo id, preferring the local Hub cache."""
+    path = Path(model_id)
+    if path.is_dir():
+        return path
+
+    from huggingface_hub import snapshot_download
+    try:
+        return Path(snapshot_download(repo_id=model_id, local_files_only=True))
+    except Exception:
+        logger.info(f"{model_id} not in the local Hub cache; downloading")
+        return Path(snapshot_download(repo_id=model_id))
+
+
+def artifact_key(model_path: Path) -> str:
+    """Hash of everything the prepared parameters depend on."""
+    key = hashlib.sha256()
+    key.update(f"format={_ARTIFACT_FORMAT};kokoro_mlx={kokoro_mlx.__version__};mlx={mx.__version__}\n".encode())
+    key.update((model_path / "config.json").read_bytes())
+    for weights in sorted(model_path.glob("*.safetensors")):
+        stat = weights.stat()
+        # Size and mtime, not content: hashing ~300 MB would cost what the artifact saves
+        key.update(f"{weights.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return key.hexdigest()
+
+
+def artifact_path(model_path: Path, cache_dir: str = MODEL_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, f"kokoro-{artifact_key(model_path)[:16]}.safetensors")
+
+
+def _save_artifact(model: KokoroModel, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp.safetensors"
+    mx.save_safetensors(temp_path, dict(tree_flatten(model.parameters())))
+    os.replace(temp_path, path)
+
+
+def _load_artifact(config: KokoroConfig, path: str) -> KokoroModel:
+    model = KokoroModel(config)
+    model.load_weights(path, strict=True)
+    mx.eval(model.parameters())
+    return model
+
+
+def load_model(model_id: str, cache_dir: str = MODEL_CACHE_DIR) -> KokoroTTS:
+    """
+    Load a KokoroTTS model, from the prepared artifact when one exists
+    (building it otherwise).
+    """
+    start_time = time.perf_counter()
+    model_path = resolve_model_path(model_id)
+    config = KokoroConfig.from_pretrained(model_path)
+    path = artifact_path(model_path, cache_dir)
+
+    model = None
+    if os.path.exists(path):
+        try:
+            model = _load_artifact(config, path)
+            logger.info(f"Loaded prepared model {os.path.basename(path)} "
+                        f"in {(time.perf_counter() - start_time) * 1000:.0f}ms")
+        except Exception as e:
+            logger.warning(f"Prepared model {path} unusable ({e}); rebuilding")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    if model is None:
+        model = KokoroModel.from_pretrained(model_path)
+        try:
+            _save_artifact(model, path)
+            logger.info(f"Saved prepared model to {path}")
+        except OSError as e:
+            logger.warning(f"Prepared model not cached ({e})")
+
+    return KokoroTTS(model=model, config=config, voice_manager=VoiceManager(model_path), model_path=model_path)
+
+
+def _quantizable(path: str, module: nn.Module) -> bool:
+    return (
+        isinstance(module, (nn.Linear, nn.Embedding))
+        and not path.startswith(_VOCODER)
+        and module.weight.shape[-1] % _QUANT_GROUP_SIZE == 0
+    )
+
+
+def set_precision(tts: KokoroTTS, precision: str) -> None:
+    """Lower everything but the vocoder to precision (one of PRECISIONS), in place."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r} (expected one of {', '.join(PRECISIONS)})")
+    model = tts._model
+    if precision == "bf16":
+        model.update({
+            name: tree_map(lambda p: p.astype(mx.bfloat16) if mx.issubdtype(p.dtype, mx.floating) else p, params)
+            for name, params in model.parameters().items()
+            if name != _VOCODER
+        })
+    elif precision in ("q8", "q4"):
+        nn.quantize(model, group_size=_QUANT_GROUP_SIZE, bits=int(precision[1:]), class_predicate=_quantizable)
+    mx.eval(model.parameters())
@@ -0,0 +1,132 @@
+"""
+Kokoro TTS API v2 - Batch Synthesis
+
+Many short inputs in one request, for offline jobs that would otherwise pay
+HTTP, validation and scheduling overhead per prompt.
+
+Items are reordered for throughput — grouped by voice and speed, then by
+length, so consecutive model calls reuse the same voice pack and similar
+shapes — and submitted at Priority.BATCH, so interactive requests always
+run first and batches soak up idle capacity. Only BATCH_MAX_IN_FLIGHT items
+are queued at a time, which bounds memory and keeps the interactive queue
+short.
+
+Results stream back as they complete in a multipart/mixed body. Every part
+carries X-Item-Index (position in the request), X-Item-Id (if given) and
+X-Item-Status; failed items are JSON parts with status 500 (504 when the
+item's timeout_ms passed first) and do not affect the rest of the batch.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, AsyncGenerator, Sequence
+
+import numpy as np
+
+from .config import BATCH_MAX_IN_FLIGHT
+from .loudness import normalize_loudness
+from .scheduler import DeadlineExceeded, Priority, deadline_after
+from .streaming import audio_to_pcm_bytes, create_wav_header, get_audio_duration, trim_silence
+from .tts import submit_audio
+
+logger = logging.getLogger(__name__)
+
+
+def new_boundary() -> str:
+    """Random multipart boundary."""
+    return f"kokoro-batch-{uuid.uuid4().hex}"
+
+
+def schedule_order(items: Sequence[Any]) -> list[int]:
+    """Item indices in execution order: grouped by voice and speed, short first."""
+    return sorted(range(len(items)), key=lambda i: (items[i].voice, items[i].speed, len(items[i].input)))
+
+
+def _part(boundary: str, headers: dict[str, Any], body: bytes) -> bytes:
+    lines = [f"--{boundary}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    lines.append(f"Content-Length: {len(body)}")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode()
+    return head + body + b"\r\n"
+
+
+def _postprocess(item: Any, audio: np.ndarray) -> np.ndarray:
+    if item.trim_silence:
+        audio, _ = trim_silence(audio)
+    if item.normalize_loudness:
+        audio = normalize_loudness(audio)
+    return audio
+
+
+async def stream_batch(
+    items: Sequence[Any],
+    boundary: str,
+    response_format: str = "pcm",
+    max_in_flight: int = BATCH_MAX_IN_FLIGHT,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Synthesize items and yield one multipart part per item as each completes.
+
+    Args:
+        items: Validated batch items (input, voice, speed and options; optional id).
+        boundary: Multipart boundary, as declared in the response Content-Type.
+        response_format: "pcm" or "wav" for every item's audio.
+        max_in_flight: Items queued on the MLX worker at once.
+    """
+    order = iter(schedule_order(items))
+    deadlines = [deadline_after(getattr(item, "timeout_ms", None)) for item in items]
+    pending: dict[asyncio.Future, int] = {}
+    include_wav = response_format == "wav"
+
+    def _submit_next() -> bool:
+        index = next(order, None)
+        if index is None:
+            return False
+        item = items[index]
+        future = asyncio.wrap_future(
+            submit_audio(
+                item.input, voice=item.voice, speed=item.speed, priority=Priority.BATCH,
+                variant=getattr(item, "model", None), deadline=deadlines[index],
+            )
+        )
+        pending[future] = index
+        return True
+
+    try:
+        while len(pending) < max_in_flight and _submit_next():
+            pass
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                item = items[index]
+                headers: dict[str, Any] = {"X-Item-Index": index}
+                if getattr(item, "id", None) is not None:
+                    headers["X-Item-Id"] = item.id
+
+                try:
+                    audio = await asyncio.to_thread(_postprocess, item, future.result())
+                except Exception as e:
+                    logger.error(f"Batch item {index} failed: {e}")
+                    headers["Content-Type"] = "application/json"
+                    headers["X-Item-Status"] = 504 if isinstance(e, DeadlineExceeded) else 500
+                    yield _part(boundary, headers, json.dumps({"detail": str(e)}).encode())
+                else:
+                    body = audio_to_pcm_bytes(audio)
+                    if include_wav:
+                        body = create_wav_header(len(audio)) + body
+                    headers["Content-Type"] = "audio/wav" if include_wav else "audio/pcm"
+                    headers["X-Item-Status"] = 200
+                    headers["X-Audio-Duration"] = get_audio_duration(audio)
+                    yield _part(boundary, headers, body)
+
+                _submit_next()
+
+        yield f"--{boundary}--\r\n".encode()
+    finally:
+        # Client went away mid-batch: drop queued items that have not started
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,208 @@
+"""
+Kokoro TTS API v2 - Rendered Audio Cache
+
+Finished non-streaming results written to disk (tmpfs where available) so
+they can be served with FileResponse: the body goes out via the server's
+sendfile/pathsend path or chunked file reads off the event loop, instead of
+one large bytes object pushed through a Python generator, and Range
+requests let players seek.
+
+Files are named by a content key derived from everything that determines
+the output, so a repeated request is served from disk without inference.
+Synthesis is deterministic, so the same key doubles as the response ETag:
+clients and proxies revalidate with If-None-Match and get a 304 without
+the server synthesizing or reading anything.
+The directory is bounded by RESPONSE_CACHE_MAX_MB; least recently used
+files are evicted first.
+
+Results too short for the file cache can be kept in an AudioMemoryCache
+instead (used for the 1.0 renderings behind time-stretched speeds).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from .config import (
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_MAX_MB,
+    SAMPLE_RATE,
+    TIME_STRETCH_CACHE_MB,
+)
+from .streaming import audio_to_pcm_bytes, create_wav_header
+from .tts import model_key
+
+logger = logging.getLogger(__name__)
+
+_WRITE_BLOCK_SAMPLES = SAMPLE_RATE  # Convert and write one second at a time
+_FILE_NAME = re.compile(r"^[0-9a-f]{64}\.(wav|pcm)$")
+
+
+def content_key(
+    text: str,
+    voice: str,
+    speed: float,
+    response_format: str,
+    trim_silence: bool = False,
+    normalize_loudness: bool = False,
+    stretch: Optional[str] = None,
+    model: Optional[str] = None,
+) -> str:
+    """
+    Deterministic key for a synthesis result (hex SHA-256).
+
+    stretch is the time-stretch quality when speed is derived from a 1.0
+    rendering rather than synthesized directly. model is the requested
+    variant; the hash of the model that serves it is part of the key, so
+    variants never share results and results never outlive a model reload.
+    """
+    params = {
+        "model": model_key(model),
+        "text": text,
+        "voice": voice,
+        "speed": round(float(speed), 4),
+        "format": response_format,
+        "trim_silence": trim_silence,
+        "normalize_loudness": normalize_loudness,
+    }
+    if stretch is not None:
+        params["stretch"] = stretch
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def etag_for(key: str) -> str:
+    return f'"{key}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def file_name(key: str, response_format: str) -> str:
+    return f"{key}.{'wav' if response_format == 'wav' else 'pcm'}"
+
+
+def media_type_for(name: str) -> str:
+    return "audio/wav" if name.endswith(".wav") else "audio/pcm"
+
+
+def file_duration(path: str) -> float:
+    """Duration in seconds of a cached clip, from its size."""
+    data_bytes = os.path.getsize(path) - (44 if path.endswith(".wav") else 0)
+    return data_bytes / 2 / SAMPLE_RATE
+
+
+def load_audio(path: str) -> np.ndarray:
+    """Read a cached clip back as float32 audio."""
+    offset = 44 if path.endswith(".wav") else 0
+    pcm = np.fromfile(path, dtype="<i2", offset=offset)
+    return pcm.astype(np.float32) / 32767
+
+
+class AudioMemoryCache:
+    """In-memory audio by content key, bounded by max_mb (least recently used evicted first)."""
+
+    def __init__(self, max_mb: float = TIME_STRETCH_CACHE_MB):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+            return audio
+
+    def put(self, key: str, audio: np.ndarray) -> None:
+        if audio.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = audio
+            self._bytes += audio.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class AudioFileCache:
+    """Size-bounded directory of rendered clips, keyed by content_key."""
+
+    def __init__(self, directory: str = RESPONSE_CACHE_DIR, max_mb: float = RESPONSE_CACHE_MAX_MB):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> Optional[str]:
+        """Path of a cached file by name, or None (marks it recently used)."""
+        if not _FILE_NAME.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get(self, key: str, response_format: str) -> Optional[str]:
+        return self.path(file_name(key, response_format))
+
+    def put(self, key: str, response_format: str, audio: np.ndarray) -> str:
+        """Write audio as 16-bit PCM (with WAV header for "wav"); returns the path."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, file_name(key, response_format))
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        with open(temp_path, "wb") as f:
+            if response_format == "wav":
+                f.write(create_wav_header(len(audio)))
+            for start in range(0, len(audio), _WRITE_BLOCK_SAMPLES):
+                f.write(audio_to_pcm_bytes(audio[start:start + _WRITE_BLOCK_SAMPLES]))
+        os.replace(temp_path, path)
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Remove least recently used files (never keep) until the directory fits max_bytes."""
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if _FILE_NAME.match(entry.name):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                logger.debug(f"Evicted cached audio {os.path.basename(path)}")
@@ -6,6 +6,15 @@ Uses kokoro-mlx for Apple Silicon GPU-accelerated inference.
 """
 
 import os
+import tempfile
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean environment variable ("1", "true", "yes" are truthy)."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
 
 # Server settings
 HOST = os.getenv("TTS_HOST", "0.0.0.0")
@@ -24,6 +33,135 @@ MAX_SPEED = 2.0
 
 # MLX model settings
 MODEL_ID = os.getenv("KOKORO_MODEL_ID", "mlx-community/Kokoro-82M-bf16")
+# Prepared (upcast, remapped) weights saved on first start and loaded directly after
+MODEL_ARTIFACTS = _env_flag("TTS_MODEL_ARTIFACTS", True)
+MODEL_CACHE_DIR = os.getenv("TTS_MODEL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "kokoro-model"))
+RELOAD_DRAIN_TIMEOUT_S = float(os.getenv("TTS_RELOAD_DRAIN_TIMEOUT_S", "300"))  # Wait for in-flight streams on a replaced model
+
+
+def _parse_variants(spec: str) -> dict[str, tuple[str, str]]:
+    """Parse "name=model_id[@precision],..." into {name: (model_id, precision)}."""
+    variants = {}
+    for entry in spec.split(","):
+        name, _, target = entry.strip().partition("=")
+        if not name or not target:
+            continue
+        model_id, _, precision = target.strip().partition("@")
+        variants[name.strip()] = (model_id or MODEL_ID, precision or "fp32")
+    return variants
+
+# Extra model variants served alongside MODEL_ID and chosen by the request's
+# "model" field, e.g. "fast=mlx-community/Kokoro-82M-bf16@q8,half=@bf16".
+# Precision is fp32 (as loaded), bf16, q8 or q4 (quantized weights; the
+# vocoder always stays fp32). Variants share one set of voice tensors.
+MODEL_VARIANTS = _parse_variants(os.getenv("TTS_MODEL_VARIANTS", ""))
+
+# POST /admin/reload: callers send "Authorization: Bearer <TTS_ADMIN_TOKEN>";
+# without a token only loopback clients may call it (behind a local reverse
+# proxy every client looks local, so set a token there). It only loads
+# MODEL_ID, the variants' models, or ids listed in TTS_RELOAD_MODELS.
+ADMIN_TOKEN = os.getenv("TTS_ADMIN_TOKEN", "")
+RELOAD_MODELS = list(dict.fromkeys(
+    [MODEL_ID, *(model_id for model_id, _ in MODEL_VARIANTS.values())]
+    + [m.strip() for m in os.getenv("TTS_RELOAD_MODELS", "").split(",") if m.strip()]
+))
+
+# Inference workers. Values above 1 run segments of long texts in parallel
+# and are refused at startup unless MLX runs on the CPU (see api/tts.py):
+# concurrent inference on Metal aborts the process. All workers share one
+# model instance, so this relies on MLX's CPU backend being reentrant.
+INFERENCE_WORKERS = max(1, int(os.getenv("TTS_INFERENCE_WORKERS", "1")))
+PARALLEL_MIN_CHARS = int(os.getenv("TTS_PARALLEL_MIN_CHARS", "600"))  # Shorter texts run as one call
+PARALLEL_SEGMENT_CHARS = 400  # Sentences are packed into segments of about this size
+
+# Voice packs, stacked into one memory-mapped array at startup
+VOICE_CACHE_DIR = os.getenv("TTS_VOICE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "kokoro-voices"))
+VOICE_BLEND_CACHE_SIZE = int(os.getenv("TTS_VOICE_BLEND_CACHE_SIZE", "32"))  # Mixed style tensors kept (LRU)
+VOICE_LOADING = os.getenv("TTS_VOICE_LOADING", "eager")  # "eager": whole pack paged in (shared mmap); "lazy": load on first use
+VOICE_CACHE_BUDGET_MB = float(os.getenv("TTS_VOICE_CACHE_BUDGET_MB", "16"))  # Lazy: resident, prefetched and blended voices (~0.5 MB each)
+VOICE_PINNED = [v.strip() for v in os.getenv("TTS_VOICE_PINNED", DEFAULT_VOICE).split(",") if v.strip()]
 
 # Warmup settings
-WARMUP_TEXT = "System ready."
+WARMUP_TEXT = "System ready."  # Single call before readiness
+# Background warmup plan, run after readiness: every voice in WARMUP_VOICES
+# (list the most-used ones) at every length bucket, in characters (roughly
+# phonemes for English); each is run WARMUP_REPEATS times to separate the
+# first call from steady-state latency
+WARMUP_ENABLED = _env_flag("TTS_WARMUP", True)
+WARMUP_BUCKETS = [int(n) for n in os.getenv("TTS_WARMUP_BUCKETS", "32,64,128,256,400").split(",") if n.strip()]
+WARMUP_VOICES = [v.strip() for v in os.getenv("TTS_WARMUP_VOICES", DEFAULT_VOICE).split(",") if v.strip()]
+WARMUP_REPEATS = max(2, int(os.getenv("TTS_WARMUP_REPEATS", "3")))
+
+# Input length statistics (saved across restarts). Once enough samples are
+# recorded, the warmup plan uses lengths at these traffic quantiles instead
+# of WARMUP_BUCKETS.
+TRAFFIC_STATS_PATH = os.getenv("TTS_TRAFFIC_STATS_PATH", os.path.join(tempfile.gettempdir(), "kokoro-traffic.json"))
+TRAFFIC_MIN_SAMPLES = int(os.getenv("TTS_TRAFFIC_MIN_SAMPLES", "200"))
+TRAFFIC_BUCKET_QUANTILES = (0.25, 0.5, 0.75, 0.9, 0.99)
+
+# Startup: the model loads in the background; speech requests arriving
+# before it is ready wait up to this long, then get 503 with Retry-After
+READY_TIMEOUT_S = float(os.getenv("TTS_READY_TIMEOUT_S", "30"))
+READY_RETRY_AFTER_S = 5
+
+# Loudness normalization (contract: LUFS -16 ±1 LU, dBTP <= -1.0)
+LOUDNESS_NORMALIZE = _env_flag("TTS_LOUDNESS_NORMALIZE", False)
+LOUDNESS_TARGET_LUFS = -16.0
+TRUE_PEAK_CEILING_DB = -1.0
+LOUDNESS_LOOKAHEAD_MS = float(os.getenv("TTS_LOUDNESS_LOOKAHEAD_MS", "10"))  # Limiter hold-back
+LOUDNESS_MAX_GAIN_DB = 20.0  # Never boost quiet segments by more than this
+
+# Silence trimming and segment joins (live streaming)
+TRIM_SILENCE = _env_flag("TTS_TRIM_SILENCE", False)
+SILENCE_THRESHOLD_DB = float(os.getenv("TTS_SILENCE_THRESHOLD_DB", "-45"))  # dBFS
+SILENCE_PAD_MS = 10  # Keep this much silence before the first word
+MAX_JOIN_SILENCE_MS = float(os.getenv("TTS_MAX_JOIN_SILENCE_MS", "300"))  # Longest pause kept between segments
+CROSSFADE_MS = float(os.getenv("TTS_CROSSFADE_MS", "5"))  # Equal-power crossfade at segment joins
+
+# Incremental text input (WebSocket text streams)
+INCREMENTAL_MAX_CHARS = int(os.getenv("TTS_INCREMENTAL_MAX_CHARS", "300"))  # Force a split past this
+
+# Batch synthesis
+BATCH_MAX_ITEMS = int(os.getenv("TTS_BATCH_MAX_ITEMS", "10000"))
+BATCH_MAX_IN_FLIGHT = int(os.getenv("TTS_BATCH_MAX_IN_FLIGHT", "4"))  # Queued items per batch request
+
+# Asynchronous jobs (long documents, spooled to disk)
+JOBS_DIR = os.getenv("TTS_JOBS_DIR", os.path.join(tempfile.gettempdir(), "kokoro-jobs"))
+JOB_MAX_CHARS = int(os.getenv("TTS_JOB_MAX_CHARS", "2000000"))
+JOB_RETENTION_S = float(os.getenv("TTS_JOB_RETENTION_S", "3600"))  # Finished jobs are deleted after this
+
+# File-backed responses for long non-streaming results (served with sendfile/Range)
+FILE_RESPONSES = _env_flag("TTS_FILE_RESPONSES", True)
+FILE_RESPONSE_MIN_SECONDS = float(os.getenv("TTS_FILE_RESPONSE_MIN_SECONDS", "10"))  # Shorter clips stay in memory
+RESPONSE_CACHE_DIR = os.getenv(
+    "TTS_RESPONSE_CACHE_DIR",
+    "/dev/shm/kokoro-audio" if os.path.isdir("/dev/shm") else os.path.join(tempfile.gettempdir(), "kokoro-audio"),
+)
+RESPONSE_CACHE_MAX_MB = float(os.getenv("TTS_RESPONSE_CACHE_MAX_MB", "512"))
+CACHE_MAX_AGE_S = int(os.getenv("TTS_CACHE_MAX_AGE_S", "86400"))  # Cache-Control max-age on non-streaming results
+
+# Time-stretched speed changes (non-streaming): derive speeds other than 1.0
+# from the cached 1.0 rendering instead of running inference again
+TIME_STRETCH = _env_flag("TTS_TIME_STRETCH", False)
+TIME_STRETCH_QUALITY = os.getenv("TTS_TIME_STRETCH_QUALITY", "fast")  # "fast" (WSOLA) or "high" (phase vocoder)
+TIME_STRETCH_CACHE_MB = float(os.getenv("TTS_TIME_STRETCH_CACHE_MB", "64"))  # 1.0 renderings not in the file cache (LRU)
+
+# Load-adaptive quality: when the estimated queue wait for interactive work
+# passes a tier's threshold, requests that did not ask for a specific model
+# variant move to that tier, and back once the wait falls below
+# DEGRADE_EXIT_RATIO of the threshold. Tiers: "segmented" (first sentence
+# synthesized on its own, no quality change) and "fast" (also served by the
+# DEGRADE_VARIANT model variant, if loaded)
+DEGRADE_ENABLED = _env_flag("TTS_DEGRADE", True)
+DEGRADE_THRESHOLDS_MS = [
+    float(n) for n in os.getenv("TTS_DEGRADE_THRESHOLDS_MS", "150,350").split(",") if n.strip()
+]
+DEGRADE_EXIT_RATIO = 0.5
+DEGRADE_VARIANT = os.getenv("TTS_DEGRADE_VARIANT", "fast")
+
+# Admission control: interactive requests whose predicted queue wait on the
+# MLX worker exceeds ADMISSION_MAX_WAIT_MS are rejected with 429 and a
+# Retry-After instead of queueing (batch items and jobs are not limited;
+# they run behind interactive work with bounded in-flight items)
+ADMISSION_ENABLED = _env_flag("TTS_ADMISSION", True)
+ADMISSION_MAX_WAIT_MS = float(os.getenv("TTS_ADMISSION_MAX_WAIT_MS", "3000"))
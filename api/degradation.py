@@ -0,0 +1,109 @@
+"""
+Kokoro TTS API v2 - Load-Adaptive Quality
+
+Under bursts, queueing on the single MLX worker pushes time to first audio
+past its budget long before the server is out of capacity. This policy
+trades a little quality for latency instead: it follows the scheduler's
+estimated wait for interactive work (see PriorityExecutor.estimated_wait)
+and moves eligible requests to cheaper tiers while the wait is high:
+
+    full       as requested
+    segmented  the first sentence is synthesized on its own (streaming)
+    fast       segmented, and served by DEGRADE_VARIANT, a quantized model
+               variant (see MODEL_VARIANTS), when it is loaded
+
+The tier rises as soon as the wait passes a threshold, and falls one step
+at a time once the wait is below DEGRADE_EXIT_RATIO of the threshold, so
+it does not flap. Requests that name a loaded variant are served as asked.
+The output rate is never lowered: Kokoro renders 24 kHz natively, so a
+lower rate would cost resampling rather than save inference.
+"""
+
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from .config import DEGRADE_ENABLED, DEGRADE_EXIT_RATIO, DEGRADE_THRESHOLDS_MS, DEGRADE_VARIANT
+from .scheduler import Priority
+from .tts import estimated_wait, has_variant
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("full", "segmented", "fast")
+_SEGMENTED, _FAST = 1, 2
+
+
+@dataclass(frozen=True)
+class QualityPlan:
+    """How one request is served."""
+    tier: str
+    variant: Optional[str]  # Passed to the tts functions (None or unknown: default model)
+    short_first_segment: bool
+
+
+class DegradationPolicy:
+    """Current quality tier, moved by the estimated queue wait with hysteresis."""
+
+    def __init__(
+        self,
+        thresholds_ms: Sequence[float] = DEGRADE_THRESHOLDS_MS,
+        exit_ratio: float = DEGRADE_EXIT_RATIO,
+        variant: str = DEGRADE_VARIANT,
+        enabled: bool = DEGRADE_ENABLED,
+    ):
+        self.thresholds_ms = list(thresholds_ms)[:len(TIERS) - 1]
+        self.exit_ratio = exit_ratio
+        self.variant = variant
+        self.enabled = enabled
+        self._level = 0
+        self._wait_ms = 0.0
+        self._served: Counter = Counter()
+        self._transitions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def tier(self) -> str:
+        return TIERS[self._level]
+
+    def update(self, wait_ms: float) -> int:
+        """Move the tier for the current estimated wait; returns the new level."""
+        with self._lock:
+            self._wait_ms = wait_ms
+            level = self._level
+            while level < len(self.thresholds_ms) and wait_ms > self.thresholds_ms[level]:
+                level += 1
+            if level == self._level and level > 0 and wait_ms < self.thresholds_ms[level - 1] * self.exit_ratio:
+                level -= 1
+            if level != self._level:
+                logger.info(f"Quality tier {TIERS[self._level]} -> {TIERS[level]} "
+                            f"(estimated wait {wait_ms:.0f}ms)")
+                self._level = level
+                self._transitions += 1
+            return level
+
+    def plan(self, model: Optional[str] = None) -> QualityPlan:
+        """Tier, model variant and segmentation for an interactive request asking for model."""
+        level = self.update(estimated_wait(Priority.INTERACTIVE) * 1000) if self.enabled else 0
+        if has_variant(model):
+            level = 0  # The caller chose a variant; serve it as asked
+        variant = self.variant if level >= _FAST and has_variant(self.variant) else model
+        plan = QualityPlan(TIERS[level], variant, level >= _SEGMENTED)
+        with self._lock:
+            self._served[plan.tier] += 1
+        return plan
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "tier": TIERS[self._level],
+                "estimated_wait_ms": round(self._wait_ms, 1),
+                "thresholds_ms": self.thresholds_ms,
+                "served": {tier: self._served[tier] for tier in TIERS},
+                "transitions": self._transitions,
+            }
+
+
+degradation = DegradationPolicy()
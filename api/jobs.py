@@ -0,0 +1,364 @@
+"""
+Kokoro TTS API v2 - Asynchronous Jobs
+
+Background synthesis for documents too long to hold an HTTP request open
+for (books, long articles). A job is submitted once, polled for progress,
+and its audio downloaded when finished.
+
+The document is split into sentences and synthesized one sentence at a time
+at Priority.BATCH, so live requests are never stuck behind a chapter. Each
+sentence's PCM is appended to a spool file on disk as soon as it is ready;
+only the sentences currently in flight are ever held in memory. Jobs run as
+server-side tasks, independent of the request that created them, so a
+client can disconnect and come back later.
+
+A job runs in the worker process that accepted it, but its state is also
+kept as JSON next to its audio in JOBS_DIR, so with several server workers
+(gunicorn.conf.py) any of them can report progress, serve the audio or
+delete the job. A worker notices a job deleted elsewhere and stops it. A
+job whose worker exited before it finished is reported as failed. Finished
+jobs are removed after JOB_RETENTION_S.
+
+WAV sizes are 32-bit, so WAV output is limited to about 24.8 hours of
+audio; longer documents need response_format "pcm".
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field, fields
+from enum import Enum
+from typing import Any, Optional
+
+from .config import INFERENCE_WORKERS, JOBS_DIR, JOB_RETENTION_S, SAMPLE_RATE
+from .loudness import LoudnessNormalizer
+from .scheduler import Priority
+from .streaming import SilenceTrimmer, audio_to_pcm_bytes, create_wav_header
+from .text import split_sentences
+from .tts import submit_audio
+
+logger = logging.getLogger(__name__)
+
+_PREFETCH = INFERENCE_WORKERS + 1  # Sentences queued per job, so workers never idle between writes
+_PERSIST_INTERVAL_S = 1.0  # Progress is saved to the job's state file at most this often
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+_WAV_MAX_SAMPLES = (0xFFFFFFFF - 36) // 2  # 16-bit mono samples that fit the 32-bit RIFF size
+_WAV_CHARS_PER_SECOND = 20  # Fast speech rate, so submit only rejects documents that cannot fit
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+_FINISHED = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+@dataclass
+class Job:
+    """State of one background synthesis job."""
+    id: str
+    path: str
+    voice: str
+    speed: float
+    response_format: str
+    trim_silence: bool
+    normalize_loudness: bool
+    total_segments: int
+    model: Optional[str] = None
+    deadline: Optional[float] = None  # time.monotonic(); unfinished segments are dropped after it
+    owner_pid: int = field(default_factory=os.getpid)  # Worker process running the job
+    completed_segments: int = 0
+    samples: int = 0
+    status: JobStatus = JobStatus.QUEUED
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    @property
+    def media_type(self) -> str:
+        return "audio/wav" if self.response_format == "wav" else "audio/pcm"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status.value,
+            "voice": self.voice,
+            "speed": self.speed,
+            "model": self.model,
+            "response_format": self.response_format,
+            "total_segments": self.total_segments,
+            "completed_segments": self.completed_segments,
+            "progress": round(self.completed_segments / self.total_segments, 4) if self.total_segments else 1.0,
+            "duration": self.samples / SAMPLE_RATE,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def _remove(*paths: str) -> None:
+    for path in paths:
+        for candidate in (path, path + ".part"):
+            try:
+                os.remove(candidate)
+            except FileNotFoundError:
+                pass
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class _Deleted(Exception):
+    """The job was deleted through another worker."""
+
+
+class JobManager:
+    """Creates, tracks and cleans up background synthesis jobs."""
+
+    def __init__(self, directory: str = JOBS_DIR, retention_s: float = JOB_RETENTION_S):
+        self.directory = directory
+        self.retention_s = retention_s
+        self._jobs: dict[str, Job] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def _state_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def _save(self, job: Job) -> None:
+        """Write the job's state file (atomically, so readers never see a partial one)."""
+        record = asdict(job)
+        record["status"] = job.status.value
+        for local in ("path", "deadline"):  # Derived from the id, and per-process
+            record.pop(local)
+        path = self._state_path(job.id)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(record, f)
+        os.replace(temp_path, path)
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        """A job from its state file, e.g. one run by another worker."""
+        try:
+            with open(self._state_path(job_id)) as f:
+                record = json.load(f)
+            names = {f.name for f in fields(Job)}
+            job = Job(
+                path=os.path.join(self.directory, f"{job_id}.{'wav' if record['response_format'] == 'wav' else 'pcm'}"),
+                **{k: v for k, v in record.items() if k in names and k != "path"},
+            )
+            job.status = JobStatus(job.status)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        if not job.finished and not _alive(job.owner_pid):
+            job.status = JobStatus.FAILED
+            job.error = "Interrupted: the worker running the job exited"
+            job.finished_at = job.finished_at or job.created_at
+        return job
+
+    def submit(
+        self,
+        text: str,
+        voice: str,
+        speed: float,
+        response_format: str = "pcm",
+        trim_silence: bool = False,
+        normalize_loudness: bool = False,
+        model: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> Job:
+        """
+        Start synthesizing text in the background; returns the queued job.
+
+        Raises:
+            ValueError: If the document is clearly too long for a WAV file.
+        """
+        if response_format == "wav" and len(text) / (_WAV_CHARS_PER_SECOND * speed) * SAMPLE_RATE > _WAV_MAX_SAMPLES:
+            raise ValueError("Document too long for WAV output (about 24 hours at most); use response_format 'pcm'")
+        self.prune()
+        os.makedirs(self.directory, exist_ok=True)
+
+        sentences = split_sentences(text)
+        job_id = uuid.uuid4().hex
+        extension = "wav" if response_format == "wav" else "pcm"
+        job = Job(
+            id=job_id,
+            path=os.path.join(self.directory, f"{job_id}.{extension}"),
+            voice=voice,
+            speed=speed,
+            response_format=response_format,
+            trim_silence=trim_silence,
+            normalize_loudness=normalize_loudness,
+            total_segments=len(sentences),
+            model=model,
+            deadline=deadline,
+        )
+        self._jobs[job_id] = job
+        self._save(job)
+        self._tasks[job_id] = asyncio.create_task(self._run(job, sentences))
+        logger.info(f"Job {job_id} queued: {len(sentences)} segments, {len(text)} chars")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A job run by this worker, or by any other (from its state file)."""
+        if not _JOB_ID.match(job_id):
+            return None
+        job = self._jobs.get(job_id)
+        if job is None:
+            return self._load(job_id)
+        if not os.path.exists(self._state_path(job_id)):
+            self._forget(job_id)  # Deleted through another worker
+            return None
+        return job
+
+    def _forget(self, job_id: str) -> None:
+        self._jobs.pop(job_id, None)
+        task = self._tasks.pop(job_id, None)
+        if task is not None:
+            task.cancel()
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Cancel a job if it is still running and remove its audio. A job
+        running in another worker is stopped by that worker, which notices
+        its state file is gone.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return False
+        self._forget(job_id)
+        _remove(job.path, self._state_path(job_id))
+        return True
+
+    def prune(self) -> None:
+        """Delete finished jobs (of every worker) older than the retention period."""
+        cutoff = time.time() - self.retention_s
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            job_id, extension = os.path.splitext(name)
+            if extension != ".json":
+                continue
+            job = self.get(job_id)
+            if job is not None and job.finished and job.finished_at < cutoff:
+                self.delete(job_id)
+
+    async def shutdown(self) -> None:
+        """Cancel running jobs (their partial audio is removed)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: Job, sentences: list[str]) -> None:
+        spool_path = job.path + ".part"
+        pending: deque[asyncio.Future] = deque()
+        remaining = iter(sentences)
+        trimmer = SilenceTrimmer() if job.trim_silence else None
+        normalizer = LoudnessNormalizer() if job.normalize_loudness else None
+
+        last_saved = time.monotonic()
+
+        async def _save_progress(force: bool = False) -> None:
+            nonlocal last_saved
+            if not os.path.exists(self._state_path(job.id)):
+                raise _Deleted()
+            if force or time.monotonic() - last_saved >= _PERSIST_INTERVAL_S:
+                await asyncio.to_thread(self._save, job)
+                last_saved = time.monotonic()
+
+        def _submit_next() -> None:
+            sentence = next(remaining, None)
+            if sentence is not None:
+                pending.append(asyncio.wrap_future(
+                    submit_audio(
+                        sentence, voice=job.voice, speed=job.speed, priority=Priority.BATCH,
+                        variant=job.model, deadline=job.deadline,
+                    )
+                ))
+
+        spool = await asyncio.to_thread(open, spool_path, "wb")
+        try:
+            job.status = JobStatus.RUNNING
+            await _save_progress(force=True)
+            if job.response_format == "wav":
+                await asyncio.to_thread(spool.write, create_wav_header(0))  # Sizes patched at the end
+
+            for _ in range(_PREFETCH):
+                _submit_next()
+
+            async def _write(audio) -> None:
+                if len(audio):
+                    if job.response_format == "wav" and job.samples + len(audio) > _WAV_MAX_SAMPLES:
+                        raise ValueError("Audio too long for WAV output (about 24 hours at most); "
+                                         "use response_format 'pcm'")
+                    await asyncio.to_thread(spool.write, audio_to_pcm_bytes(audio))
+                    job.samples += len(audio)
+
+            while pending:
+                audio = await pending.popleft()
+                _submit_next()
+                if trimmer is not None:
+                    audio = trimmer.process(audio)
+                if normalizer is not None:
+                    audio = await asyncio.to_thread(normalizer.process, audio)
+                await _write(audio)
+                job.completed_segments += 1
+                await _save_progress()
+
+            if trimmer is not None:
+                tail = trimmer.flush()
+                await _write(normalizer.process(tail) if normalizer is not None else tail)
+            if normalizer is not None:
+                await _write(normalizer.flush())
+
+            if job.response_format == "wav":
+                await asyncio.to_thread(spool.seek, 0)
+                await asyncio.to_thread(spool.write, create_wav_header(job.samples))
+            await asyncio.to_thread(spool.close)
+            os.replace(spool_path, job.path)
+
+            job.status = JobStatus.COMPLETED
+            logger.info(f"Job {job.id} completed: {job.samples / SAMPLE_RATE:.1f}s audio")
+        except asyncio.CancelledError:
+            job.status = JobStatus.CANCELLED
+            raise
+        except _Deleted:
+            job.status = JobStatus.CANCELLED
+            self._jobs.pop(job.id, None)
+            logger.info(f"Job {job.id} deleted through another worker; stopped")
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            for future in pending:
+                future.cancel()
+            spool.close()
+            if job.status != JobStatus.COMPLETED:
+                _remove(job.path)
+            if job.id in self._jobs and os.path.exists(self._state_path(job.id)):
+                self._save(job)
+            self._tasks.pop(job.id, None)
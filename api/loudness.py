@@ -0,0 +1,301 @@
+"""
+Kokoro TTS API v2 - Loudness Normalization
+
+Streaming loudness normalization to the contract target
+(LUFS -16 ±1 LU, dBTP <= -1.0; see contracts/kokoro-tts-api.yaml).
+
+Loudness is measured per ITU-R BS.1770: K-weighted mean-square energy over
+400ms blocks with 75% overlap, gated at -70 LUFS (absolute) and -10 LU
+(relative). K-weighting is applied as a magnitude response in the frequency
+domain, so every block of a segment is measured in one vectorized FFT
+instead of a per-sample IIR loop. Peaks are controlled by a lookahead
+limiter driven by a 4x-oversampled true-peak estimate.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from .config import (
+    SAMPLE_RATE,
+    LOUDNESS_TARGET_LUFS,
+    TRUE_PEAK_CEILING_DB,
+    LOUDNESS_LOOKAHEAD_MS,
+    LOUDNESS_MAX_GAIN_DB,
+)
+
+_BLOCK_SECONDS = 0.4
+_HOP_SECONDS = 0.1
+_ABSOLUTE_GATE_LUFS = -70.0
+_RELATIVE_GATE_LU = -10.0
+_OVERSAMPLE = 4
+_TRUE_PEAK_MARGIN_DB = 0.1  # Headroom for interpolation error between gain steps
+_EPS = 1e-12
+
+
+def _biquad_power_response(b: tuple, a: tuple, freqs: np.ndarray, sample_rate: int) -> np.ndarray:
+    """|H(f)|^2 of a biquad evaluated at the given frequencies."""
+    z = np.exp(-2j * np.pi * freqs / sample_rate)  # z^-1
+    num = b[0] + b[1] * z + b[2] * z * z
+    den = a[0] + a[1] * z + a[2] * z * z
+    return np.abs(num / den) ** 2
+
+
+@lru_cache(maxsize=16)
+def _k_weighting(n_fft: int, sample_rate: int) -> np.ndarray:
+    """
+    BS.1770 K-weighting power response on the rfft bins of an n_fft frame.
+
+    Stage 1 is the +4 dB high shelf at 1.5 kHz (head effects), stage 2 the
+    38 Hz high-pass (RLB). Coefficients are derived for any sample rate so
+    the 24 kHz model output needs no resampling.
+    """
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+
+    # Stage 1: high shelf
+    gain_db, q, fc = 4.0, 1 / np.sqrt(2), 1500.0
+    amp = 10 ** (gain_db / 40)
+    w0 = 2 * np.pi * fc / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    sqrt_amp = np.sqrt(amp)
+    shelf = _biquad_power_response(
+        (
+            amp * ((amp + 1) + (amp - 1) * cos_w0 + 2 * sqrt_amp * alpha),
+            -2 * amp * ((amp - 1) + (amp + 1) * cos_w0),
+            amp * ((amp + 1) + (amp - 1) * cos_w0 - 2 * sqrt_amp * alpha),
+        ),
+        (
+            (amp + 1) - (amp - 1) * cos_w0 + 2 * sqrt_amp * alpha,
+            2 * ((amp - 1) - (amp + 1) * cos_w0),
+            (amp + 1) - (amp - 1) * cos_w0 - 2 * sqrt_amp * alpha,
+        ),
+        freqs,
+        sample_rate,
+    )
+
+    # Stage 2: high pass
+    q, fc = 0.5, 38.0
+    w0 = 2 * np.pi * fc / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    highpass = _biquad_power_response(
+        ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2),
+        (1 + alpha, -2 * cos_w0, 1 - alpha),
+        freqs,
+        sample_rate,
+    )
+
+    return shelf * highpass
+
+
+def _block_energies(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    K-weighted mean-square energy of each 400ms gating block (100ms hop).
+
+    Audio shorter than one block is measured as a single short block.
+    """
+    if len(audio) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    block = int(sample_rate * _BLOCK_SECONDS)
+    hop = int(sample_rate * _HOP_SECONDS)
+    if len(audio) < block:
+        frames = audio[None, :]
+    else:
+        frames = np.lib.stride_tricks.sliding_window_view(audio, block)[::hop]
+
+    n = frames.shape[1]
+    power = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+
+    # Parseval weights: interior rfft bins stand in for their mirrored pair
+    weights = np.full(power.shape[1], 2.0)
+    weights[0] = 1.0
+    if n % 2 == 0:
+        weights[-1] = 1.0
+
+    return (power @ (weights * _k_weighting(n, sample_rate))) / (n * n)
+
+
+def _energy_to_lufs(energy):
+    return -0.691 + 10 * np.log10(np.maximum(energy, _EPS))
+
+
+def _gated_loudness(energies: np.ndarray) -> float:
+    """Apply BS.1770 absolute and relative gating to block energies."""
+    if energies.size == 0:
+        return float("-inf")
+
+    kept = energies[_energy_to_lufs(energies) > _ABSOLUTE_GATE_LUFS]
+    if kept.size == 0:
+        return float("-inf")
+
+    relative_gate = _energy_to_lufs(kept.mean()) + _RELATIVE_GATE_LU
+    kept = kept[_energy_to_lufs(kept) > relative_gate]
+    return float(_energy_to_lufs(kept.mean()))
+
+
+def integrated_loudness(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> float:
+    """
+    Integrated loudness in LUFS (mono).
+
+    Returns -inf for silence or audio entirely below the absolute gate.
+    """
+    return _gated_loudness(_block_energies(np.asarray(audio, dtype=np.float64), sample_rate))
+
+
+def _sample_true_peaks(audio: np.ndarray) -> np.ndarray:
+    """Per-sample true-peak magnitude from 4x FFT oversampling."""
+    n = len(audio)
+    if n == 0:
+        return np.empty(0, dtype=np.float64)
+    upsampled = np.fft.irfft(np.fft.rfft(audio), n=n * _OVERSAMPLE) * _OVERSAMPLE
+    peaks = np.abs(upsampled).reshape(n, _OVERSAMPLE).max(axis=1)
+    return np.maximum(peaks, np.abs(audio))
+
+
+def true_peak_db(audio: np.ndarray) -> float:
+    """Maximum true peak in dBTP (-inf for empty or silent audio)."""
+    peaks = _sample_true_peaks(np.asarray(audio, dtype=np.float64))
+    if peaks.size == 0 or peaks.max() <= 0:
+        return float("-inf")
+    return float(20 * np.log10(peaks.max()))
+
+
+def _sliding_min(values: np.ndarray, width: int) -> np.ndarray:
+    """
+    Minimum over values[i:i + width] for every i (van Herk/Gil-Werman).
+
+    O(n) regardless of width: prefix and suffix minima within width-sized
+    blocks are computed with np.minimum.accumulate and combined pairwise.
+    """
+    n = len(values)
+    pad = (-n) % width
+    padded = np.pad(values, (0, pad + width), constant_values=np.inf)
+    blocks = padded.reshape(-1, width)
+    prefix = np.minimum.accumulate(blocks, axis=1).ravel()
+    suffix = np.minimum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return np.minimum(suffix[:n], prefix[width - 1:width - 1 + n])
+
+
+def _lookahead_gain(required: np.ndarray, reach: int) -> np.ndarray:
+    """
+    Smooth limiter gain that never exceeds the required gain at any peak.
+
+    Each sample takes the minimum required gain within ±reach (so the gain
+    starts falling before a peak arrives), then a moving average over
+    ±reach/2 removes the steps. Every value averaged into a peak's gain
+    already covers that peak, so the average cannot exceed it.
+    """
+    padded = np.pad(required, reach, constant_values=1.0)
+    held = _sliding_min(padded, 2 * reach + 1)[:len(required)]
+    half = max(1, reach // 2)
+    kernel = np.full(2 * half + 1, 1.0 / (2 * half + 1))
+    return np.convolve(np.pad(held, half, mode="edge"), kernel, mode="valid")
+
+
+class LoudnessNormalizer:
+    """
+    Streaming loudness normalizer with a lookahead true-peak limiter.
+
+    Feed segments in order with process() and call flush() at the end of the
+    stream. Gain tracks the integrated loudness of everything seen so far and
+    ramps linearly across each segment, so there are no gain steps at segment
+    joins. The limiter holds back latency_ms of audio so it can see peaks
+    before they are emitted; that hold-back is the only added latency.
+    """
+
+    def __init__(
+        self,
+        target_lufs: float = LOUDNESS_TARGET_LUFS,
+        true_peak_ceiling_db: float = TRUE_PEAK_CEILING_DB,
+        lookahead_ms: float = LOUDNESS_LOOKAHEAD_MS,
+        max_gain_db: float = LOUDNESS_MAX_GAIN_DB,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        self.target_lufs = target_lufs
+        self.sample_rate = sample_rate
+        self.max_gain_db = max_gain_db
+        self._ceiling = 10 ** ((true_peak_ceiling_db - _TRUE_PEAK_MARGIN_DB) / 20)
+        self._reach = max(1, int(sample_rate * lookahead_ms / 2000))
+        self._hold = 2 * self._reach
+        self._block = int(sample_rate * _BLOCK_SECONDS)
+        self._hop = int(sample_rate * _HOP_SECONDS)
+
+        self._energies: list[np.ndarray] = []
+        self._measure_tail = np.empty(0, dtype=np.float64)
+        self._gain_db: Optional[float] = None
+        self._context = np.empty(0, dtype=np.float64)
+        self._pending = np.empty(0, dtype=np.float64)
+
+    @property
+    def latency_ms(self) -> float:
+        """Audio held back by the limiter lookahead, in milliseconds."""
+        return 1000.0 * self._hold / self.sample_rate
+
+    @property
+    def gain_db(self) -> float:
+        """Current normalization gain in dB (before limiting)."""
+        return self._gain_db if self._gain_db is not None else 0.0
+
+    def process(self, segment: np.ndarray) -> np.ndarray:
+        """Normalize one segment; returns whatever audio is ready to emit."""
+        segment = np.asarray(segment, dtype=np.float64)
+        if len(segment) == 0:
+            return np.empty(0, dtype=np.float32)
+
+        target_gain = self._update_gain(segment)
+        start_gain = self._gain_db if self._gain_db is not None else target_gain
+        self._gain_db = target_gain
+
+        ramp_db = np.linspace(start_gain, target_gain, len(segment))
+        return self._limit(segment * 10 ** (ramp_db / 20), final=False)
+
+    def flush(self) -> np.ndarray:
+        """Emit the held-back tail at end of stream."""
+        return self._limit(np.empty(0, dtype=np.float64), final=True)
+
+    def _update_gain(self, segment: np.ndarray) -> float:
+        audio = np.concatenate([self._measure_tail, segment])
+
+        if len(audio) >= self._block:
+            energies = _block_energies(audio, self.sample_rate)
+            self._energies.append(energies)
+            self._measure_tail = audio[len(energies) * self._hop:]
+            measured = _gated_loudness(np.concatenate(self._energies))
+        else:
+            self._measure_tail = audio
+            history = self._energies + [_block_energies(audio, self.sample_rate)]
+            measured = _gated_loudness(np.concatenate(history))
+
+        if not np.isfinite(measured):
+            return self.gain_db
+        return min(self.target_lufs - measured, self.max_gain_db)
+
+    def _limit(self, gained: np.ndarray, final: bool) -> np.ndarray:
+        buffer = np.concatenate([self._context, self._pending, gained])
+        emit_start = len(self._context)
+        emit_end = len(buffer) if final else max(emit_start, len(buffer) - self._hold)
+
+        if emit_end == emit_start:
+            self._pending = buffer[emit_start:]
+            return np.empty(0, dtype=np.float32)
+
+        required = np.minimum(1.0, self._ceiling / np.maximum(_sample_true_peaks(buffer), _EPS))
+        if required.min() < 1.0:
+            gain = _lookahead_gain(required, self._reach)[emit_start:emit_end]
+        else:
+            gain = 1.0
+
+        out = (buffer[emit_start:emit_end] * gain).astype(np.float32)
+        self._context = buffer[max(0, emit_end - self._hold):emit_end]
+        self._pending = buffer[emit_end:]
+        return out
+
+
+def normalize_loudness(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Normalize a complete clip (blocking path) with the streaming normalizer."""
+    normalizer = LoudnessNormalizer(sample_rate=sample_rate)
+    head = normalizer.process(audio)
+    return np.concatenate([head, normalizer.flush()])
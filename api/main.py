@@ -6,19 +6,49 @@ Minimal FastAPI server for Kokoro TTS.
 """
 
 import asyncio
+import hmac
 import logging
+import math
+import os
 import time
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Literal, Optional
 
-from fastapi import FastAPI, HTTPException, Response
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, Field, model_validator
-
-from .config import HOST, PORT, DEFAULT_VOICE, DEFAULT_SPEED, MIN_SPEED, MAX_SPEED
-from .tts import initialize_model, get_model, get_voices, generate_audio, generate_audio_stream, is_model_ready, shutdown_executor
-from .streaming import stream_audio_chunks, stream_audio_chunks_live, get_audio_duration
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+from .config import (
+    HOST, PORT, DEFAULT_VOICE, DEFAULT_SPEED, MIN_SPEED, MAX_SPEED, LOUDNESS_NORMALIZE, TRIM_SILENCE,
+    BATCH_MAX_ITEMS, JOB_MAX_CHARS, FILE_RESPONSES, FILE_RESPONSE_MIN_SECONDS, CACHE_MAX_AGE_S,
+    TIME_STRETCH, TIME_STRETCH_QUALITY, READY_TIMEOUT_S, READY_RETRY_AFTER_S, WARMUP_ENABLED, MODEL_VARIANTS,
+    ADMIN_TOKEN, RELOAD_MODELS,
+)
+from .tts import (
+    initialize_model, get_model, get_voices, get_voice_details, get_voice_residency, generate_audio,
+    generate_audio_stream, get_load_state, get_model_info, is_model_ready, load_variants, shutdown_executor,
+    start_reload,
+)
+from .streaming import (
+    stream_audio_chunks, stream_audio_chunks_live, get_audio_duration, SilenceTrimmer, trim_silence,
+)
+from .loudness import LoudnessNormalizer, normalize_loudness
+from .websocket import discard_until_end, incremental_audio_stream, receive_message, send_error, stream_utterance
+from .timestamps import sentence_stream, timed_synthesis
+from .text import split_sentences
+from .batch import new_boundary, stream_batch
+from .degradation import degradation
+from .admission import admission
+from .scheduler import DeadlineExceeded, deadline_after
+from .jobs import JobManager, JobStatus
+from .memory import memory_usage
+from .traffic import length_histogram
+from .warmup import get_warmup_report, run_warmup
+from .cache import (
+    AudioFileCache, AudioMemoryCache, content_key, etag_for, etag_matches, file_duration, load_audio, media_type_for,
+)
+from .stretch import time_stretch
 
 # Configure logging
 logging.basicConfig(
@@ -29,15 +59,48 @@ logger = logging.getLogger(__name__)
 
 
 # Request/Response models
-class TTSRequest(BaseModel):
+class SpeechOptions(BaseModel):
+    """Model, voice and post-processing options shared by every synthesis request."""
+    model: str = Field(
+        default="kokoro-v1.0",
+        description="Model variant (see TTS_MODEL_VARIANTS); any other name uses the default model",
+    )
+    voice: str = Field(default=DEFAULT_VOICE, description="Voice ID, or a blend such as af_heart(0.7)+bm_fable(0.3)")
+    speed: float = Field(default=DEFAULT_SPEED, ge=MIN_SPEED, le=MAX_SPEED, description="Speed multiplier")
+    normalize_loudness: bool = Field(
+        default=LOUDNESS_NORMALIZE,
+        description="Normalize to -16 LUFS with a -1 dBTP true-peak ceiling",
+    )
+    trim_silence: bool = Field(
+        default=TRIM_SILENCE,
+        description="Trim leading silence and crossfade segment joins",
+    )
+    timestamps: bool = Field(
+        default=False,
+        description="Send per-word start/end times with each segment (WebSocket only)",
+    )
+    timeout_ms: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Abandon the work this many milliseconds after the request arrives "
+                    "(HTTP also accepts the X-Request-Timeout-Ms header)",
+    )
+
+
+class TTSRequest(SpeechOptions):
     """TTS request - accepts both 'input' (OpenAI) and 'text' (legacy) fields."""
-    model: str = Field(default="kokoro-v1.0", description="Model ID (ignored, only one model)")
     input: Optional[str] = Field(default=None, description="Text to synthesize (OpenAI format)")
     text: Optional[str] = Field(default=None, description="Text to synthesize (legacy format)")
-    voice: str = Field(default=DEFAULT_VOICE, description="Voice ID")
-    speed: float = Field(default=DEFAULT_SPEED, ge=MIN_SPEED, le=MAX_SPEED, description="Speed multiplier")
     response_format: str = Field(default="pcm", description="Audio format (pcm or wav)")
     stream: bool = Field(default=True, description="Whether to stream the response")
+    time_stretch: bool = Field(
+        default=TIME_STRETCH,
+        description="Derive speeds other than 1.0 by time-stretching the 1.0 rendering (non-streaming only)",
+    )
+    stretch_quality: Literal["fast", "high"] = Field(
+        default=TIME_STRETCH_QUALITY,
+        description="Time-stretch algorithm: fast (WSOLA) or high (phase vocoder)",
+    )
     
     @model_validator(mode='after')
     def validate_text_input(self):
@@ -58,16 +121,58 @@ class TTSRequest(BaseModel):
         return self
 
 
+class BatchItem(SpeechOptions):
+    """One input in a batch request."""
+    id: Optional[str] = Field(
+        default=None, pattern=r"^[A-Za-z0-9._:-]{1,128}$",
+        description="Client reference, echoed as X-Item-Id (letters, digits and ._:-)",
+    )
+    input: str = Field(min_length=1, max_length=10000, description="Text to synthesize")
+
+
+class BatchRequest(BaseModel):
+    """Batch synthesis request."""
+    items: list[BatchItem] = Field(min_length=1, max_length=BATCH_MAX_ITEMS)
+    response_format: str = Field(default="pcm", description="Audio format for every item (pcm or wav)")
+
+
+class JobRequest(SpeechOptions):
+    """Background job request for long documents."""
+    input: str = Field(min_length=1, max_length=JOB_MAX_CHARS, description="Document text")
+    response_format: str = Field(default="wav", description="Audio format (pcm or wav)")
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
     status: str
     model_loaded: bool
     uptime_seconds: float
+    live: bool = True
+    ready: bool = False
+    phase: str = "pending"
+    progress: float = 0.0
+    error: Optional[str] = None
+
+
+class VoiceInfo(BaseModel):
+    """Voice metadata."""
+    id: str
+    name: str
+    language: Optional[str] = None
+    gender: Optional[str] = None
 
 
 class VoicesResponse(BaseModel):
     """Available voices response."""
     voices: list[str]
+    details: list[VoiceInfo] = []
+
+
+class ReloadRequest(BaseModel):
+    """Zero-downtime model reload."""
+    model: Optional[str] = Field(
+        default=None, description="Model id to load, one of TTS_RELOAD_MODELS (default: the active model)",
+    )
 
 
 class StatusResponse(BaseModel):
@@ -77,32 +182,77 @@ class StatusResponse(BaseModel):
     model_path: str
     voices_count: int
     uptime_seconds: float
+    voice_cache: Optional[dict] = None
+    warmup: Optional[dict] = None
+    input_lengths: Optional[dict] = None
+    memory: Optional[dict] = None
+    model: Optional[dict] = None
+    degradation: Optional[dict] = None
+    queue: Optional[dict] = None
 
 
 # Server state
 _start_time: float = 0
 _init_time: float = 0
+_load_task: Optional[asyncio.Task] = None
+_variants_task: Optional[asyncio.Task] = None
+_warmup_task: Optional[asyncio.Task] = None
+_reload_task: Optional[asyncio.Task] = None
+job_manager = JobManager()
+response_cache = AudioFileCache()
+stretch_bases = AudioMemoryCache()
+
+
+async def _load_model() -> None:
+    global _init_time, _warmup_task, _variants_task
+    try:
+        _init_time = await asyncio.to_thread(initialize_model)
+        memory = memory_usage()
+        logger.info(f"Server ready on {HOST}:{PORT} (PID {memory['pid']}, "
+                    f"unique {(memory['unique_bytes'] or 0) / 2**20:.0f} MB, "
+                    f"shared {(memory['shared_bytes'] or 0) / 2**20:.0f} MB)")
+    except Exception as e:
+        logger.error(f"Failed to initialize model: {e}")
+        return
+
+    if MODEL_VARIANTS:
+        # Separate task: readiness (_wait_until_ready) must not wait for variants
+        _variants_task = asyncio.create_task(asyncio.to_thread(load_variants))
+
+    if WARMUP_ENABLED:
+        _warmup_task = asyncio.create_task(run_warmup())
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan - initialize model on startup."""
-    global _start_time, _init_time
+    """Application lifespan - start loading the model in the background.
+
+    The server accepts connections immediately: /health reports load
+    progress, and speech requests wait for readiness (see _require_ready).
+    """
+    global _start_time, _load_task, _warmup_task, _variants_task
     
     _start_time = time.time()
+    _warmup_task = None
+    _variants_task = None
     
     logger.info("Starting Kokoro TTS API v2...")
-    
-    try:
-        _init_time = initialize_model()
-        logger.info(f"Server ready on {HOST}:{PORT}")
-    except Exception as e:
-        logger.error(f"Failed to initialize model: {e}")
-        raise
+    length_histogram.load()
+    _load_task = asyncio.create_task(_load_model())
     
     yield
 
     logger.info("Shutting down...")
+    if not _load_task.done():
+        # Loading runs in a thread that cannot be interrupted; let it finish
+        await asyncio.shield(_load_task)
+    if _variants_task is not None:
+        await asyncio.shield(_variants_task)
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+        await asyncio.gather(_warmup_task, return_exceptions=True)
+    length_histogram.save()
+    await job_manager.shutdown()
     shutdown_executor()
 
 
@@ -124,13 +274,96 @@ app.add_middleware(
 )
 
 
-@app.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint."""
+async def _wait_until_ready(timeout: Optional[float] = None) -> bool:
+    """Wait (up to READY_TIMEOUT_S) for a model load in progress; True once ready."""
+    if is_model_ready():
+        return True
+    if _load_task is None or _load_task.done():
+        return False
+    try:
+        await asyncio.wait_for(asyncio.shield(_load_task), READY_TIMEOUT_S if timeout is None else timeout)
+    except asyncio.TimeoutError:
+        pass
+    return is_model_ready()
+
+
+async def _require_ready() -> None:
+    """Raise 503 with Retry-After unless the model is (or soon becomes) ready."""
+    if not await _wait_until_ready():
+        raise HTTPException(
+            status_code=503,
+            detail="Model not ready",
+            headers={"Retry-After": str(READY_RETRY_AFTER_S)},
+        )
+
+
+_TIMEOUT_HEADER = "x-request-timeout-ms"
+
+
+def _request_deadline(options: SpeechOptions, http_request: Optional[Request] = None) -> Optional[float]:
+    """Deadline from the timeout_ms field or X-Request-Timeout-Ms header, whichever is sooner."""
+    timeouts = [options.timeout_ms] if options.timeout_ms is not None else []
+    header = http_request.headers.get(_TIMEOUT_HEADER) if http_request is not None else None
+    if header is not None:
+        try:
+            timeout = float(header)
+        except ValueError:
+            timeout = math.nan
+        if not math.isfinite(timeout) or timeout <= 0:
+            raise HTTPException(status_code=400, detail="Invalid X-Request-Timeout-Ms header")
+        timeouts.append(timeout)
+    return deadline_after(min(timeouts)) if timeouts else None
+
+
+def _require_capacity() -> None:
+    """Raise 429 with Retry-After if the predicted queue wait exceeds the admission budget."""
+    retry_after = admission.check()
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="Server busy: predicted queue wait exceeds the admission budget",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def _health() -> HealthResponse:
+    state = get_load_state()
+    ready = is_model_ready()
     return HealthResponse(
-        status="ok" if is_model_ready() else "initializing",
-        model_loaded=is_model_ready(),
+        status="ok" if ready else "failed" if state["phase"] == "failed" else "initializing",
+        model_loaded=ready,
         uptime_seconds=time.time() - _start_time,
+        live=state["phase"] != "failed",
+        ready=ready,
+        **state,
+    )
+
+
+@app.get("/health", response_model=HealthResponse)
+async def health_check():
+    """Health check endpoint: liveness, readiness and model load progress.
+
+    Always 200; use /health/live and /health/ready for probes that act on
+    the status code.
+    """
+    return _health()
+
+
+@app.get("/health/live", response_model=HealthResponse)
+async def liveness():
+    """200 while the process is healthy (loading or ready), 503 if the model failed to load."""
+    health = _health()
+    return JSONResponse(health.model_dump(), status_code=200 if health.live else 503)
+
+
+@app.get("/health/ready", response_model=HealthResponse)
+async def readiness():
+    """200 once the model is loaded and warmed up, 503 until then."""
+    health = _health()
+    return JSONResponse(
+        health.model_dump(),
+        status_code=200 if health.ready else 503,
+        headers=None if health.ready else {"Retry-After": str(READY_RETRY_AFTER_S)},
     )
 
 
@@ -140,55 +373,228 @@ async def list_voices():
     if not is_model_ready():
         raise HTTPException(status_code=503, detail="Model not ready")
     
-    return VoicesResponse(voices=get_voices())
+    return VoicesResponse(voices=get_voices(), details=get_voice_details())
 
 
 @app.get("/status", response_model=StatusResponse)
 async def get_status():
     """Get server status."""
-    from .config import MODEL_ID
-
+    model = get_model_info()
     return StatusResponse(
         status="ok" if is_model_ready() else "initializing",
         model_loaded=is_model_ready(),
-        model_path=MODEL_ID,
+        model_path=model["id"],
         voices_count=len(get_voices()) if is_model_ready() else 0,
         uptime_seconds=time.time() - _start_time,
+        voice_cache=get_voice_residency(),
+        warmup=get_warmup_report(),
+        input_lengths=length_histogram.to_dict(),
+        memory=memory_usage(),
+        model=model,
+        degradation=degradation.to_dict(),
+        queue=admission.to_dict(),
     )
 
 
+async def _after_reload(reload: asyncio.Future) -> None:
+    global _warmup_task
+    state = await reload
+    if state["state"] == "completed" and WARMUP_ENABLED:
+        if _warmup_task is not None:
+            _warmup_task.cancel()
+        _warmup_task = asyncio.create_task(run_warmup())
+
+
+_LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+def _require_admin(http_request: Request) -> None:
+    """Bearer ADMIN_TOKEN when one is set, otherwise a loopback client."""
+    if ADMIN_TOKEN:
+        scheme, _, token = http_request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+            raise HTTPException(status_code=401, detail="Invalid or missing admin token",
+                                headers={"WWW-Authenticate": "Bearer"})
+    elif http_request.client is None or http_request.client.host not in _LOOPBACK_HOSTS:
+        raise HTTPException(status_code=403, detail="Admin endpoints are local-only unless TTS_ADMIN_TOKEN is set")
+
+
+@app.post("/admin/reload", status_code=202)
+async def reload(http_request: Request, request: ReloadRequest = ReloadRequest()):
+    """
+    Load and warm a model alongside the active one, then switch to it.
+
+    Returns immediately; follow progress under "model" in /status. In-flight
+    requests finish on the previous model, which is freed once they have.
+
+    Only the worker process handling the call reloads: with several gunicorn
+    workers, set KOKORO_MODEL_ID and restart them instead.
+    """
+    _require_admin(http_request)
+    if request.model is not None and request.model not in RELOAD_MODELS:
+        raise HTTPException(status_code=400, detail=f"Model {request.model!r} is not in TTS_RELOAD_MODELS")
+    try:
+        future = start_reload(request.model)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    global _reload_task
+    _reload_task = asyncio.create_task(_after_reload(asyncio.wrap_future(future)))
+    return get_model_info()
+
+
+def _cache_headers(key: str) -> dict[str, str]:
+    """Validator and freshness headers for a deterministic result."""
+    return {
+        "ETag": etag_for(key),
+        "Cache-Control": f"public, max-age={CACHE_MAX_AGE_S}",
+        "X-Content-Key": key,
+    }
+
+
+def _audio_file_response(path: str, headers: dict[str, str]) -> FileResponse:
+    """Serve a rendered clip from disk (sendfile, Range) with a GET-able location."""
+    name = os.path.basename(path)
+    headers = {
+        "X-Audio-Duration": str(file_duration(path)),
+        **headers,
+        "Content-Location": f"/v1/audio/speech/files/{name}",
+    }
+    return FileResponse(path, media_type=media_type_for(name), headers=headers)
+
+
+async def _render_stretched(request: TTSRequest, variant: Optional[str], deadline: Optional[float]) -> tuple:
+    """
+    Audio at request.speed, time-stretched from the speed 1.0 rendering.
+
+    The 1.0 rendering comes from the file cache, or from memory for clips
+    too short for it, when a previous request left it there; otherwise it
+    is synthesized once and cached, so every later speed change is DSP only.
+
+    Returns:
+        Tuple of (audio, generation_time, base_source) where base_source is
+        "cache" or "render".
+    """
+    start_time = time.perf_counter()
+
+    def base_key(response_format: str) -> str:
+        return content_key(
+            request.input, request.voice, 1.0, response_format,
+            trim_silence=request.trim_silence, normalize_loudness=request.normalize_loudness, model=variant,
+        )
+
+    source = "cache"
+    base = stretch_bases.get(base_key("pcm"))
+    if base is None and FILE_RESPONSES:
+        for response_format in ("wav", "pcm"):
+            path = response_cache.get(base_key(response_format), response_format)
+            if path is not None:
+                base = await asyncio.to_thread(load_audio, path)
+                break
+
+    if base is None:
+        source = "render"
+        base, _, _ = await asyncio.to_thread(
+            generate_audio, text=request.input, voice=request.voice, speed=1.0, variant=variant, deadline=deadline,
+        )
+        if request.trim_silence:
+            base, _ = trim_silence(base)
+        if request.normalize_loudness:
+            base = await asyncio.to_thread(normalize_loudness, base)
+        if FILE_RESPONSES and get_audio_duration(base) >= FILE_RESPONSE_MIN_SECONDS:
+            await asyncio.to_thread(
+                response_cache.put, base_key(request.response_format), request.response_format, base,
+            )
+        else:
+            stretch_bases.put(base_key("pcm"), base)
+
+    audio = await asyncio.to_thread(time_stretch, base, request.speed, request.stretch_quality)
+    if request.normalize_loudness:
+        # Stretching moves peaks; re-apply the true-peak ceiling
+        audio = await asyncio.to_thread(normalize_loudness, audio)
+
+    return audio, time.perf_counter() - start_time, source
+
+
 @app.post("/v1/audio/speech")
-async def create_speech(request: TTSRequest):
+async def create_speech(request: TTSRequest, http_request: Request):
     """
     Generate speech from text (OpenAI-compatible endpoint).
     
     Accepts both 'input' (OpenAI format) and 'text' (legacy format).
     Streams audio chunks as they're generated for low latency.
+
+    Non-streaming results carry an ETag derived from the request; a matching
+    If-None-Match is answered with 304 before any synthesis.
+
+    Under load, requests may be served at a cheaper quality tier (see
+    api/degradation.py), reported in the X-Quality-Tier header, and are
+    rejected with 429 once the predicted queue wait exceeds the admission
+    budget (see api/admission.py).
+
+    With a timeout (timeout_ms or X-Request-Timeout-Ms), work is dropped
+    once it can no longer finish in time: non-streaming requests then fail
+    with 504, and streams end early.
     """
-    if not is_model_ready():
-        raise HTTPException(status_code=503, detail="Model not ready")
+    deadline = _request_deadline(request, http_request)
+
+    # WAV requires knowing total size upfront; non-streaming requests
+    # also use the blocking path for metric headers
+    blocking = request.response_format == "wav" or not request.stream
+    stretching = blocking and request.time_stretch and request.speed != 1.0
+    plan = degradation.plan(request.model)
+    tier_header = {"X-Quality-Tier": plan.tier}
+
+    if blocking:
+        key = content_key(
+            request.input, request.voice, request.speed, request.response_format,
+            trim_silence=request.trim_silence, normalize_loudness=request.normalize_loudness,
+            stretch=request.stretch_quality if stretching else None, model=plan.variant,
+        )
+        cache_headers = _cache_headers(key)
+        if etag_matches(http_request.headers.get("if-none-match"), cache_headers["ETag"]):
+            return Response(status_code=304, headers=cache_headers)
+
+    await _require_ready()
     
     if not request.input.strip():
         raise HTTPException(status_code=400, detail="Input text cannot be empty")
     
-    logger.info(f"TTS request: voice={request.voice}, speed={request.speed}, "
+    logger.info(f"TTS request: voice={request.voice}, speed={request.speed}, tier={plan.tier}, "
                 f"text='{request.input[:50]}...' ({len(request.input)} chars)")
-    
+
+    if blocking and FILE_RESPONSES:
+        cached = response_cache.get(key, request.response_format)
+        if cached is not None:
+            logger.info(f"Serving cached audio {os.path.basename(cached)}")
+            return _audio_file_response(cached, {**cache_headers, **tier_header, "X-Cache": "HIT"})
+
+    _require_capacity()
+    length_histogram.record(len(request.input))
+
     try:
-        # WAV requires knowing total size upfront; non-streaming requests
-        # also use the blocking path for metric headers
-        if request.response_format == "wav" or not request.stream:
+        if blocking:
             # --- Blocking path (generates all audio, then streams response) ---
             # generate_audio submits to a single MLX worker thread and blocks
             # on .result(); run it off the event loop so concurrent requests
             # and health checks keep getting served while inference runs.
             start_time = time.perf_counter()
-            audio, sample_rate, gen_time = await asyncio.to_thread(
-                generate_audio,
-                text=request.input,
-                voice=request.voice,
-                speed=request.speed,
-            )
+            trimmed_ms = 0.0
+            if stretching:
+                audio, gen_time, stretch_source = await _render_stretched(request, plan.variant, deadline)
+            else:
+                audio, sample_rate, gen_time = await asyncio.to_thread(
+                    generate_audio,
+                    text=request.input,
+                    voice=request.voice,
+                    speed=request.speed,
+                    variant=plan.variant,
+                    deadline=deadline,
+                )
+
+                if request.trim_silence:
+                    audio, trimmed_ms = trim_silence(audio)
+                if request.normalize_loudness:
+                    audio = await asyncio.to_thread(normalize_loudness, audio)
 
             audio_duration = get_audio_duration(audio)
             rtf = gen_time / audio_duration if audio_duration > 0 else 0
@@ -198,14 +604,28 @@ async def create_speech(request: TTSRequest):
             include_wav = request.response_format == "wav"
             content_type = "audio/wav" if include_wav else "audio/pcm"
 
+            headers = {
+                **cache_headers,
+                **tier_header,
+                "X-Audio-Duration": str(audio_duration),
+                "X-Generation-Time": str(gen_time),
+                "X-RTF": str(rtf),
+            }
+            if stretching:
+                headers["X-Time-Stretch"] = f"{request.stretch_quality}; base={stretch_source}"
+            elif request.trim_silence:
+                headers["X-Trimmed-Ms"] = f"{trimmed_ms:.1f}"
+
+            # Long clips go to disk and out via sendfile with Range support,
+            # rather than as one bytes object through a Python generator
+            if FILE_RESPONSES and audio_duration >= FILE_RESPONSE_MIN_SECONDS:
+                path = await asyncio.to_thread(response_cache.put, key, request.response_format, audio)
+                return _audio_file_response(path, {**headers, "X-Cache": "MISS"})
+
             return StreamingResponse(
                 stream_audio_chunks(audio, include_wav_header=include_wav),
                 media_type=content_type,
-                headers={
-                    "X-Audio-Duration": str(audio_duration),
-                    "X-Generation-Time": str(gen_time),
-                    "X-RTF": str(rtf),
-                },
+                headers=headers,
             )
         else:
             # --- True streaming path (yields audio as each segment completes) ---
@@ -215,13 +635,28 @@ async def create_speech(request: TTSRequest):
                 text=request.input,
                 voice=request.voice,
                 speed=request.speed,
+                variant=plan.variant,
+                short_first_segment=plan.short_first_segment,
+                deadline=deadline,
             )
 
+            headers = dict(tier_header)
+            normalizer = None
+            if request.normalize_loudness:
+                normalizer = LoudnessNormalizer()
+                headers["X-Loudness-Latency-Ms"] = f"{normalizer.latency_ms:.1f}"
+
+            trimmer = SilenceTrimmer() if request.trim_silence else None
+
             return StreamingResponse(
-                stream_audio_chunks_live(audio_stream),
+                stream_audio_chunks_live(audio_stream, normalizer=normalizer, trimmer=trimmer),
                 media_type="audio/pcm",
+                headers=headers,
             )
 
+    except DeadlineExceeded as e:
+        logger.info(f"TTS request abandoned: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         logger.error(f"TTS generation failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -229,9 +664,215 @@ async def create_speech(request: TTSRequest):
 
 # Compatibility endpoint (same as /v1/audio/speech)
 @app.post("/audio/speech")
-async def create_speech_compat(request: TTSRequest):
+async def create_speech_compat(request: TTSRequest, http_request: Request):
     """Compatibility endpoint - redirects to /v1/audio/speech."""
-    return await create_speech(request)
+    return await create_speech(request, http_request)
+
+
+@app.get("/v1/audio/speech/files/{name}")
+async def get_speech_file(name: str, http_request: Request):
+    """Rendered clip by name (the Content-Location of a file-backed response); supports Range."""
+    path = response_cache.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    cache_headers = _cache_headers(name.split(".", 1)[0])
+    if etag_matches(http_request.headers.get("if-none-match"), cache_headers["ETag"]):
+        return Response(status_code=304, headers=cache_headers)
+    return _audio_file_response(path, cache_headers)
+
+
+@app.post("/v1/audio/speech/batch")
+async def create_speech_batch(request: BatchRequest):
+    """
+    Synthesize many inputs in one request (see api/batch.py).
+
+    Items run at batch priority, behind interactive requests, and are
+    returned as multipart/mixed parts in completion order; X-Item-Index
+    maps each part back to its position in the request.
+    """
+    await _require_ready()
+
+    for index, item in enumerate(request.items):
+        if not item.input.strip():
+            raise HTTPException(status_code=400, detail=f"Item {index}: input text cannot be empty")
+
+    logger.info(f"Batch TTS request: {len(request.items)} items")
+    for item in request.items:
+        length_histogram.record(len(item.input))
+
+    boundary = new_boundary()
+    return StreamingResponse(
+        stream_batch(request.items, boundary, response_format=request.response_format),
+        media_type=f"multipart/mixed; boundary={boundary}",
+        headers={"X-Batch-Items": str(len(request.items))},
+    )
+
+
+@app.post("/v1/audio/speech/jobs", status_code=202)
+async def create_speech_job(request: JobRequest):
+    """
+    Synthesize a long document in the background (see api/jobs.py).
+
+    Returns immediately with the job id; poll the job for progress and
+    download its audio once it has completed.
+    """
+    await _require_ready()
+
+    if not request.input.strip():
+        raise HTTPException(status_code=400, detail="Input text cannot be empty")
+
+    try:
+        job = job_manager.submit(
+            request.input,
+            voice=request.voice,
+            speed=request.speed,
+            response_format=request.response_format,
+            trim_silence=request.trim_silence,
+            normalize_loudness=request.normalize_loudness,
+            model=request.model,
+            deadline=deadline_after(request.timeout_ms),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    length_histogram.record(len(request.input))
+    return job.to_dict()
+
+
+@app.get("/v1/audio/speech/jobs/{job_id}")
+async def get_speech_job(job_id: str):
+    """Job status and progress."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/v1/audio/speech/jobs/{job_id}/audio")
+async def get_speech_job_audio(job_id: str):
+    """Download a completed job's audio."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status.value}")
+
+    return FileResponse(
+        job.path,
+        media_type=job.media_type,
+        headers={"X-Audio-Duration": str(job.to_dict()["duration"])},
+    )
+
+
+@app.delete("/v1/audio/speech/jobs/{job_id}", status_code=204)
+async def delete_speech_job(job_id: str):
+    """Cancel a job (if still running) and delete its audio."""
+    if not job_manager.delete(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return Response(status_code=204)
+
+
+@app.websocket("/v1/audio/speech/ws")
+async def speech_websocket(websocket: WebSocket):
+    """
+    Stream speech over a persistent WebSocket (see api/websocket.py).
+
+    Each text message is either one complete TTSRequest or a "begin" message
+    opening an incremental text stream. Utterances are synthesized in the
+    order received and answered with JSON control messages interleaved with
+    binary PCM frames.
+    """
+    await websocket.accept()
+    utterance_count = 0
+
+    try:
+        while True:
+            utterance_id = utterance_count
+            utterance_count += 1
+
+            incremental = False
+            ended = asyncio.Event()  # Set once an incremental stream's "end" has been read
+
+            async def fail(detail: str, **extra) -> None:
+                await send_error(websocket, utterance_id, detail, **extra)
+                if incremental and not ended.is_set():
+                    # The client keeps sending this stream's text; none of
+                    # it may be mistaken for the next utterance
+                    await discard_until_end(websocket)
+
+            try:
+                message = await receive_message(websocket)
+                utterance_id = message.pop("id", utterance_id)
+                kind = message.pop("type", None)
+                if kind not in (None, "begin"):
+                    raise ValueError(f"Unexpected {kind!r} message outside a text stream")
+                incremental = kind == "begin"
+                if incremental:
+                    options = SpeechOptions.model_validate(message)
+                else:
+                    options = request = TTSRequest.model_validate(message)
+            except (ValueError, ValidationError) as e:
+                await fail(str(e))
+                continue
+            deadline = deadline_after(options.timeout_ms)
+
+            if not await _wait_until_ready():
+                await fail("Model not ready")
+                continue
+
+            retry_after = admission.check()
+            if retry_after is not None:
+                await fail("Server busy", retry_after=retry_after)
+                continue
+
+            plan = degradation.plan(options.model)
+            rendered_chars = 0  # Recorded once per utterance, however it is split
+
+            def synthesize(text: str):
+                nonlocal rendered_chars
+                rendered_chars += len(text)
+                return generate_audio_stream(
+                    text=text, voice=options.voice, speed=options.speed, variant=plan.variant,
+                    short_first_segment=plan.short_first_segment, deadline=deadline,
+                )
+
+            if options.timestamps:
+                synthesize = timed_synthesis(synthesize)
+
+            if incremental:
+                logger.info(f"WebSocket TTS (incremental): voice={options.voice}, speed={options.speed}")
+                audio_stream = incremental_audio_stream(websocket, synthesize, ended)
+            else:
+                if not request.input.strip():
+                    await send_error(websocket, utterance_id, "Input text cannot be empty")
+                    continue
+                logger.info(f"WebSocket TTS: voice={request.voice}, speed={request.speed}, "
+                            f"{len(request.input)} chars")
+                if options.timestamps:
+                    audio_stream = sentence_stream(split_sentences(request.input), synthesize)
+                else:
+                    audio_stream = synthesize(request.input)
+
+            try:
+                await stream_utterance(
+                    websocket,
+                    utterance_id,
+                    audio_stream,
+                    trimmer=SilenceTrimmer() if options.trim_silence else None,
+                    normalizer=LoudnessNormalizer() if options.normalize_loudness else None,
+                    tier=plan.tier,
+                )
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket TTS generation failed: {e}")
+                await fail(str(e))
+            finally:
+                if rendered_chars:
+                    length_histogram.record(rendered_chars)
+
+    except WebSocketDisconnect:
+        logger.info("WebSocket client disconnected")
 
 
 def main():
@@ -0,0 +1,63 @@
+"""
+Kokoro TTS API v2 - Process Memory
+
+Per-process memory split into pages unique to this process and pages
+shared with others (file-backed mmaps such as the voice pack, and memory
+inherited copy-on-write from a pre-fork master). With several workers,
+roughly unique x workers + shared is what the host needs.
+
+Read from /proc/self/smaps_rollup on Linux, from psutil where installed
+(uss on macOS), and otherwise only peak RSS is available.
+"""
+
+import os
+import resource
+import sys
+from typing import Any, Optional
+
+_SMAPS_ROLLUP = "/proc/self/smaps_rollup"
+
+
+def _from_smaps() -> Optional[dict[str, int]]:
+    try:
+        with open(_SMAPS_ROLLUP) as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    fields = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        parts = value.split()
+        if len(parts) == 2 and parts[1] == "kB":
+            fields[name] = int(parts[0]) * 1024
+    return {
+        "rss_bytes": fields.get("Rss", 0),
+        "pss_bytes": fields.get("Pss", 0),
+        "unique_bytes": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared_bytes": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+def _from_psutil() -> Optional[dict[str, int]]:
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_full_info()
+    unique = getattr(info, "uss", 0)
+    return {
+        "rss_bytes": info.rss,
+        "pss_bytes": getattr(info, "pss", None),
+        "unique_bytes": unique,
+        "shared_bytes": max(info.rss - unique, 0),
+    }
+
+
+def memory_usage() -> dict[str, Any]:
+    """RSS, PSS, unique and shared bytes for this process (None where unavailable)."""
+    usage = _from_smaps() or _from_psutil()
+    if usage is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024  # Bytes on macOS, kB elsewhere
+        usage = {"rss_bytes": peak, "pss_bytes": None, "unique_bytes": None, "shared_bytes": None}
+    return {"pid": os.getpid(), **usage}
@@ -0,0 +1,58 @@
+"""
+Kokoro TTS API v2 - Pre-fork Preparation
+
+Multi-worker deployments (gunicorn, see gunicorn.conf.py) prepare the
+model once in the master instead of in every worker.
+
+MLX itself cannot be shared across fork: Metal device state does not
+survive it, and MLX arrays live in per-process buffers. So the master
+never imports MLX. Instead, before forking, it runs this module in a
+subprocess, which builds the prepared weight artifact (api/artifacts.py)
+and the voice pack (api/voices.py). Workers then create their MLX runtime
+after fork, in their own lifespan, and only read those files. The read-only
+data is shared through the page cache rather than copied per worker. The
+voice pack is memory-mapped, so its pages stay shared for the life of each
+worker.
+
+Run directly to prepare artifacts ahead of a deploy:
+
+    python -m api.prefork
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import time
+
+from .config import MODEL_ID
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def prepare() -> None:
+    """Build the prepared model and voice pack (imports MLX; run in a subprocess before forking)."""
+    from .artifacts import load_model
+    from .voices import install_registry
+
+    install_registry(load_model(MODEL_ID))
+
+
+def prepare_in_subprocess(timeout: float = 600) -> bool:
+    """Run prepare() in a fresh interpreter, keeping MLX out of this process."""
+    start_time = time.perf_counter()
+    try:
+        subprocess.run([sys.executable, "-m", "api.prefork"], check=True, timeout=timeout, cwd=_PROJECT_ROOT)
+    except (OSError, subprocess.SubprocessError) as e:
+        # Workers still load on their own; they just each pay the full preparation
+        logger.warning(f"Pre-fork preparation failed ({e}); workers will prepare the model themselves")
+        return False
+    logger.info(f"Pre-fork preparation done in {time.perf_counter() - start_time:.1f}s")
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    prepare()
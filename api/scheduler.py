@@ -0,0 +1,197 @@
+"""
+Kokoro TTS API v2 - Inference Scheduling
+
+A priority-aware stand-in for the single-worker ThreadPoolExecutor that
+serializes MLX inference. Work still runs on one dedicated thread (see the
+Metal command-encoder note in api/tts.py); the only difference is the order
+in which queued work is picked up: interactive requests always run before
+queued batch work, FIFO within the same priority.
+
+Each work item carries a cost, its size in the caller's unit (the MLX worker
+uses characters of text). The executor keeps a running average of seconds
+per unit of cost, from which estimated_wait predicts how long new work would
+queue behind the cost already waiting (see api/degradation.py). Maintenance
+work (model builds, warmup, cache clears) is submitted with cost=None: it
+runs like any other work but neither feeds the average nor counts as
+queued cost.
+
+Work may carry a deadline (a time.monotonic() value). Work still queued
+when its deadline passes is dropped unrun, its future failing with
+DeadlineExceeded; long-running work can check deadline_passed itself and
+raise DeadlineExceeded to stop early. Both are counted in expired.
+"""
+
+import concurrent.futures
+import itertools
+import queue
+import threading
+import time
+from collections import Counter
+from enum import IntEnum
+from typing import Any, Callable, Optional
+
+
+class DeadlineExceeded(Exception):
+    """The request's deadline passed before its work could finish."""
+
+
+def deadline_after(timeout_ms: Optional[float]) -> Optional[float]:
+    """Deadline timeout_ms from now (None for no timeout)."""
+    return None if timeout_ms is None else time.monotonic() + timeout_ms / 1000
+
+
+def deadline_passed(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+class Priority(IntEnum):
+    """Scheduling class for inference work (lower runs first)."""
+    INTERACTIVE = 0
+    BATCH = 10
+
+
+_SHUTDOWN = float("inf")  # Sorts after all real work, so shutdown drains the queue
+_SERVICE_EMA_ALPHA = 0.2  # Weight of the newest work item in the per-unit service time average
+
+
+class PriorityExecutor:
+    """
+    Executor with a priority queue in front of a fixed set of worker threads.
+
+    Supports the subset of the concurrent.futures.Executor interface this
+    server uses (submit and shutdown), so it also works with
+    loop.run_in_executor. Worker threads start on first submit.
+    """
+
+    def __init__(self, max_workers: int = 1, thread_name_prefix: str = "worker"):
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._shutdown = False
+        self._lock = threading.Lock()
+        self._queued_cost: Counter = Counter()  # Cost of waiting work by priority
+        self._running = 0
+        self._running_cost = 0.0
+        self._service_s: Optional[float] = None
+        self._expired: Counter = Counter()  # Deadline-expired work: "queued" (dropped) and "running" (stopped)
+
+    @property
+    def queue_depth(self) -> int:
+        """Work items waiting to start (not counting running work)."""
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> int:
+        """Work items currently running."""
+        return self._running
+
+    @property
+    def expired(self) -> dict[str, int]:
+        """Deadline-expired work items: dropped while queued, and stopped while running."""
+        with self._lock:
+            return {"queued": self._expired["queued"], "running": self._expired["running"]}
+
+    @property
+    def service_time(self) -> Optional[float]:
+        """Moving average of seconds per unit of cost (None until costed work has finished)."""
+        return self._service_s
+
+    def estimated_wait(self, priority: int = Priority.INTERACTIVE) -> float:
+        """
+        Seconds that new work at priority would wait before starting.
+
+        Counts the cost of work queued at the same or a more urgent
+        priority, plus running work (assumed half done), at the average
+        service time per unit of cost. 0 until costed work has finished.
+        """
+        with self._lock:
+            if self._service_s is None:
+                return 0.0
+            ahead = sum(c for p, c in self._queued_cost.items() if p <= priority) + self._running_cost / 2
+            return ahead * self._service_s / self._max_workers
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        priority: int = Priority.INTERACTIVE,
+        deadline: Optional[float] = None,
+        cost: Optional[float] = 1.0,
+        **kwargs: Any,
+    ) -> concurrent.futures.Future:
+        """Queue fn(*args, **kwargs) and return a Future for its result (see the module note on deadline and cost)."""
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            self._queue.put((priority, next(self._sequence), future, fn, args, kwargs, deadline, cost))
+            self._queued_cost[priority] += cost or 0
+            self._start_workers()
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work; queued work still runs before workers exit."""
+        with self._lock:
+            if not self._shutdown:
+                self._shutdown = True
+                for _ in self._threads:
+                    self._queue.put((_SHUTDOWN, next(self._sequence), None, None, (), {}, None, None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _start_workers(self) -> None:
+        while len(self._threads) < self._max_workers:
+            thread = threading.Thread(
+                target=self._worker,
+                name=f"{self._thread_name_prefix}_{len(self._threads)}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self) -> None:
+        while True:
+            priority, _, future, fn, args, kwargs, deadline, cost = self._queue.get()
+            if future is None:
+                return
+            with self._lock:
+                self._queued_cost[priority] -= cost or 0
+            if not future.set_running_or_notify_cancel():
+                continue
+            if deadline_passed(deadline):
+                with self._lock:
+                    self._expired["queued"] += 1
+                future.set_exception(DeadlineExceeded("Deadline passed while queued"))
+                continue
+            with self._lock:
+                self._running += 1
+                self._running_cost += cost or 0
+            start_time = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                self._record(start_time, cost, expired=isinstance(e, DeadlineExceeded))
+                future.set_exception(e)
+            else:
+                self._record(start_time, cost)
+                future.set_result(result)
+
+    def _record(self, start_time: float, cost: Optional[float], expired: bool = False) -> None:
+        elapsed = time.perf_counter() - start_time
+        with self._lock:
+            self._running -= 1
+            self._running_cost -= cost or 0
+            if expired:
+                self._expired["running"] += 1
+                return  # Cut short, so not a representative service time
+            if not cost:
+                return  # Maintenance work says nothing about request service time
+            per_unit = elapsed / cost
+            if self._service_s is None:
+                self._service_s = per_unit
+            else:
+                self._service_s += _SERVICE_EMA_ALPHA * (per_unit - self._service_s)
@@ -5,11 +5,23 @@ Simple audio streaming with chunked transfer encoding.
 No complex buffering or adaptive management.
 """
 
+import logging
 import struct
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Iterator, Optional
 import numpy as np
 
-from .config import SAMPLE_RATE, CHUNK_SIZE_SAMPLES
+from .config import (
+    SAMPLE_RATE,
+    CHUNK_SIZE_SAMPLES,
+    SILENCE_THRESHOLD_DB,
+    SILENCE_PAD_MS,
+    MAX_JOIN_SILENCE_MS,
+    CROSSFADE_MS,
+)
+from .loudness import LoudnessNormalizer
+from .scheduler import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
 
 
 def audio_to_pcm_bytes(audio: np.ndarray) -> bytes:
@@ -66,6 +78,135 @@ def create_wav_header(num_samples: int, sample_rate: int = SAMPLE_RATE) -> bytes
     return header
 
 
+def _pcm_chunks(audio: np.ndarray) -> Iterator[bytes]:
+    """Convert audio to PCM and split it into CHUNK_SIZE_SAMPLES-sized chunks."""
+    pcm_data = audio_to_pcm_bytes(audio)
+    chunk_size_bytes = CHUNK_SIZE_SAMPLES * 2  # 2 bytes per sample (16-bit)
+
+    for i in range(0, len(pcm_data), chunk_size_bytes):
+        yield pcm_data[i:i + chunk_size_bytes]
+
+
+def silence_bounds(audio: np.ndarray, threshold: float) -> tuple[int, int]:
+    """
+    Leading and trailing silence lengths in samples.
+
+    Args:
+        audio: Float32 audio array.
+        threshold: Linear amplitude at or below which a sample is silent.
+
+    Returns:
+        Tuple of (leading, trailing); both are len(audio) if all silent.
+    """
+    loud = np.abs(audio) > threshold
+    if not loud.any():
+        return len(audio), len(audio)
+    return int(loud.argmax()), int(loud[::-1].argmax())
+
+
+class SilenceTrimmer:
+    """
+    Trims dead air from a live segment stream.
+
+    Leading silence of the first segment is cut down to SILENCE_PAD_MS so
+    the first word starts as soon as the first bytes play. At each segment
+    join the combined trailing + leading silence is capped at max_gap_ms and
+    the boundary is smoothed with a short equal-power crossfade.
+
+    Each segment's trailing silence (and at least one crossfade length) is
+    held back until the next segment arrives; held-back audio is silence, so
+    this never delays speech.
+    """
+
+    def __init__(
+        self,
+        threshold_db: float = SILENCE_THRESHOLD_DB,
+        pad_ms: float = SILENCE_PAD_MS,
+        max_gap_ms: float = MAX_JOIN_SILENCE_MS,
+        crossfade_ms: float = CROSSFADE_MS,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        self.sample_rate = sample_rate
+        self._threshold = 10 ** (threshold_db / 20)
+        self._pad = int(sample_rate * pad_ms / 1000)
+        self._max_gap = int(sample_rate * max_gap_ms / 1000)
+        self._crossfade = int(sample_rate * crossfade_ms / 1000)
+        self._held: Optional[np.ndarray] = None
+        self._held_silence = 0
+        self.leading_trimmed_samples = 0
+        self.join_trimmed_samples = 0
+
+    @property
+    def trimmed_ms(self) -> float:
+        """Total silence removed so far, in milliseconds."""
+        return 1000.0 * (self.leading_trimmed_samples + self.join_trimmed_samples) / self.sample_rate
+
+    @property
+    def held_samples(self) -> int:
+        """Audio processed but not yet emitted (returned by a later process or flush)."""
+        return len(self._held) if self._held is not None else 0
+
+    @property
+    def leading_trimmed_ms(self) -> float:
+        """Silence removed before the first word, in milliseconds."""
+        return 1000.0 * self.leading_trimmed_samples / self.sample_rate
+
+    def process(self, segment: np.ndarray) -> np.ndarray:
+        """Trim and join one segment; returns the audio ready to emit."""
+        segment = np.asarray(segment, dtype=np.float32)
+        if len(segment) == 0:
+            return segment
+
+        lead, trail = silence_bounds(segment, self._threshold)
+
+        if self._held is None:
+            cut = max(0, lead - self._pad)
+            self.leading_trimmed_samples += cut
+            segment = segment[cut:]
+            head = np.empty(0, dtype=np.float32)
+        else:
+            held = self._held
+            excess = max(0, self._held_silence + lead - self._max_gap)
+            drop_held = min(excess, self._held_silence)
+            drop_next = min(excess - drop_held, lead)
+            held = held[:len(held) - drop_held]
+            segment = segment[drop_next:]
+            self.join_trimmed_samples += drop_held + drop_next
+
+            n = min(self._crossfade, len(held), len(segment))
+            if n > 0:
+                theta = np.linspace(0.0, np.pi / 2, n, dtype=np.float32)
+                mixed = held[len(held) - n:] * np.cos(theta) + segment[:n] * np.sin(theta)
+                head = np.concatenate([held[:len(held) - n], mixed])
+                segment = segment[n:]
+            else:
+                head = held
+
+        hold = min(len(segment), max(trail, self._crossfade))
+        self._held = segment[len(segment) - hold:]
+        self._held_silence = min(trail, hold)
+        return np.concatenate([head, segment[:len(segment) - hold]])
+
+    def flush(self) -> np.ndarray:
+        """Emit the held-back tail at end of stream."""
+        held = self._held if self._held is not None else np.empty(0, dtype=np.float32)
+        self._held = None
+        self._held_silence = 0
+        return held
+
+
+def trim_silence(audio: np.ndarray) -> tuple[np.ndarray, float]:
+    """
+    Trim leading silence from a complete clip (blocking path).
+
+    Returns:
+        Tuple of (trimmed_audio, trimmed_ms).
+    """
+    trimmer = SilenceTrimmer()
+    trimmed = np.concatenate([trimmer.process(audio), trimmer.flush()])
+    return trimmed, trimmer.trimmed_ms
+
+
 async def stream_audio_chunks(
     audio: np.ndarray,
     include_wav_header: bool = False,
@@ -95,6 +236,8 @@ async def stream_audio_chunks(
 
 async def stream_audio_chunks_live(
     audio_stream: AsyncGenerator[tuple[np.ndarray, int], None],
+    normalizer: Optional[LoudnessNormalizer] = None,
+    trimmer: Optional[SilenceTrimmer] = None,
 ) -> AsyncGenerator[bytes, None]:
     """
     Stream PCM chunks from a live audio generator.
@@ -104,17 +247,41 @@ async def stream_audio_chunks_live(
 
     Args:
         audio_stream: Async generator yielding (audio_segment, sample_rate) tuples.
+        normalizer: Optional loudness normalizer applied to each segment. Its
+            limiter holds back normalizer.latency_ms of audio until the next
+            segment (or end of stream) arrives.
+        trimmer: Optional silence trimmer applied before normalization —
+            removes leading dead air and crossfades segment joins.
+
+    If the request's deadline passes mid-stream (DeadlineExceeded), the
+    response has already started, so the audio so far is finished off
+    normally and the stream ends early.
 
     Yields:
         PCM bytes chunks (16-bit signed, little-endian).
     """
-    chunk_size_bytes = CHUNK_SIZE_SAMPLES * 2  # 2 bytes per sample (16-bit)
+    try:
+        async for audio_segment, sample_rate in audio_stream:
+            if trimmer is not None:
+                audio_segment = trimmer.process(audio_segment)
+            if normalizer is not None:
+                audio_segment = normalizer.process(audio_segment)
+
+            for chunk in _pcm_chunks(audio_segment):
+                yield chunk
+    except DeadlineExceeded as e:
+        logger.info(f"Stream ended early: {e}")
 
-    async for audio_segment, sample_rate in audio_stream:
-        pcm_data = audio_to_pcm_bytes(audio_segment)
+    tail = np.empty(0, dtype=np.float32)
+    if trimmer is not None:
+        tail = trimmer.flush()
+        logger.info(f"Trimmed {trimmer.trimmed_ms:.0f}ms of silence "
+                    f"({trimmer.leading_trimmed_ms:.0f}ms before first word)")
+    if normalizer is not None:
+        tail = np.concatenate([normalizer.process(tail), normalizer.flush()])
 
-        for i in range(0, len(pcm_data), chunk_size_bytes):
-            yield pcm_data[i:i + chunk_size_bytes]
+    for chunk in _pcm_chunks(tail):
+        yield chunk
 
 
 def get_audio_duration(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> float:
@@ -0,0 +1,157 @@
+"""
+Kokoro TTS API v2 - Time Stretching
+
+Pitch-preserving tempo change, used to serve a new speed from an existing
+rendering instead of running inference again.
+
+Two algorithms behind one quality switch:
+
+- "fast": WSOLA. Overlap-adds 20 ms windows taken from the input at the
+  new rate, nudging each one (within ±5 ms) to the position that best
+  continues the previous window. Works well on speech and costs a few
+  milliseconds per second of audio.
+- "high": phase vocoder with identity phase locking. Resynthesizes the
+  STFT at the new frame rate, keeping each peak's neighbouring bins
+  phase-coherent. Smoother on sustained vowels, several times the cost.
+
+Both are vectorized with numpy except WSOLA's per-frame alignment search,
+which is inherently sequential (each frame depends on the previous choice).
+"""
+
+from typing import Literal
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .config import SAMPLE_RATE
+
+StretchQuality = Literal["fast", "high"]
+
+_WSOLA_FRAME_MS = 20.0
+_WSOLA_TOLERANCE_MS = 5.0
+
+_PV_FFT = 1024
+_PV_HOP = 256
+
+
+def _periodic_hann(n: int) -> np.ndarray:
+    return (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n) / n)).astype(np.float32)
+
+
+def _fit_length(audio: np.ndarray, length: int) -> np.ndarray:
+    if len(audio) >= length:
+        return audio[:length]
+    return np.pad(audio, (0, length - len(audio)))
+
+
+def _wsola(audio: np.ndarray, rate: float, sample_rate: int) -> np.ndarray:
+    frame = int(sample_rate * _WSOLA_FRAME_MS / 1000) // 2 * 2
+    hop = frame // 2
+    tolerance = int(sample_rate * _WSOLA_TOLERANCE_MS / 1000)
+    analysis_hop = hop * rate
+
+    n_frames = int(np.ceil(len(audio) / analysis_hop)) + 1
+    padded = np.pad(audio, (tolerance + frame, tolerance + 2 * frame + hop))
+    base = tolerance + frame  # index of audio[0] in padded
+
+    positions = np.empty(n_frames, dtype=np.int64)
+    positions[0] = base
+    offsets = np.arange(-tolerance, tolerance + 1)
+
+    for k in range(1, n_frames):
+        # The input that naturally follows the previous frame's first half
+        template = padded[positions[k - 1] + hop:positions[k - 1] + hop + frame]
+        nominal = base + int(round(k * analysis_hop))
+        region = padded[nominal - tolerance:nominal + tolerance + frame]
+        scores = np.correlate(region, template, mode="valid")
+        positions[k] = nominal + offsets[int(np.argmax(scores))]
+
+    window = _periodic_hann(frame)
+    frames = padded[positions[:, None] + np.arange(frame)] * window
+
+    # 50% overlap: each output hop is the second half of one frame plus the
+    # first half of the next (periodic Hann halves sum to one)
+    out = np.zeros((n_frames + 1, hop), dtype=np.float32)
+    out[:-1] += frames[:, :hop]
+    out[1:] += frames[:, hop:]
+    return out.reshape(-1)
+
+
+def _phase_vocoder(audio: np.ndarray, rate: float) -> np.ndarray:
+    window = _periodic_hann(_PV_FFT)
+    padded = np.pad(audio, (_PV_FFT, _PV_FFT + _PV_HOP))
+    frames = sliding_window_view(padded, _PV_FFT)[::_PV_HOP] * window
+    spectrum = np.fft.rfft(frames, axis=1)
+    magnitude = np.abs(spectrum)
+    phase = np.angle(spectrum)
+
+    # Fractional analysis frame for each output frame
+    steps = np.arange(0, len(spectrum) - 1, rate)
+    lower = steps.astype(np.int64)
+    frac = (steps - lower)[:, None]
+    out_magnitude = (1 - frac) * magnitude[lower] + frac * magnitude[lower + 1]
+
+    # Instantaneous frequency per bin, as phase advance per hop
+    expected = 2 * np.pi * _PV_HOP * np.arange(spectrum.shape[1]) / _PV_FFT
+    advance = phase[lower + 1] - phase[lower] - expected
+    advance = expected + (advance + np.pi) % (2 * np.pi) - np.pi
+    out_phase = phase[0] + np.concatenate([np.zeros((1, len(expected))), np.cumsum(advance[:-1], axis=0)])
+
+    # Identity phase locking: every bin takes its nearest peak's phase
+    # trajectory, keeping the analysis phase offset relative to that peak
+    is_peak = np.zeros_like(out_magnitude, dtype=bool)
+    is_peak[:, 1:-1] = (out_magnitude[:, 1:-1] > out_magnitude[:, :-2]) & (out_magnitude[:, 1:-1] >= out_magnitude[:, 2:])
+    bins = np.arange(out_magnitude.shape[1])
+    peak_index = np.where(is_peak, bins, -1)
+    left = np.maximum.accumulate(peak_index, axis=1)
+    right = np.flip(np.minimum.accumulate(np.flip(np.where(is_peak, bins, 1 << 30), axis=1), axis=1), axis=1)
+    nearest = np.where(
+        (left < 0) | ((right < (1 << 30)) & (right - bins < bins - left)), right, left,
+    )
+    nearest = np.where((nearest < 0) | (nearest >= (1 << 30)), bins, nearest)
+    rows = np.arange(len(nearest))[:, None]
+    analysis_phase = phase[lower]
+    locked = out_phase[rows, nearest] + analysis_phase - analysis_phase[rows, nearest]
+
+    resynth = np.fft.irfft(out_magnitude * np.exp(1j * locked), n=_PV_FFT, axis=1) * window
+
+    # Overlap-add at the analysis hop, normalized by the summed window power
+    n_out = len(resynth)
+    out = np.zeros((n_out + _PV_FFT // _PV_HOP, _PV_HOP))
+    norm = np.zeros_like(out)
+    for j in range(_PV_FFT // _PV_HOP):
+        segment = slice(j * _PV_HOP, (j + 1) * _PV_HOP)
+        out[j:j + n_out] += resynth[:, segment]
+        norm[j:j + n_out] += (window[segment] ** 2)
+    out = out.reshape(-1) / np.maximum(norm.reshape(-1), 1e-3)
+    return out[int(round(_PV_FFT / rate)):].astype(np.float32)  # Drop the (stretched) leading pad
+
+
+def time_stretch(
+    audio: np.ndarray,
+    rate: float,
+    quality: StretchQuality = "fast",
+    sample_rate: int = SAMPLE_RATE,
+) -> np.ndarray:
+    """
+    Change tempo without changing pitch.
+
+    Args:
+        audio: Float32 mono audio.
+        rate: Speed factor; 1.5 plays in two thirds of the time.
+        quality: "fast" (WSOLA) or "high" (phase-locked phase vocoder).
+        sample_rate: Audio sample rate in Hz.
+
+    Returns:
+        Float32 audio of length round(len(audio) / rate).
+    """
+    length = int(round(len(audio) / rate))
+    if rate == 1.0 or len(audio) == 0:
+        return audio.astype(np.float32, copy=False)
+
+    audio = audio.astype(np.float32, copy=False)
+    if quality == "high":
+        stretched = _phase_vocoder(audio, rate)
+    else:
+        stretched = _wsola(audio, rate, sample_rate)
+    return _fit_length(stretched, length).astype(np.float32, copy=False)
@@ -0,0 +1,99 @@
+"""
+Kokoro TTS API v2 - Text Segmentation
+
+Sentence boundary detection for text that arrives incrementally (LLM token
+streams over the WebSocket). A sentence is released as soon as its
+terminating punctuation is followed by whitespace, so synthesis of the
+first sentence starts while the rest of the reply is still being generated.
+"""
+
+import re
+
+from .config import INCREMENTAL_MAX_CHARS
+
+# Terminal punctuation (optionally followed by closing quotes/brackets) and
+# whitespace, or a line break. Requiring the whitespace keeps "3.14" and
+# "end." at the end of a partial token from splitting early.
+_SENTENCE_BOUNDARY = re.compile(r"[.!?…]+[\"'”’)\]]*\s+|\n+")
+
+# Clause punctuation used to split run-on text that exceeds the max length
+_CLAUSE_BOUNDARY = re.compile(r"[,;:—–]\s+")
+
+_ABBREVIATIONS = frozenset({
+    "mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "vs.",
+    "e.g.", "i.e.", "no.", "fig.", "approx.",
+})
+
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    """Whether the period ending at text[end - 1] belongs to an abbreviation."""
+    start = text.rfind(" ", 0, end) + 1
+    return text[start:end].lower() in _ABBREVIATIONS
+
+
+class SentenceBuffer:
+    """
+    Accumulates streamed text and releases complete sentences.
+
+    Text with no sentence boundary is force-split at the last clause
+    boundary (or word) once it exceeds max_chars, so a long run-on reply
+    cannot hold back audio indefinitely.
+    """
+
+    def __init__(self, max_chars: int = INCREMENTAL_MAX_CHARS):
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    @property
+    def pending(self) -> str:
+        """Text received but not yet released."""
+        return self._buffer
+
+    def _next_boundary(self) -> int:
+        for match in _SENTENCE_BOUNDARY.finditer(self._buffer):
+            punct_end = match.start() + len(match.group().rstrip())
+            if match.group()[0] == "." and _is_abbreviation(self._buffer, punct_end):
+                continue
+            return match.end()
+        return -1
+
+    def _forced_split(self) -> int:
+        window = self._buffer[:self.max_chars]
+        clauses = list(_CLAUSE_BOUNDARY.finditer(window))
+        if clauses:
+            return clauses[-1].end()
+        space = window.rfind(" ")
+        return space + 1 if space > 0 else self.max_chars
+
+    def _take(self, end: int) -> str:
+        sentence = self._buffer[:end].strip()
+        self._buffer = self._buffer[end:].lstrip()
+        return sentence
+
+    def feed(self, text: str) -> list[str]:
+        """Add text; returns any sentences completed by it."""
+        self._buffer += text
+        sentences = []
+
+        while True:
+            end = self._next_boundary()
+            if end < 0:
+                if len(self._buffer) <= self.max_chars:
+                    break
+                end = self._forced_split()
+            sentence = self._take(end)
+            if sentence:
+                sentences.append(sentence)
+
+        return sentences
+
+    def flush(self) -> list[str]:
+        """Release whatever text remains (end of stream)."""
+        sentence = self._take(len(self._buffer))
+        return [sentence] if sentence else []
+
+
+def split_sentences(text: str, max_chars: int = INCREMENTAL_MAX_CHARS) -> list[str]:
+    """Split complete text into sentences using the same rules as SentenceBuffer."""
+    buffer = SentenceBuffer(max_chars=max_chars)
+    return buffer.feed(text) + buffer.flush()
@@ -0,0 +1,126 @@
+"""
+Kokoro TTS API v2 - Word Timestamps
+
+Word-level start/end times for karaoke-style highlighting, produced during
+synthesis with no alignment pass.
+
+Timed synthesis runs one model call per sentence, so every sentence's span
+in the output is exact: it is the audio the model produced for that
+sentence, with its predicted durations already applied. kokoro-mlx does not
+expose per-token durations, so within a sentence the voiced span is shared
+out across words by estimated phoneme length, with short pauses after
+clause and sentence punctuation.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import AsyncGenerator, Callable
+
+import numpy as np
+
+from .config import SAMPLE_RATE, SILENCE_THRESHOLD_DB
+from .streaming import silence_bounds
+
+_CLAUSE_PAUSE = 3.0    # in phoneme-equivalents
+_SENTENCE_PAUSE = 5.0
+_DIGIT_WEIGHT = 3.0    # digits expand to whole spoken words ("42" -> "forty two")
+
+
+@dataclass
+class WordTiming:
+    """One word and its position in the output stream, in seconds."""
+    word: str
+    start: float
+    end: float
+
+    def to_dict(self) -> dict:
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in asdict(self).items()}
+
+
+def _word_weight(word: str) -> float:
+    letters = sum(c.isalpha() for c in word)
+    digits = sum(c.isdigit() for c in word)
+    return max(1.0, letters + _DIGIT_WEIGHT * digits)
+
+
+def _pause_weight(word: str) -> float:
+    stripped = word.rstrip("\"'”’)]")
+    if not stripped:
+        return 0.0
+    if stripped[-1] in ".!?…":
+        return _SENTENCE_PAUSE
+    if stripped[-1] in ",;:—–":
+        return _CLAUSE_PAUSE
+    return 0.0
+
+
+def estimate_word_timings(
+    text: str,
+    audio: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    offset: float = 0.0,
+) -> list[WordTiming]:
+    """
+    Place each word of text within the voiced span of audio.
+
+    Args:
+        text: The text that audio was synthesized from.
+        audio: Float32 audio for exactly that text.
+        sample_rate: Audio sample rate in Hz.
+        offset: Stream position of audio[0], in seconds.
+
+    Returns:
+        One WordTiming per whitespace-separated word, in order.
+    """
+    words = text.split()
+    if not words or len(audio) == 0:
+        return []
+
+    lead, trail = silence_bounds(audio, 10 ** (SILENCE_THRESHOLD_DB / 20))
+    start, end = lead, len(audio) - trail
+    if end <= start:
+        start, end = 0, len(audio)
+
+    # Interleave word and pause weights; the final pause is trailing silence
+    weights = np.empty(2 * len(words))
+    weights[0::2] = [_word_weight(w) for w in words]
+    weights[1::2] = [_pause_weight(w) for w in words]
+    weights[-1] = 0.0
+
+    edges = np.concatenate([[0.0], np.cumsum(weights)])
+    positions = offset + (start + (end - start) * edges / edges[-1]) / sample_rate
+
+    return [
+        WordTiming(word=w, start=float(positions[2 * i]), end=float(positions[2 * i + 1]))
+        for i, w in enumerate(words)
+    ]
+
+
+def timed_synthesis(
+    synthesize: Callable[[str], AsyncGenerator[tuple[np.ndarray, int], None]],
+) -> Callable[[str], AsyncGenerator[tuple[np.ndarray, int, str], None]]:
+    """
+    Wrap a per-text synthesizer so each sentence yields one tagged segment.
+
+    The wrapped generator yields a single (audio, sample_rate, sentence)
+    tuple per call, so word timings can be computed against exactly the
+    audio that sentence produced.
+    """
+    async def _synthesize(sentence: str) -> AsyncGenerator[tuple[np.ndarray, int, str], None]:
+        segments = []
+        sample_rate = SAMPLE_RATE
+        async for audio, sample_rate in synthesize(sentence):
+            segments.append(audio)
+        if segments:
+            yield np.concatenate(segments), sample_rate, sentence
+
+    return _synthesize
+
+
+async def sentence_stream(
+    sentences: list[str],
+    synthesize: Callable[[str], AsyncGenerator[tuple, None]],
+) -> AsyncGenerator[tuple, None]:
+    """Synthesize sentences one after another as a single stream."""
+    for sentence in sentences:
+        async for segment in synthesize(sentence):
+            yield segment
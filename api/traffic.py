@@ -0,0 +1,108 @@
+"""
+Kokoro TTS API v2 - Input Length Statistics
+
+A histogram of the input lengths the model is actually asked to render,
+used to choose the warmup plan's length buckets from real traffic instead
+of a fixed guess. The endpoints record one sample per request (speech
+request, WebSocket utterance, batch item or job) that reaches inference,
+never one per segment or sentence it is split into.
+
+Padding inputs to a fixed set of bucket sizes does not fit Kokoro: it
+selects the style vector by token count, and padding phonemes would be
+spoken, so padded audio cannot simply be trimmed. Shape stability comes
+from warming the lengths traffic actually uses instead. The histogram is
+saved on shutdown (TRAFFIC_STATS_PATH) and loaded on the next start, so
+each deploy warms the shapes of the previous one's traffic.
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Any, Optional
+
+from .config import TRAFFIC_BUCKET_QUANTILES, TRAFFIC_MIN_SAMPLES, TRAFFIC_STATS_PATH
+
+logger = logging.getLogger(__name__)
+
+_BIN_CHARS = 16  # Histogram resolution
+_MAX_CHARS = 512  # Kokoro renders at most 510 tokens per call; longer inputs are split
+
+
+class LengthHistogram:
+    """Thread-safe counts of input lengths in _BIN_CHARS-wide bins."""
+
+    def __init__(self, path: str = TRAFFIC_STATS_PATH):
+        self.path = path
+        self._counts = [0] * (_MAX_CHARS // _BIN_CHARS)
+        self._lock = threading.Lock()
+
+    @property
+    def samples(self) -> int:
+        return sum(self._counts)
+
+    def record(self, chars: int) -> None:
+        index = min(max(chars - 1, 0) // _BIN_CHARS, len(self._counts) - 1)
+        with self._lock:
+            self._counts[index] += 1
+
+    def quantile(self, q: float) -> int:
+        """Upper edge (in characters) of the bin holding quantile q."""
+        with self._lock:
+            counts = list(self._counts)
+        threshold = q * sum(counts)
+        running = 0
+        for index, count in enumerate(counts):
+            running += count
+            if count and running >= threshold:
+                return (index + 1) * _BIN_CHARS
+        return _MAX_CHARS
+
+    def suggest_buckets(
+        self,
+        quantiles: tuple[float, ...] = TRAFFIC_BUCKET_QUANTILES,
+        min_samples: int = TRAFFIC_MIN_SAMPLES,
+    ) -> Optional[list[int]]:
+        """Warmup lengths covering the given traffic quantiles, or None without enough samples."""
+        if self.samples < min_samples:
+            return None
+        return sorted({self.quantile(q) for q in quantiles})
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+        return {
+            "bin_chars": _BIN_CHARS,
+            "samples": sum(counts),
+            "counts": counts,
+            "suggested_buckets": self.suggest_buckets(),
+        }
+
+    def load(self) -> None:
+        """Restore counts saved by a previous run (missing or unreadable files are ignored)."""
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get("bin_chars") != _BIN_CHARS or len(saved.get("counts", [])) != len(self._counts):
+            return
+        with self._lock:
+            self._counts = [int(count) for count in saved["counts"]]
+        logger.info(f"Loaded input length statistics: {self.samples} samples")
+
+    def save(self) -> None:
+        if not self.samples:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.to_dict(), f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Input length statistics not saved ({e})")
+
+
+length_histogram = LengthHistogram()
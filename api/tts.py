@@ -7,34 +7,96 @@ client can begin playing while subsequent segments are still synthesizing.
 
 All MLX inference is pinned to a single worker thread (see _mlx_executor)
 because the Metal command-encoder is not safe for concurrent use across
-threads.
+threads. Queued work is picked up by priority, so interactive requests run
+ahead of batch work. Work carries the request's deadline, if any: it is
+dropped if the deadline passes while queued, and generation stops between
+phoneme batches once the deadline has passed or a stream's consumer is gone.
+
+When MLX runs on the CPU, TTS_INFERENCE_WORKERS > 1 runs long texts as
+independent segments in parallel and reassembles them in order (see
+parallel_segments); on the GPU it is refused at startup.
+
+Several model variants (MODEL_VARIANTS, e.g. a quantized one) can be
+served next to the default model. Requests pick one by name (the "model"
+field); the variants share the default model's voice registry.
+
+kokoro_mlx and MLX (including the voice registry, which subclasses a
+kokoro_mlx class, and the prepared-weights loader in api/artifacts.py) are
+imported in initialize_model rather than at module
+load, so importing the API and answering /health do not wait for the
+inference stack.
 """
 
 import asyncio
 import concurrent.futures
+import contextlib
+import gc
 import logging
 import queue
+import threading
 import time
-from typing import AsyncGenerator, Optional, Tuple
+from collections import Counter
+from typing import TYPE_CHECKING, AsyncGenerator, Optional, Tuple
 
 import numpy as np
-from kokoro_mlx import KokoroTTS
 
 from .config import (
     MODEL_ID,
+    MODEL_ARTIFACTS,
+    MODEL_VARIANTS,
     DEFAULT_VOICE,
     DEFAULT_SPEED,
     MIN_SPEED,
     MAX_SPEED,
     SAMPLE_RATE,
     WARMUP_TEXT,
+    INFERENCE_WORKERS,
+    PARALLEL_MIN_CHARS,
+    PARALLEL_SEGMENT_CHARS,
+    RELOAD_DRAIN_TIMEOUT_S,
 )
+from .scheduler import DeadlineExceeded, Priority, PriorityExecutor, deadline_passed
+from .text import split_sentences
+
+if TYPE_CHECKING:
+    from kokoro_mlx import KokoroTTS
+
+    from .voices import VoiceRegistry
 
 logger = logging.getLogger(__name__)
 
 # Global model instance
-_model: Optional[KokoroTTS] = None
+_model: Optional["KokoroTTS"] = None
 _model_ready: bool = False
+_voice_registry: Optional["VoiceRegistry"] = None
+
+# Startup progress, reported on /health while the model loads in the
+# background. Fractions are rough shares of a typical cold start.
+_LOAD_PROGRESS = {
+    "pending": 0.0,
+    "loading_model": 0.05,
+    "loading_voices": 0.6,
+    "warming_up": 0.8,
+    "ready": 1.0,
+    "failed": 0.0,
+}
+_load_phase: str = "pending"
+_load_error: Optional[str] = None
+
+# Active model and the last zero-downtime reload (see reload_model)
+_model_info: dict = {"id": MODEL_ID, "hash": None, "loaded_at": None}
+_RELOAD_ACTIVE = ("loading", "warming_up", "draining")
+_reload_state: dict = {"state": "idle"}
+_reload_lock = threading.Lock()
+
+# Work items queued or running per model (by id), so a reload knows when
+# the model it replaced is no longer in use (see _submit_for)
+_in_flight: Counter = Counter()
+_in_flight_changed = threading.Condition()
+
+# Additional variants by name (see load_variants)
+_variants: dict[str, "KokoroTTS"] = {}
+_variant_info: dict[str, dict] = {}
 
 # MLX is not safe for concurrent eval on the same Metal stream from multiple
 # threads — two parallel inferences trip an AGX command-encoder assertion and
@@ -43,12 +105,15 @@ _model_ready: bool = False
 # to a single worker thread so concurrent requests serialize on one Metal
 # stream. max_workers=1 is the only serialization primitive needed — adding
 # a Lock on top would be redundant and would mislead anyone raising the
-# worker count without removing the lock.
-def _new_mlx_executor() -> concurrent.futures.ThreadPoolExecutor:
-    return concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="mlx")
+# worker count without removing the lock. The executor is priority-ordered
+# (see api/scheduler.py) so batch work never delays interactive requests.
+# INFERENCE_WORKERS defaults to 1, and _check_inference_workers refuses
+# anything else on Metal.
+def _new_mlx_executor() -> PriorityExecutor:
+    return PriorityExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="mlx")
 
 
-_mlx_executor: concurrent.futures.ThreadPoolExecutor = _new_mlx_executor()
+_mlx_executor: PriorityExecutor = _new_mlx_executor()
 
 
 def shutdown_executor() -> None:
@@ -63,9 +128,10 @@ def shutdown_executor() -> None:
     _mlx_executor = _new_mlx_executor()
 
 
-def get_model() -> KokoroTTS:
-    """Get the global model instance."""
-    global _model
+def get_model(variant: Optional[str] = None) -> "KokoroTTS":
+    """Get a loaded variant by name, or the default model (also for unknown variant names)."""
+    if variant is not None and variant in _variants:
+        return _variants[variant]
     if _model is None:
         raise RuntimeError("Model not initialized. Call initialize_model() first.")
     return _model
@@ -76,51 +142,464 @@ def is_model_ready() -> bool:
     return _model_ready
 
 
+def get_load_state() -> dict:
+    """Startup phase ("pending", "loading_model", "loading_voices",
+    "warming_up", "ready" or "failed"), progress fraction and error."""
+    phase = "ready" if _model_ready else _load_phase
+    return {"phase": phase, "progress": _LOAD_PROGRESS[phase], "error": _load_error}
+
+
+def _set_load_phase(phase: str) -> None:
+    global _load_phase
+    _load_phase = phase
+    logger.debug(f"Model load phase: {phase}")
+
+
 def initialize_model() -> float:
     """
     Initialize the TTS model.
 
+    Blocking; the server runs it in a background thread so /health answers
+    while it loads (see get_load_state). On failure the phase is "failed"
+    and the exception propagates.
+
     Returns:
         Initialization time in seconds.
     """
-    global _model, _model_ready
+    global _load_error
+
+    _load_error = None
+    try:
+        return _load_and_warm()
+    except Exception as e:
+        _load_error = str(e)
+        _set_load_phase("failed")
+        raise
 
-    start_time = time.perf_counter()
 
-    logger.info(f"Loading MLX model: {MODEL_ID}")
-    _model = KokoroTTS.from_pretrained(MODEL_ID)
+def _build_model(model_id: str) -> Tuple["KokoroTTS", "VoiceRegistry"]:
+    from kokoro_mlx import KokoroTTS
 
+    from .artifacts import load_model
+    from .voices import install_registry
+
+    logger.info(f"Loading MLX model: {model_id}")
+    model = load_model(model_id) if MODEL_ARTIFACTS else KokoroTTS.from_pretrained(model_id)
+    _set_load_phase("loading_voices")
+    return model, install_registry(model)
+
+
+def _warm(model: "KokoroTTS") -> None:
     # Single warmup call to prime pipelines and voice cache. Run it on the
     # same single-worker executor so the worker thread that owns the Metal
     # stream is the same one that serves requests.
-    logger.info("Warming up model...")
-
     def _warmup():
-        result = _model.generate(WARMUP_TEXT, voice=DEFAULT_VOICE, speed=DEFAULT_SPEED)
+        result = model.generate(WARMUP_TEXT, voice=DEFAULT_VOICE, speed=DEFAULT_SPEED)
         if hasattr(result, '__iter__') and not hasattr(result, 'audio'):
             for _ in result:
                 pass
 
-    _mlx_executor.submit(_warmup).result()
+    _mlx_executor.submit(_warmup, priority=Priority.BATCH, cost=None).result()
+
+
+def _model_hash(model: "KokoroTTS") -> Optional[str]:
+    from .artifacts import artifact_key
+    try:
+        return artifact_key(model._model_path)[:16]
+    except (AttributeError, TypeError, OSError):
+        return None
+
+
+def _check_inference_workers() -> None:
+    """Refuse concurrent inference on the GPU (see _mlx_executor)."""
+    if INFERENCE_WORKERS <= 1:
+        return
+    import mlx.core as mx
+
+    if mx.default_device() != mx.cpu:
+        raise RuntimeError(
+            f"TTS_INFERENCE_WORKERS={INFERENCE_WORKERS} needs MLX on the CPU; "
+            f"concurrent inference on {mx.default_device()} aborts the process. Set it to 1."
+        )
+
+
+def _load_and_warm() -> float:
+    global _model, _model_ready, _voice_registry, _model_info
+
+    start_time = time.perf_counter()
+
+    _check_inference_workers()
+    _set_load_phase("loading_model")
+    model, registry = _build_model(MODEL_ID)
+    _voice_registry, _model = registry, model
+
+    _set_load_phase("warming_up")
+    logger.info("Warming up model...")
+    _warm(model)
 
     init_time = time.perf_counter() - start_time
+    _model_info = {"id": MODEL_ID, "hash": _model_hash(model), "loaded_at": time.time()}
     _model_ready = True
+    _set_load_phase("ready")
 
     logger.info(f"Model initialized in {init_time:.2f}s")
     return init_time
 
 
+def get_model_info() -> dict:
+    """Active model id and hash, loaded variants, and the state of the last reload."""
+    variants = {name: dict(info) for name, info in _variant_info.items()}
+    return {**_model_info, "variants": variants, "reload": dict(_reload_state)}
+
+
+def has_variant(name: Optional[str]) -> bool:
+    """Whether a model variant of this name is loaded."""
+    return name in _variants
+
+
+def model_key(variant: Optional[str] = None) -> str:
+    """Identity of the model that serves variant (hash, or id if unhashable), for cache keys."""
+    info = _variant_info[variant] if variant in _variants else _model_info
+    return info["hash"] or info["id"]
+
+
+def _build_variant(model_id: str, precision: str) -> "KokoroTTS":
+    from kokoro_mlx import KokoroTTS
+
+    from .artifacts import load_model, set_precision
+
+    model = load_model(model_id) if MODEL_ARTIFACTS else KokoroTTS.from_pretrained(model_id)
+    set_precision(model, precision)
+    if _voice_registry is not None:
+        model._voices = _voice_registry  # One copy of the voice tensors for all variants
+    return model
+
+
+def load_variants() -> None:
+    """
+    Load and warm MODEL_VARIANTS next to the ready default model (blocking).
+
+    Each variant is built on the MLX worker as batch work, so requests keep
+    being served between (not during) variant loads. Requests for a variant
+    use the default model until it is loaded, and for good if it fails to
+    load.
+    """
+    for name, (model_id, precision) in MODEL_VARIANTS.items():
+        start_time = time.perf_counter()
+        try:
+            model = _mlx_executor.submit(
+                _build_variant, model_id, precision, priority=Priority.BATCH, cost=None,
+            ).result()
+            _warm(model)
+        except Exception as e:
+            logger.error(f"Model variant {name} ({model_id}@{precision}) failed to load: {e}")
+            continue
+        model_hash = _model_hash(model)
+        _variant_info[name] = {
+            "id": model_id,
+            "precision": precision,
+            "hash": f"{model_hash}-{precision}" if model_hash else None,
+            "loaded_at": time.time(),
+        }
+        _variants[name] = model
+        logger.info(f"Model variant {name} ({model_id}@{precision}) "
+                    f"ready in {time.perf_counter() - start_time:.2f}s")
+
+
+def _begin_reload(model_id: Optional[str]) -> str:
+    model_id = model_id or _model_info.get("id") or MODEL_ID
+    with _reload_lock:
+        if _reload_state["state"] in _RELOAD_ACTIVE:
+            raise RuntimeError("A model reload is already in progress")
+        _reload_state.clear()
+        _reload_state.update(state="loading", model_id=model_id, started_at=time.time(),
+                             duration_s=None, drain_s=None, error=None, previous_released=None)
+    return model_id
+
+
+def start_reload(model_id: Optional[str] = None, drain_timeout: Optional[float] = None) -> concurrent.futures.Future:
+    """
+    Start reload_model on a background thread.
+
+    Returns:
+        Future resolving to the final reload state.
+
+    Raises:
+        RuntimeError: If a reload is already in progress.
+    """
+    model_id = _begin_reload(model_id)
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    future.set_running_or_notify_cancel()  # A reload cannot be cancelled once started
+
+    def _run() -> None:
+        try:
+            future.set_result(_reload(model_id, drain_timeout))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=_run, name="model-reload", daemon=True).start()
+    return future
+
+
+def reload_model(model_id: Optional[str] = None, drain_timeout: Optional[float] = None) -> dict:
+    """
+    Replace the active model without downtime (blocking).
+
+    The new model is loaded and warmed while the old one keeps serving.
+    Requests started after the switch use the new model. Work already
+    queued or running keeps the old one, which is freed once the last of it
+    finishes (or drain_timeout, default RELOAD_DRAIN_TIMEOUT_S, passes).
+    Loading runs on the MLX worker, so it queues behind interactive work.
+
+    Returns:
+        The final reload state (see get_model_info).
+
+    Raises:
+        RuntimeError: If a reload is already in progress.
+    """
+    return _reload(_begin_reload(model_id), drain_timeout)
+
+
+def _reload(model_id: str, drain_timeout: Optional[float]) -> dict:
+    global _model, _model_ready, _voice_registry, _model_info
+
+    if drain_timeout is None:
+        drain_timeout = RELOAD_DRAIN_TIMEOUT_S
+    start_time = time.perf_counter()
+    try:
+        # On the MLX worker, like all other MLX work: loading evaluates arrays
+        model, registry = _mlx_executor.submit(_build_model, model_id, priority=Priority.BATCH, cost=None).result()
+        _reload_state["state"] = "warming_up"
+        _warm(model)
+    except Exception as e:
+        logger.error(f"Model reload failed, keeping the current model: {e}")
+        _reload_state.update(state="failed", error=str(e), duration_s=round(time.perf_counter() - start_time, 3))
+        return dict(_reload_state)
+
+    previous, previous_registry = _model, _voice_registry
+    # Switch: the registry first, so a request that picks up the new model
+    # never validates its voice against the old registry's index
+    _voice_registry, _model = registry, model
+    for variant in _variants.values():
+        variant._voices = registry
+    _model_info = {"id": model_id, "hash": _model_hash(model), "loaded_at": time.time()}
+    _model_ready = True
+    _set_load_phase("ready")
+    del model, registry
+    switched_at = time.perf_counter()
+    logger.info(f"Switched to model {model_id} after {switched_at - start_time:.2f}s; draining the previous one")
+
+    _reload_state["state"] = "draining"
+    key = id(previous)
+    with _in_flight_changed:
+        released = _in_flight_changed.wait_for(lambda: _in_flight[key] == 0, timeout=drain_timeout)
+    del previous
+    if previous_registry is not None and previous_registry is not _voice_registry:
+        previous_registry.close()
+    if released:
+        gc.collect()
+        _mlx_executor.submit(_clear_mlx_cache, priority=Priority.BATCH, cost=None).result()
+
+    _reload_state.update(
+        state="completed",
+        duration_s=round(time.perf_counter() - start_time, 3),
+        drain_s=round(time.perf_counter() - switched_at, 3),
+        previous_released=released,
+    )
+    logger.info(f"Model reload completed in {_reload_state['duration_s']:.2f}s "
+                f"(previous model {'released' if released else 'still in use'})")
+    return dict(_reload_state)
+
+
+def _clear_mlx_cache() -> None:
+    import mlx.core as mx
+    mx.clear_cache()
+
+
 def get_voices() -> list[str]:
     """Get list of available voices."""
     if _model is None:
         return []
+    if _voice_registry is not None:
+        return _voice_registry.list_voices()
     return _model.list_voices()
 
 
+def get_voice_details() -> list[dict]:
+    """Per-voice metadata (id, name, language, gender) for available voices."""
+    if _voice_registry is not None:
+        return _voice_registry.details()
+    from .voices import voice_info
+    return [voice_info(voice) for voice in get_voices()]
+
+
+def get_voice_residency() -> Optional[dict]:
+    """Voice loading policy and per-voice residency, if the registry is installed."""
+    if _voice_registry is None:
+        return None
+    return _voice_registry.residency()
+
+
+def resolve_voice(voice: str) -> Optional[str]:
+    """
+    Canonical voice id for a voice or blend spec, or None if unavailable.
+
+    O(1) against the registry; blends need the registry and resolve to
+    their normalized spec (see api/voices.py).
+    """
+    if _voice_registry is not None:
+        return _voice_registry.resolve(voice)
+    return voice if voice in get_model().list_voices() else None
+
+
+def _resolve_request(
+    text: str, voice: str, speed: float, variant: Optional[str] = None,
+) -> Tuple["KokoroTTS", str, float]:
+    """Pick the model variant, clamp speed, normalize blend specs and fall back to the default voice for unknown voice IDs."""
+    model = get_model(variant)
+
+    speed = max(MIN_SPEED, min(MAX_SPEED, speed))
+
+    resolved = resolve_voice(voice)
+    if resolved is None:
+        logger.warning(f"Voice '{voice}' not found, using default '{DEFAULT_VOICE}'")
+        resolved = DEFAULT_VOICE
+    voice = resolved
+
+    if _voice_registry is not None:
+        _voice_registry.prefetch(voice)
+
+    return model, voice, speed
+
+
+def parallel_segments(text: str, workers: Optional[int] = None) -> list[str]:
+    """
+    Split text into independently synthesizable segments for parallel workers.
+
+    Short texts, and any text when only one worker is available, stay a
+    single segment. Otherwise the first sentence is its own segment (so the
+    first audio arrives quickly) and the rest are packed into segments of
+    about PARALLEL_SEGMENT_CHARS, always splitting at sentence boundaries.
+    """
+    if workers is None:
+        workers = INFERENCE_WORKERS
+    if workers <= 1 or len(text) < PARALLEL_MIN_CHARS:
+        return [text]
+
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        return [text]
+
+    segments = [sentences[0]]
+    current = ""
+    for sentence in sentences[1:]:
+        if current and len(current) + len(sentence) + 1 > PARALLEL_SEGMENT_CHARS:
+            segments.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        segments.append(current)
+    return segments
+
+
+def submit_audio(
+    text: str,
+    voice: str = DEFAULT_VOICE,
+    speed: float = DEFAULT_SPEED,
+    priority: Priority = Priority.INTERACTIVE,
+    variant: Optional[str] = None,
+    deadline: Optional[float] = None,
+    stop: Optional[threading.Event] = None,
+) -> concurrent.futures.Future:
+    """
+    Queue an all-at-once generation on the MLX worker.
+
+    Setting stop ends the generation after the current phoneme batch (the
+    result is then partial), e.g. once nobody waits for it any more.
+
+    Returns:
+        Future resolving to the float32 audio array, or failing with
+        DeadlineExceeded once deadline (time.monotonic()) has passed.
+    """
+    model, voice, speed = _resolve_request(text, voice, speed, variant)
+
+    # Serialize all MLX eval through the single worker thread to avoid
+    # concurrent Metal command-encoder use across threads.
+    def _run() -> np.ndarray:
+        collected: list[np.ndarray] = []
+        for result in model.generate_stream(text, voice=voice, speed=speed):
+            collected.append(np.asarray(result, dtype=np.float32))
+            if stop is not None and stop.is_set():
+                break
+            if deadline_passed(deadline):
+                raise DeadlineExceeded("Deadline passed during generation")
+        if collected:
+            return np.concatenate(collected)
+        return np.array([], dtype=np.float32)
+
+    return _submit_for(model, _run, priority, deadline, cost=len(text))
+
+
+def _submit_for(
+    model: "KokoroTTS", fn, priority: Priority, deadline: Optional[float], cost: float,
+) -> concurrent.futures.Future:
+    """
+    Queue work using model on the MLX worker, counted in flight until it
+    finishes or is dropped. cost is the text length, so the wait estimate
+    weighs queued work by size.
+    """
+    key = id(model)
+
+    def _release(_future=None) -> None:
+        with _in_flight_changed:
+            _in_flight[key] -= 1
+            if _in_flight[key] <= 0:
+                del _in_flight[key]
+                _in_flight_changed.notify_all()
+
+    with _in_flight_changed:
+        _in_flight[key] += 1
+    try:
+        future = _mlx_executor.submit(fn, priority=priority, deadline=deadline, cost=cost)
+    except BaseException:
+        _release()
+        raise
+    future.add_done_callback(_release)
+    return future
+
+
+def submit_to_worker(fn, /, *args, priority: Priority = Priority.BATCH, **kwargs) -> concurrent.futures.Future:
+    """Queue an arbitrary call (warmup, maintenance) on the MLX worker, kept out of the wait estimate."""
+    return _mlx_executor.submit(fn, *args, priority=priority, cost=None, **kwargs)
+
+
+def estimated_wait(priority: Priority = Priority.INTERACTIVE) -> float:
+    """Seconds new work at priority would currently queue on the MLX worker."""
+    return _mlx_executor.estimated_wait(priority)
+
+
+def get_queue_state() -> dict:
+    """MLX worker queue depth, running work, service time per character, deadline-expired work and predicted waits."""
+    executor = _mlx_executor
+    service_time = executor.service_time
+    return {
+        "depth": executor.queue_depth,
+        "running": executor.running,
+        "service_ms_per_char": round(service_time * 1000, 3) if service_time is not None else None,
+        "expired": executor.expired,
+        "estimated_wait_ms": {
+            priority.name.lower(): round(executor.estimated_wait(priority) * 1000, 1) for priority in Priority
+        },
+    }
+
+
 def generate_audio(
     text: str,
     voice: str = DEFAULT_VOICE,
     speed: float = DEFAULT_SPEED,
+    priority: Priority = Priority.INTERACTIVE,
+    variant: Optional[str] = None,
+    deadline: Optional[float] = None,
 ) -> Tuple[np.ndarray, int, float]:
     """
     Generate audio from text (blocking, all-at-once).
@@ -129,35 +608,32 @@ def generate_audio(
         text: Text to synthesize.
         voice: Voice ID to use.
         speed: Speed multiplier (0.5-2.0).
+        priority: Scheduling class on the MLX worker.
+        variant: Model variant name (default model if None or unknown).
+        deadline: time.monotonic() after which the work is abandoned.
 
     Returns:
         Tuple of (audio_array, sample_rate, generation_time).
-    """
-    model = get_model()
-
-    speed = max(MIN_SPEED, min(MAX_SPEED, speed))
-
-    available_voices = model.list_voices()
-    if voice not in available_voices:
-        logger.warning(f"Voice '{voice}' not found, using default '{DEFAULT_VOICE}'")
-        voice = DEFAULT_VOICE
 
+    Raises:
+        DeadlineExceeded: If the deadline passed first.
+    """
     start_time = time.perf_counter()
 
-    # Serialize all MLX eval through the single worker thread to avoid
-    # concurrent Metal command-encoder use across threads.
-    def _run() -> list[np.ndarray]:
-        collected: list[np.ndarray] = []
-        for result in model.generate_stream(text, voice=voice, speed=speed):
-            collected.append(np.asarray(result, dtype=np.float32))
-        return collected
-
-    segments = _mlx_executor.submit(_run).result()
-
-    if segments:
-        audio = np.concatenate(segments)
-    else:
-        audio = np.array([], dtype=np.float32)
+    # One future per segment; workers pick them up in submission order
+    stop = threading.Event()
+    futures = [
+        submit_audio(
+            segment, voice=voice, speed=speed, priority=priority, variant=variant, deadline=deadline, stop=stop,
+        )
+        for segment in parallel_segments(text)
+    ]
+    try:
+        audio = np.concatenate([f.result() for f in futures])
+    finally:
+        stop.set()  # Segments still running after a failure
+        for future in futures:
+            future.cancel()  # Segments still queued after a failure
 
     generation_time = time.perf_counter() - start_time
     audio_duration = len(audio) / SAMPLE_RATE
@@ -175,6 +651,10 @@ async def generate_audio_stream(
     text: str,
     voice: str = DEFAULT_VOICE,
     speed: float = DEFAULT_SPEED,
+    priority: Priority = Priority.INTERACTIVE,
+    variant: Optional[str] = None,
+    short_first_segment: bool = False,
+    deadline: Optional[float] = None,
 ) -> AsyncGenerator[Tuple[np.ndarray, int], None]:
     """
     Stream audio segments as they're generated.
@@ -184,53 +664,129 @@ async def generate_audio_stream(
     segment generates far faster than real-time, so the client receives audio
     to play while subsequent segments are still being generated.
 
+    Long texts with parallel workers available are synthesized segment-wise
+    instead (see _parallel_stream). With short_first_segment the first
+    sentence is rendered on its own before the rest is streamed batch by
+    batch: kokoro packs sentences into phoneme batches of up to 510 tokens,
+    and the first audio would otherwise wait for the whole first batch.
+
+    Generation stops when the consumer closes the stream (the client went
+    away) or deadline passes (raising DeadlineExceeded).
+
     Yields:
         Tuple of (audio_segment, sample_rate) for each generated segment.
     """
-    model = get_model()
-
-    speed = max(MIN_SPEED, min(MAX_SPEED, speed))
-
-    available_voices = model.list_voices()
-    if voice not in available_voices:
-        logger.warning(f"Voice '{voice}' not found, using default '{DEFAULT_VOICE}'")
-        voice = DEFAULT_VOICE
+    segments = parallel_segments(text)
+    if len(segments) > 1:
+        async for item in _parallel_stream(segments, voice, speed, priority, variant, deadline):
+            yield item
+        return
+    parts = [text]
+    if short_first_segment:
+        sentences = split_sentences(text)
+        if len(sentences) > 1:
+            parts = [sentences[0], " ".join(sentences[1:])]
+
+    model, voice, speed = _resolve_request(text, voice, speed, variant)
 
     # generate_stream is sync (MLX is not thread-safe for concurrent inference),
     # so we run it on a dedicated single-worker executor so concurrent requests
     # serialize on the same Metal stream.
-    loop = asyncio.get_running_loop()
-
     # Use a queue to bridge sync generator → async generator
     q: queue.Queue = queue.Queue()
     sentinel = object()
+    stop = threading.Event()
 
     def _run_generation():
         try:
-            for result in model.generate_stream(text, voice=voice, speed=speed):
-                q.put((np.asarray(result, dtype=np.float32), SAMPLE_RATE))
+            # One work item for all parts, so nothing queues between them
+            for part in parts:
+                for result in model.generate_stream(part, voice=voice, speed=speed):
+                    q.put((np.asarray(result, dtype=np.float32), SAMPLE_RATE))
+                    if stop.is_set():
+                        return
+                    if deadline_passed(deadline):
+                        raise DeadlineExceeded("Deadline passed during generation")
         except Exception as e:
             q.put(e)
+            if isinstance(e, DeadlineExceeded):
+                raise  # Counted by the executor as expired work
         finally:
             q.put(sentinel)
 
     # Start generation on the dedicated MLX worker
-    future = loop.run_in_executor(_mlx_executor, _run_generation)
-
-    # Yield segments as they arrive from the queue
-    while True:
-        # Poll the queue, yielding control to the event loop between checks
-        try:
-            item = q.get(timeout=0.01)
-        except queue.Empty:
-            await asyncio.sleep(0.01)
-            continue
-
-        if item is sentinel:
-            break
-        if isinstance(item, Exception):
-            raise item
-        yield item
+    work = _submit_for(model, _run_generation, priority, deadline, cost=len(text))
+    future = asyncio.wrap_future(work)
+
+    try:
+        # Yield segments as they arrive from the queue
+        while True:
+            # Poll the queue, yielding control to the event loop between checks
+            try:
+                item = q.get(timeout=0.01)
+            except queue.Empty:
+                if work.done() and q.empty():
+                    await future  # Dropped before it started: raises DeadlineExceeded
+                await asyncio.sleep(0.01)
+                continue
+
+            if item is sentinel:
+                break
+            if isinstance(item, Exception):
+                with contextlib.suppress(Exception):
+                    await future  # The worker may re-raise the same error
+                raise item
+            yield item
+
+        # Ensure the executor thread has completed
+        await future
+    finally:
+        # Consumer gone early: skip the work if still queued, else stop it
+        # after the current phoneme batch
+        stop.set()
+        work.cancel()
+
+
+async def _parallel_stream(
+    segments: list[str],
+    voice: str,
+    speed: float,
+    priority: Priority,
+    variant: Optional[str] = None,
+    deadline: Optional[float] = None,
+) -> AsyncGenerator[Tuple[np.ndarray, int], None]:
+    """
+    Synthesize segments across workers and yield them in order.
 
-    # Ensure the executor thread has completed
-    await future
+    Keeps up to two segments per worker in flight; each segment is yielded as
+    soon as it and everything before it has finished, so the output is the
+    contiguous in-order prefix of the document.
+    """
+    window = 2 * INFERENCE_WORKERS
+    remaining = iter(segments)
+    pending: list[asyncio.Future] = []
+    stop = threading.Event()
+
+    def _fill() -> None:
+        while len(pending) < window:
+            segment = next(remaining, None)
+            if segment is None:
+                return
+            pending.append(asyncio.wrap_future(
+                submit_audio(
+                    segment, voice=voice, speed=speed, priority=priority, variant=variant, deadline=deadline,
+                    stop=stop,
+                )
+            ))
+
+    try:
+        _fill()
+        while pending:
+            audio = await pending.pop(0)
+            _fill()
+            yield audio, SAMPLE_RATE
+    finally:
+        # Consumer gone early: skip queued segments, stop running ones
+        stop.set()
+        for future in pending:
+            future.cancel()
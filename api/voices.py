@@ -0,0 +1,415 @@
+"""
+Kokoro TTS API v2 - Voice Registry
+
+All voice packs loaded once at startup instead of lazily per voice by
+kokoro-mlx, so the first request for a voice no longer pays a safetensors
+read. Low-memory hosts can switch to TTS_VOICE_LOADING=lazy instead: voices
+load on first use into a byte-budgeted LRU, hot voices can be pinned, and
+a request naming a cold voice starts reading it in the background while it
+queues for the MLX worker.
+
+The packs are stacked into one contiguous float32 array, (voices, 510, 1,
+256), saved as a .npy file in VOICE_CACHE_DIR and memory-mapped on later
+starts; the pack is rebuilt whenever the voice files change. Eager loading
+only pages the mapped pack in at startup and converts a voice to an MLX
+array on its first use, so the pack's pages stay shared between worker
+processes (see api/prefork.py) instead of being copied into each. Voice ids are
+validated against a dict index (O(1)) rather than a directory glob and list
+scan per request.
+
+Blended voices are named by a spec such as "af_heart(0.7)+bm_fable(0.3)"
+(weights are relative; a bare id weighs 1). The weighted style tensor is
+computed on first use and kept in an LRU keyed by the normalized spec, so
+later requests for the same blend cost what a built-in voice does.
+
+The registry is a kokoro-mlx VoiceManager subclass installed in place of
+the model's own, so generate/generate_stream pick voices up from it with
+no other changes.
+"""
+
+import concurrent.futures
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import mlx.core as mx
+import numpy as np
+from kokoro_mlx import VoiceManager
+from kokoro_mlx.phonemize import VOICE_PREFIX_LANGUAGES
+
+from .config import (
+    VOICE_BLEND_CACHE_SIZE,
+    VOICE_CACHE_BUDGET_MB,
+    VOICE_CACHE_DIR,
+    VOICE_LOADING,
+    VOICE_PINNED,
+)
+
+logger = logging.getLogger(__name__)
+
+_GENDERS = {"f": "female", "m": "male"}
+_PAGE_VALUES = 4096 // 4  # float32 values per (typical) memory page
+_BLEND_COMPONENT = re.compile(r"^\s*([A-Za-z0-9_]+)\s*(?:\(\s*([0-9]*\.?[0-9]+)\s*\))?\s*$")
+
+
+def is_blend(voice: str) -> bool:
+    return "+" in voice or "(" in voice
+
+
+def parse_blend(spec: str) -> list[tuple[str, float]]:
+    """
+    Parse a blend spec into (voice_id, weight) pairs, weights summing to 1.
+
+    Components are ordered by weight (heaviest first, so the dominant voice
+    also picks the phonemizer language) and duplicates are merged, so every
+    way of writing the same blend parses identically.
+
+    Raises:
+        ValueError: If the spec is malformed or all weights are zero.
+    """
+    weights: dict[str, float] = {}
+    for part in spec.split("+"):
+        match = _BLEND_COMPONENT.match(part)
+        if match is None:
+            raise ValueError(f"Invalid voice blend component: {part.strip()!r}")
+        voice_id, weight = match.group(1), float(match.group(2) or 1.0)
+        weights[voice_id] = weights.get(voice_id, 0.0) + weight
+
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Voice blend weights must not all be zero")
+    components = [(v, w / total) for v, w in weights.items() if w > 0]
+    return sorted(components, key=lambda c: (-c[1], c[0]))
+
+
+def blend_key(components: list[tuple[str, float]]) -> str:
+    """Canonical spec for parsed components, e.g. "af_heart(0.7)+bm_fable(0.3)"."""
+    return "+".join(f"{voice_id}({weight:.4g})" for voice_id, weight in components)
+
+
+def voice_info(voice_id: str) -> dict[str, Any]:
+    """Metadata derived from a Kokoro voice id (e.g. "bf_emma")."""
+    prefix, _, name = voice_id.partition("_")
+    return {
+        "id": voice_id,
+        "name": name or voice_id,
+        "language": VOICE_PREFIX_LANGUAGES.get(prefix[:2].lower()),
+        "gender": _GENDERS.get(prefix[1:2].lower()),
+    }
+
+
+class VoiceRegistry(VoiceManager):
+    """
+    VoiceManager backed by one memory-mapped voice pack.
+
+    With the "eager" policy load_all pages in the whole memory-mapped pack
+    (every voice, if the pack could not be mapped), and voices become MLX
+    arrays on first use; only that per-voice copy is private. With
+    "lazy", load_all only loads pinned voices; the rest are loaded on first
+    use into an LRU bounded by budget_mb (pinned voices are never evicted),
+    and prefetch() lets a request start reading a cold voice in the
+    background while it waits for the MLX worker. Staged (prefetched but not
+    yet used) voices and cached blends count against the budget too. Staged
+    voices are dropped first, since their request may never get to load
+    them, then blends (cheap to mix again), then resident voices; each
+    oldest first.
+    """
+
+    def __init__(
+        self,
+        model_path: str | Path,
+        cache_dir: str = VOICE_CACHE_DIR,
+        blend_cache_size: int = VOICE_BLEND_CACHE_SIZE,
+        policy: str = VOICE_LOADING,
+        budget_mb: float = VOICE_CACHE_BUDGET_MB,
+        pinned: Sequence[str] = VOICE_PINNED,
+    ):
+        super().__init__(model_path)
+        self._cache_dir = cache_dir
+        self._cache: OrderedDict[str, mx.array] = OrderedDict()
+        self._lock = threading.Lock()
+        self._blends: OrderedDict[str, mx.array] = OrderedDict()
+        self._blend_cache_size = blend_cache_size
+        self._files = sorted(self._voices_dir.glob("*.safetensors"))
+        self._names = [p.stem for p in self._files]
+        self._index = {name: i for i, name in enumerate(self._names)}
+        self._pack: Optional[np.ndarray] = None
+        self.policy = policy
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.pinned = frozenset(v for v in pinned if v in self._index)
+        self._staged: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._prefetching: dict[str, concurrent.futures.Future] = {}
+        self._prefetcher: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._stats = {name: {"load_ms": None, "loads": 0, "hits": 0} for name in self._names}
+        self.load_time_ms = 0.0
+
+    def __contains__(self, voice_id: object) -> bool:
+        return voice_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def lazy(self) -> bool:
+        return self.policy == "lazy"
+
+    def list_voices(self) -> list[str]:
+        return list(self._names)
+
+    def resolve(self, voice: str) -> Optional[str]:
+        """Canonical id for a voice or blend spec, or None if it is not available."""
+        if voice in self._index:
+            return voice
+        if not is_blend(voice):
+            return None
+        try:
+            components = parse_blend(voice)
+        except ValueError:
+            return None
+        if not all(voice_id in self._index for voice_id, _ in components):
+            return None
+        if len(components) == 1:
+            return components[0][0]
+        return blend_key(components)
+
+    def details(self) -> list[dict[str, Any]]:
+        return [voice_info(name) for name in self._names]
+
+    def is_resident(self, voice_id: str) -> bool:
+        return voice_id in self._cache
+
+    def residency(self) -> dict[str, Any]:
+        """Loading policy, memory use and per-voice load statistics."""
+        with self._lock:
+            resident = dict(self._cache)
+            voices = [
+                {
+                    "id": name,
+                    "resident": name in resident,
+                    "pinned": name in self.pinned,
+                    "bytes": resident[name].nbytes if name in resident else 0,
+                    **self._stats[name],
+                }
+                for name in self._names
+            ]
+        return {
+            "policy": self.policy,
+            "budget_bytes": self.budget_bytes if self.lazy else None,
+            "resident_bytes": sum(v.nbytes for v in resident.values()),
+            "resident_count": len(resident),
+            "staged_bytes": sum(v.nbytes for v in self._staged.values()),
+            "blends_cached": len(self._blends),
+            "blend_bytes": sum(v.nbytes for v in self._blends.values()),
+            "voices": voices,
+        }
+
+    def _pack_path(self) -> str:
+        fingerprint = hashlib.sha256()
+        for path in self._files:
+            stat = path.stat()
+            fingerprint.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        return os.path.join(self._cache_dir, f"voices-{fingerprint.hexdigest()[:16]}.npy")
+
+    def _read_voices(self) -> np.ndarray:
+        arrays = [
+            np.array(mx.load(str(path), format="safetensors")["voice"].astype(mx.float32))
+            for path in self._files
+        ]
+        return np.stack(arrays)
+
+    def _load_pack(self) -> np.ndarray:
+        path = self._pack_path()
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            pass  # Not built yet (or unreadable): rebuild below
+
+        pack = self._read_voices()
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            temp_path = f"{path}.{uuid.uuid4().hex}.tmp.npy"
+            np.save(temp_path, pack)
+            os.replace(temp_path, path)
+            return np.load(path, mmap_mode="r")
+        except OSError as e:
+            logger.warning(f"Voice pack not cached ({e}); keeping voices in memory")
+            return pack
+
+    def load_all(self) -> float:
+        """
+        Map the voice pack and load the voices the policy keeps resident
+        (all of them when eager, the pinned ones when lazy).
+
+        Returns:
+            Load time in milliseconds.
+        """
+        start_time = time.perf_counter()
+        if self._files:
+            try:
+                self._pack = self._load_pack()
+            except ValueError as e:
+                # Voice files with differing shapes cannot be stacked
+                logger.warning(f"Voice pack unavailable ({e}); loading voices individually")
+
+        if self.lazy:
+            names = sorted(self.pinned)
+        elif isinstance(self._pack, np.memmap):
+            # Touch one value per page: every voice is in memory, in pages
+            # shared with other processes mapping the same file
+            flat = self._pack.reshape(-1)
+            float(flat[::_PAGE_VALUES].sum())
+            names = []
+        else:
+            names = self._names
+        for name in names:
+            self.load_voice(name)
+
+        self.load_time_ms = (time.perf_counter() - start_time) * 1000
+        loaded = len(self._names) if self._pack is not None and not self.lazy else len(names)
+        logger.info(f"Loaded {loaded}/{len(self._names)} voices ({self.policy}) in {self.load_time_ms:.0f}ms")
+        return self.load_time_ms
+
+    def close(self) -> None:
+        """
+        Release the prefetch thread, staged voices and the pack mapping once
+        the registry has been replaced (see api/tts.py reload). Voices already
+        resident stay usable; any other voice is read from its file.
+        """
+        with self._lock:
+            prefetcher, self._prefetcher = self._prefetcher, None
+            for future in self._prefetching.values():
+                future.cancel()
+            self._prefetching.clear()
+            self._staged.clear()
+            self._pack = None
+        if prefetcher is not None:
+            prefetcher.shutdown(wait=False)
+
+    def prefetch(self, voice: str) -> None:
+        """Start reading a cold voice (or a blend's cold components) in the background."""
+        if not self.lazy or self._pack is None:
+            return
+        names = [v for v, _ in parse_blend(voice)] if is_blend(voice) else [voice]
+        with self._lock:
+            for name in names:
+                if name in self._cache or name in self._staged or name in self._prefetching:
+                    continue
+                if name not in self._index:
+                    continue
+                if self._prefetcher is None:
+                    self._prefetcher = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="voice-prefetch",
+                    )
+                self._prefetching[name] = self._prefetcher.submit(self._stage, name)
+
+    def _stage(self, name: str) -> None:
+        # Plain numpy only: page the voice in from the pack, off the MLX worker
+        pack = self._pack
+        if pack is None:
+            return  # Closed
+        data = np.array(pack[self._index[name]])
+        with self._lock:
+            if self._pack is None:
+                return
+            self._staged[name] = data
+            self._prefetching.pop(name, None)
+            self._evict(keep=name, staged_only=True)
+
+    def _evict(self, keep: str, staged_only: bool = False) -> None:
+        total = sum(v.nbytes for cache in (self._cache, self._staged, self._blends) for v in cache.values())
+        for name in list(self._staged):
+            if total <= self.budget_bytes:
+                return
+            if name == keep:
+                continue
+            total -= self._staged.pop(name).nbytes
+            logger.debug(f"Dropped staged voice {name}")
+        if staged_only:
+            return  # Speculative reads never displace resident voices
+        for spec in list(self._blends):
+            if total <= self.budget_bytes:
+                return
+            if spec == keep:
+                continue
+            total -= self._blends.pop(spec).nbytes
+            logger.debug(f"Evicted blend {spec}")
+        for name in list(self._cache):
+            if total <= self.budget_bytes:
+                break
+            if name == keep or name in self.pinned:
+                continue
+            total -= self._cache.pop(name).nbytes
+            logger.debug(f"Evicted voice {name}")
+
+    def _load_blend(self, spec: str) -> mx.array:
+        with self._lock:
+            blended = self._blends.get(spec)
+            if blended is not None:
+                self._blends.move_to_end(spec)
+                return blended
+
+        start_time = time.perf_counter()
+        components = parse_blend(spec)
+        blended = sum(weight * self.load_voice(voice_id) for voice_id, weight in components)
+        mx.eval(blended)
+        logger.info(f"Blended voice {spec} in {(time.perf_counter() - start_time) * 1000:.1f}ms")
+
+        with self._lock:
+            self._blends[spec] = blended
+            while len(self._blends) > self._blend_cache_size:
+                self._blends.popitem(last=False)
+            if self.lazy:
+                self._evict(keep=spec)
+        return blended
+
+    def load_voice(self, name: str) -> mx.array:
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is not None:
+                self._cache.move_to_end(name)
+                self._stats[name]["hits"] += 1
+                return cached
+            pending = self._prefetching.get(name)
+        if is_blend(name):
+            return self._load_blend(name)
+
+        start_time = time.perf_counter()
+        if pending is not None:
+            # Read already under way; wait for it rather than start another
+            # (it may also have been cancelled by close)
+            concurrent.futures.wait([pending])
+
+        index = self._index.get(name)
+        with self._lock:
+            data = self._staged.pop(name, None)
+        if data is None and index is not None and self._pack is not None:
+            data = self._pack[index]
+        if data is None:
+            voice = super().load_voice(name)
+        else:
+            voice = mx.array(np.asarray(data))
+
+        with self._lock:
+            self._cache[name] = voice
+            if name in self._stats:
+                stats = self._stats[name]
+                stats["load_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+                stats["loads"] += 1
+            if self.lazy:
+                self._evict(keep=name)
+        return voice
+
+
+def install_registry(model: Any, cache_dir: str = VOICE_CACHE_DIR) -> VoiceRegistry:
+    """Replace a KokoroTTS model's VoiceManager with a preloaded VoiceRegistry."""
+    registry = VoiceRegistry(model._model_path, cache_dir=cache_dir)
+    registry.load_all()
+    model._voices = registry
+    return registry
@@ -0,0 +1,164 @@
+"""
+Kokoro TTS API v2 - Warmup Plan
+
+The single WARMUP_TEXT call in initialize_model only primes the shapes of a
+short sentence in the default voice, so the first long request after a
+deploy still pays for compiling and allocating larger sequence lengths.
+
+After the server reports ready, a background plan renders every voice in
+WARMUP_VOICES at every length in WARMUP_BUCKETS, WARMUP_REPEATS times each.
+Calls run at Priority.BATCH, one at a time, so live requests are never
+queued behind the plan. Each call is timed on the MLX worker itself (queue
+wait excluded), and the report on /status gives first-call and
+steady-state latency per bucket, showing which shapes were cold.
+
+Once enough traffic has been recorded (see api/traffic.py), the lengths
+are taken from the observed input length distribution instead.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from .config import DEFAULT_SPEED, WARMUP_BUCKETS, WARMUP_REPEATS, WARMUP_VOICES
+from .scheduler import Priority
+from .traffic import length_histogram
+from .tts import get_model, resolve_voice, submit_to_worker
+
+logger = logging.getLogger(__name__)
+
+_CORPUS = (
+    "The quick brown fox jumps over the lazy dog, and then it runs back across "
+    "the field toward the old stone bridge. Nobody in the village could remember "
+    "when the bridge was built, but everyone agreed it had outlasted three mills, "
+    "two churches and a great many promises. On summer evenings the children "
+    "would gather there to count the boats drifting downstream, while their "
+    "parents argued about the weather, the harvest and the price of bread. "
+    "It was, by any measure, an ordinary place; and that, perhaps, was exactly "
+    "why so many people who left it spent the rest of their lives trying to "
+    "describe it to strangers who had never been there at all. "
+)
+
+
+def warmup_text(chars: int) -> str:
+    """Natural-sounding text of about chars characters, cut at a word boundary."""
+    corpus = _CORPUS * (chars // len(_CORPUS) + 1)
+    text = corpus[:chars + 1].rsplit(" ", 1)[0]
+    return text.rstrip(" ,;") + "."
+
+
+@dataclass
+class BucketTiming:
+    """Latency of one (length bucket, voice) pair in the warmup plan."""
+    chars: int
+    voice: str
+    first_ms: float
+    steady_ms: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "chars": self.chars,
+            "voice": self.voice,
+            "first_ms": round(self.first_ms, 1),
+            "steady_ms": round(self.steady_ms, 1),
+            "first_call_ratio": round(self.first_ms / self.steady_ms, 2) if self.steady_ms else None,
+        }
+
+
+@dataclass
+class WarmupReport:
+    """Progress and results of the background warmup plan."""
+    state: str = "pending"  # pending, running, completed, cancelled, failed
+    planned: int = 0
+    buckets: list[BucketTiming] = field(default_factory=list)
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "planned": self.planned,
+            "completed": len(self.buckets),
+            "buckets": [b.to_dict() for b in self.buckets],
+            "error": self.error,
+            "duration_s": round(self.finished_at - self.started_at, 2)
+            if self.started_at and self.finished_at else None,
+        }
+
+
+_report = WarmupReport()
+
+
+def get_warmup_report() -> dict[str, Any]:
+    return _report.to_dict()
+
+
+def warmup_plan(
+    buckets: Optional[Sequence[int]] = None,
+    voices: Sequence[str] = WARMUP_VOICES,
+) -> list[tuple[int, str]]:
+    """
+    (chars, voice) pairs to warm, shortest first; unknown voices are skipped.
+
+    Without explicit buckets, lengths suggested by recorded traffic are used
+    when available, WARMUP_BUCKETS otherwise.
+    """
+    if buckets is None:
+        buckets = length_histogram.suggest_buckets() or WARMUP_BUCKETS
+    resolved = []
+    for voice in voices:
+        voice_id = resolve_voice(voice)
+        if voice_id is None:
+            logger.warning(f"Warmup voice '{voice}' not found, skipping")
+        elif voice_id not in resolved:
+            resolved.append(voice_id)
+    return [(chars, voice) for chars in sorted(set(buckets)) for voice in resolved]
+
+
+def _timed_render(text: str, voice: str) -> float:
+    start_time = time.perf_counter()
+    for _ in get_model().generate_stream(text, voice=voice, speed=DEFAULT_SPEED):
+        pass
+    return (time.perf_counter() - start_time) * 1000
+
+
+async def run_warmup(
+    plan: Optional[list[tuple[int, str]]] = None,
+    repeats: int = WARMUP_REPEATS,
+) -> WarmupReport:
+    """
+    Run the warmup plan, recording per-bucket first-call and steady-state
+    (median of the remaining repeats) latency.
+    """
+    global _report
+    plan = warmup_plan() if plan is None else plan
+    _report = report = WarmupReport(state="running", planned=len(plan), started_at=time.time())
+
+    try:
+        for chars, voice in plan:
+            text = warmup_text(chars)
+            timings = []
+            for _ in range(repeats):
+                timings.append(await asyncio.wrap_future(
+                    submit_to_worker(_timed_render, text, voice, priority=Priority.BATCH)
+                ))
+            timing = BucketTiming(chars, voice, timings[0], statistics.median(timings[1:]))
+            report.buckets.append(timing)
+            logger.debug(f"Warmup {chars} chars/{voice}: first {timing.first_ms:.0f}ms, "
+                         f"steady {timing.steady_ms:.0f}ms")
+        report.state = "completed"
+        logger.info(f"Warmup plan completed: {len(plan)} buckets")
+    except asyncio.CancelledError:
+        report.state = "cancelled"
+        raise
+    except Exception as e:
+        logger.error(f"Warmup plan failed: {e}")
+        report.state = "failed"
+        report.error = str(e)
+    finally:
+        report.finished_at = time.time()
+    return report
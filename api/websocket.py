@@ -0,0 +1,262 @@
+"""
+Kokoro TTS API v2 - WebSocket Streaming
+
+Framed audio over one persistent WebSocket, so chat clients can speak many
+utterances without a new TCP/HTTP setup each time and still see segment
+boundaries, timing and errors mid-stream.
+
+Protocol (utterances are handled one after another on the same socket):
+
+    client -> {"input": "...", "voice": "af_heart", "speed": 1.0, "id": "optional"}
+    server -> {"type": "start", "id", "sample_rate", "format": "pcm_s16le", "tier"}
+    server -> {"type": "segment", "id", "index", "sample_offset", "samples", "generation_ms"}
+    server -> <binary frame: that segment's PCM>
+    ...
+    server -> {"type": "end", "id", "samples", "duration", "generation_time", "ttfa_ms"}
+
+With "timestamps": true each sentence becomes one segment, and once its
+audio has been sent (silence trimming and loudness normalization hold some
+back) it is followed by {"type": "words", "id", "index", "words": [{"word",
+"start", "end"}]}, where index is the segment that completed it and times
+are seconds from the start of the audio actually sent.
+
+Incremental text input (LLM token streams) replaces the single request with
+a begin/text/end sequence; each sentence is synthesized as soon as its
+boundary arrives and the reply uses the same start/segment/end framing:
+
+    client -> {"type": "begin", "voice": "af_heart", "speed": 1.0, "id": "optional"}
+    client -> {"type": "text", "text": "Hello th"}
+    client -> {"type": "text", "text": "ere. How are"}    (synthesis of "Hello there." starts)
+    client -> {"type": "end"}                             (flushes "How are")
+
+Any failure is reported as {"type": "error", "id", "detail"} and the socket
+stays open for the next utterance. When a text stream fails, its remaining
+messages are discarded up to its "end"; "text" and "end" messages outside a
+stream are rejected. An utterance rejected because the server
+is overloaded also carries "retry_after" (seconds).
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncGenerator, Callable, Optional
+
+import numpy as np
+from fastapi import WebSocket, WebSocketDisconnect
+
+from .config import SAMPLE_RATE
+from .loudness import LoudnessNormalizer
+from .streaming import SilenceTrimmer, audio_to_pcm_bytes
+from .text import SentenceBuffer
+from .timestamps import WordTiming, estimate_word_timings
+
+logger = logging.getLogger(__name__)
+
+PCM_FORMAT = "pcm_s16le"
+
+
+async def receive_message(websocket: WebSocket) -> dict[str, Any]:
+    """
+    Receive one JSON request object.
+
+    Raises:
+        ValueError: If the message is a binary frame or not a JSON object.
+        WebSocketDisconnect: If the client closed the socket.
+    """
+    frame = await websocket.receive()
+    if frame["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(frame.get("code", 1000))
+    text = frame.get("text")
+    if text is None:
+        raise ValueError("Expected a JSON text frame, got a binary frame")
+    try:
+        message = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e.msg}") from e
+    if not isinstance(message, dict):
+        raise ValueError("Request must be a JSON object")
+    return message
+
+
+async def _read_text_stream(websocket: WebSocket, sentences: asyncio.Queue, ended: asyncio.Event) -> None:
+    """Feed text messages into a SentenceBuffer until the client sends 'end'."""
+    buffer = SentenceBuffer()
+    try:
+        while True:
+            message = await receive_message(websocket)
+            kind = message.get("type")
+            if kind == "end":
+                ended.set()
+                break
+            if kind != "text":
+                raise ValueError(f"Expected 'text' or 'end' message, got {kind!r}")
+            for sentence in buffer.feed(str(message.get("text", ""))):
+                await sentences.put(sentence)
+
+        for sentence in buffer.flush():
+            await sentences.put(sentence)
+        await sentences.put(None)
+    except Exception as e:
+        # Includes WebSocketDisconnect — surfaced to the synthesis side
+        await sentences.put(e)
+
+
+async def incremental_audio_stream(
+    websocket: WebSocket,
+    synthesize: Callable[[str], AsyncGenerator[tuple[np.ndarray, int], None]],
+    ended: Optional[asyncio.Event] = None,
+) -> AsyncGenerator[tuple[np.ndarray, int], None]:
+    """
+    Synthesize text as it streams in over the socket.
+
+    Reading runs as a separate task so new text keeps arriving while earlier
+    sentences synthesize; sentences are spoken in arrival order. ended is
+    set once the stream's 'end' message has been read, so a caller whose
+    stream failed knows whether the rest of it must still be discarded
+    (see discard_until_end).
+    """
+    sentences: asyncio.Queue = asyncio.Queue()
+    reader = asyncio.create_task(_read_text_stream(websocket, sentences, ended or asyncio.Event()))
+
+    try:
+        while True:
+            item = await sentences.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            async for segment in synthesize(item):
+                yield segment
+    finally:
+        reader.cancel()
+
+
+async def discard_until_end(websocket: WebSocket) -> None:
+    """Drop the rest of a failed text stream, up to and including its 'end' message."""
+    while True:
+        try:
+            message = await receive_message(websocket)
+        except ValueError:
+            continue
+        if message.get("type") == "end":
+            return
+
+
+async def send_error(websocket: WebSocket, utterance_id: Any, detail: str, **extra: Any) -> None:
+    """Report a failure without closing the socket."""
+    await websocket.send_json({"type": "error", "id": utterance_id, "detail": detail, **extra})
+
+
+async def stream_utterance(
+    websocket: WebSocket,
+    utterance_id: Any,
+    audio_stream: AsyncGenerator[tuple, None],
+    trimmer: Optional[SilenceTrimmer] = None,
+    normalizer: Optional[LoudnessNormalizer] = None,
+    tier: Optional[str] = None,
+) -> None:
+    """
+    Send one utterance as segment messages interleaved with binary PCM frames.
+
+    sample_offset counts samples actually sent (after trimming), so clients
+    can schedule each frame without tracking byte counts themselves.
+
+    audio_stream yields (audio, sample_rate) tuples, or (audio, sample_rate,
+    text) tuples from timed synthesis, in which case a words message for
+    that text follows the frame that sends the end of its audio. Word times
+    are placed on the sent timeline: the trimmer removes samples, while the
+    normalizer only delays them.
+
+    tier is the quality tier the utterance is served at (see
+    api/degradation.py), reported in the start message.
+    """
+    start_time = time.perf_counter()
+    ttfa_ms: Optional[float] = None
+    sample_offset = 0
+    index = 0
+    trimmer_emitted = 0
+    produced = 0  # Samples out of the trimmer so far, including those it holds back
+    pending_words: list[tuple[int, list[WordTiming]]] = []  # (end sample, words), waiting for their audio
+
+    start: dict[str, Any] = {
+        "type": "start",
+        "id": utterance_id,
+        "sample_rate": SAMPLE_RATE,
+        "format": PCM_FORMAT,
+    }
+    if tier is not None:
+        start["tier"] = tier
+    await websocket.send_json(start)
+
+    async def _send_segment(audio: np.ndarray, **extra) -> None:
+        nonlocal ttfa_ms, sample_offset, index
+        if len(audio) == 0:
+            return
+        generation_ms = (time.perf_counter() - start_time) * 1000
+        if ttfa_ms is None:
+            ttfa_ms = generation_ms
+        await websocket.send_json({
+            "type": "segment",
+            "id": utterance_id,
+            "index": index,
+            "sample_offset": sample_offset,
+            "samples": len(audio),
+            "generation_ms": round(generation_ms, 1),
+            **extra,
+        })
+        await websocket.send_bytes(audio_to_pcm_bytes(audio))
+        sample_offset += len(audio)
+        index += 1
+
+    async def _send_words(final: bool = False) -> None:
+        while pending_words and (final or pending_words[0][0] <= sample_offset):
+            _, words = pending_words.pop(0)
+            if index == 0:
+                continue  # No audio went out at all
+            await websocket.send_json({
+                "type": "words",
+                "id": utterance_id,
+                "index": index - 1,
+                "words": [w.to_dict() for w in words],
+            })
+
+    async for audio_segment, sample_rate, *tagged in audio_stream:
+        raw = audio_segment
+        if trimmer is not None:
+            audio_segment = trimmer.process(audio_segment)
+            trimmer_emitted += len(audio_segment)
+            produced = trimmer_emitted + trimmer.held_samples
+        else:
+            produced += len(raw)
+        if normalizer is not None:
+            audio_segment = normalizer.process(audio_segment)
+
+        await _send_segment(audio_segment)
+
+        if tagged:
+            words = estimate_word_timings(tagged[0], raw, offset=(produced - len(raw)) / SAMPLE_RATE)
+            if words:
+                pending_words.append((round(words[-1].end * SAMPLE_RATE), words))
+        await _send_words()
+
+    tail = np.empty(0, dtype=np.float32)
+    if trimmer is not None:
+        tail = trimmer.flush()
+    if normalizer is not None:
+        tail = np.concatenate([normalizer.process(tail), normalizer.flush()])
+    await _send_segment(tail, flush=True)
+    await _send_words(final=True)
+
+    generation_time = time.perf_counter() - start_time
+    end: dict[str, Any] = {
+        "type": "end",
+        "id": utterance_id,
+        "samples": sample_offset,
+        "duration": sample_offset / SAMPLE_RATE,
+        "generation_time": round(generation_time, 4),
+        "ttfa_ms": round(ttfa_ms, 1) if ttfa_ms is not None else None,
+    }
+    if trimmer is not None:
+        end["trimmed_ms"] = round(trimmer.trimmed_ms, 1)
+    await websocket.send_json(end)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Import-time profile for the API modules.
+
+Imports each module in a fresh interpreter with `python -X importtime` and
+reports the total cost, the most expensive modules (self and cumulative
+time) and the cost per top-level package, so regressions such as an eager
+import of the inference stack show up at a glance.
+
+Usage:
+    python scripts/import_profile.py                 # api.main, api.config, api.streaming
+    python scripts/import_profile.py api.tts --top 15
+    python scripts/import_profile.py --json
+
+@author @darianrosebrook
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+DEFAULT_MODULES = ["api.main", "api.config", "api.streaming"]
+INFERENCE_PACKAGES = ("kokoro_mlx", "mlx")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_import(module):
+    """
+    Import module in a subprocess; returns [(name, self_us, cumulative_us)]
+    for the modules its import pulled in (interpreter startup excluded).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=PROJECT_ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        top_level = not name[1:].startswith(" ")  # Nested imports are indented
+        entries.append((name.strip(), int(self_us), int(cumulative_us), top_level))
+
+    # Children are printed before their parent: the module's subtree is
+    # everything after the previous top-level entry
+    end = max(i for i, e in enumerate(entries) if e[3]) + 1
+    start = max((i for i, e in enumerate(entries[:end - 1]) if e[3]), default=-1) + 1
+    return [e[:3] for e in entries[start:end]]
+
+
+def summarize(module, entries, top):
+    by_package = defaultdict(int)
+    for name, self_us, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+
+    return {
+        "module": module,
+        "total_ms": round(entries[-1][2] / 1000, 1),
+        "modules_imported": len(entries),
+        "inference_stack_imported": any(name.split(".")[0] in INFERENCE_PACKAGES for name, _, _ in entries),
+        "top_self_ms": [
+            (name, round(self_us / 1000, 1))
+            for name, self_us, _ in sorted(entries, key=lambda e: -e[1])[:top]
+        ],
+        "top_cumulative_ms": [
+            (name, round(cumulative_us / 1000, 1))
+            for name, _, cumulative_us in sorted(entries, key=lambda e: -e[2])[:top]
+        ],
+        "packages_ms": [
+            (package, round(self_us / 1000, 1))
+            for package, self_us in sorted(by_package.items(), key=lambda p: -p[1])[:top]
+        ],
+    }
+
+
+def print_report(report):
+    print(f"\n{report['module']}: {report['total_ms']:.1f} ms, {report['modules_imported']} modules"
+          f"{'  (imports the inference stack)' if report['inference_stack_imported'] else ''}")
+    print("=" * 60)
+    for title, key in (("Self time", "top_self_ms"), ("Cumulative", "top_cumulative_ms"),
+                       ("Per package", "packages_ms")):
+        print(f"  {title}:")
+        for name, ms in report[key]:
+            print(f"    {ms:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile import time of API modules")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=10, help="Entries per table")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of tables")
+    args = parser.parse_args()
+
+    reports = []
+    for module in args.modules:
+        try:
+            reports.append(summarize(module, profile_import(module), args.top))
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 1
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
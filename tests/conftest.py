@@ -83,10 +83,12 @@ def mock_model():
 # --- Client fixtures ---
 
 @pytest.fixture
-def client():
+def client(tmp_path):
     """TestClient with mock model loaded — for testing endpoints that need a ready model."""
     mock = _make_mock_model()
     with patch.object(main_module, 'initialize_model', return_value=0.01), \
+         patch.object(main_module, 'WARMUP_ENABLED', False), \
+         patch.object(main_module.length_histogram, 'path', str(tmp_path / "traffic.json")), \
          patch.object(tts_module, '_model', mock), \
          patch.object(tts_module, '_model_ready', True):
         with TestClient(app, raise_server_exceptions=False) as c:
@@ -94,9 +96,11 @@ def client():
 
 
 @pytest.fixture
-def client_no_model():
+def client_no_model(tmp_path):
     """TestClient with no model — for testing 503 responses."""
     with patch.object(main_module, 'initialize_model', return_value=0.01), \
+         patch.object(main_module, 'WARMUP_ENABLED', False), \
+         patch.object(main_module.length_histogram, 'path', str(tmp_path / "traffic.json")), \
          patch.object(tts_module, '_model', None), \
          patch.object(tts_module, '_model_ready', False):
         with TestClient(app, raise_server_exceptions=False) as c:
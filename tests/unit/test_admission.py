@@ -0,0 +1,81 @@
+"""
+Tests for api/admission.py — wait budget, Retry-After, and 429 shedding
+on the speech and WebSocket endpoints.
+"""
+
+import pytest
+from unittest.mock import patch
+
+import api.admission as admission_module
+import api.main as main_module
+from api.admission import AdmissionController
+from api.cache import AudioFileCache
+
+
+@pytest.fixture
+def overloaded():
+    """Predicted wait of 4.5s against a 2s budget."""
+    controller = AdmissionController(max_wait_ms=2000, enabled=True)
+    with patch.object(admission_module, "estimated_wait", return_value=4.5), \
+         patch.object(admission_module, "admission", controller), \
+         patch("api.main.admission", controller):
+        yield controller
+
+
+class TestAdmissionController:
+    def test_admits_within_budget(self):
+        controller = AdmissionController(max_wait_ms=2000, enabled=True)
+        with patch.object(admission_module, "estimated_wait", return_value=1.5):
+            assert controller.check() is None
+        assert controller.to_dict()["admitted"] == 1
+
+    def test_rejects_over_budget(self, overloaded):
+        assert overloaded.check() == 3  # Back within the budget after 2.5s
+        assert overloaded.to_dict()["rejected"] == 1
+
+    def test_retry_after_at_least_one_second(self):
+        controller = AdmissionController(max_wait_ms=2000, enabled=True)
+        with patch.object(admission_module, "estimated_wait", return_value=2.01):
+            assert controller.check() == 1
+
+    def test_disabled_admits_everything(self):
+        controller = AdmissionController(max_wait_ms=0, enabled=False)
+        with patch.object(admission_module, "estimated_wait", return_value=60):
+            assert controller.check() is None
+
+    def test_reports_queue_state(self):
+        state = AdmissionController(max_wait_ms=2000).to_dict()
+        assert {"depth", "running", "service_ms_per_char", "estimated_wait_ms", "max_wait_ms"} <= state.keys()
+        assert set(state["estimated_wait_ms"]) == {"interactive", "batch"}
+
+
+class TestEndpoints:
+    def test_speech_rejected_with_retry_after(self, client, overloaded):
+        r = client.post("/v1/audio/speech", json={"input": "Hello"})
+        assert r.status_code == 429
+        assert r.headers["Retry-After"] == "3"
+
+    def test_cached_response_not_rejected(self, client, tmp_path):
+        cache = AudioFileCache(directory=str(tmp_path / "audio"))
+        body = {"input": "Hello", "stream": False, "response_format": "wav"}
+        with patch.object(main_module, "response_cache", cache), \
+             patch.object(main_module, "FILE_RESPONSES", True), \
+             patch.object(main_module, "FILE_RESPONSE_MIN_SECONDS", 0):
+            assert client.post("/v1/audio/speech", json=body).status_code == 200
+            controller = AdmissionController(max_wait_ms=0, enabled=True)
+            with patch.object(admission_module, "estimated_wait", return_value=10), \
+                 patch.object(main_module, "admission", controller):
+                r = client.post("/v1/audio/speech", json=body)
+        assert r.status_code == 200
+        assert r.headers["X-Cache"] == "HIT"
+
+    def test_websocket_error_carries_retry_after(self, client, overloaded):
+        with client.websocket_connect("/v1/audio/speech/ws") as ws:
+            ws.send_json({"input": "Hello", "id": "u1"})
+            message = ws.receive_json()
+        assert message == {"type": "error", "id": "u1", "detail": "Server busy", "retry_after": 3}
+
+    def test_status_reports_queue(self, client):
+        queue = client.get("/status").json()["queue"]
+        assert queue["depth"] == 0
+        assert "estimated_wait_ms" in queue
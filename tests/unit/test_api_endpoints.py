@@ -5,12 +5,18 @@ Replaces the broken contract/integration tests that referenced the old API.
 """
 
 import struct
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import numpy as np
 import pytest
+from unittest.mock import patch
 
+import api.main as main_module
+import api.tts as tts_module
 from api.config import DEFAULT_VOICE
+from api.main import app
+from fastapi.testclient import TestClient
 
 
 # --- Health endpoint ---
@@ -30,6 +36,68 @@ class TestHealthEndpoint:
         assert data["status"] == "initializing"
         assert data["model_loaded"] is False
 
+    def test_health_reports_readiness(self, client):
+        data = client.get("/health").json()
+        assert data["live"] is True
+        assert data["ready"] is True
+        assert data["phase"] == "ready"
+        assert data["progress"] == 1.0
+
+    def test_probes_while_loading(self, client_no_model):
+        assert client_no_model.get("/health/live").status_code == 200
+        r = client_no_model.get("/health/ready")
+        assert r.status_code == 503
+        assert "retry-after" in r.headers
+        assert r.json()["ready"] is False
+
+    def test_probes_when_ready(self, client):
+        assert client.get("/health/live").status_code == 200
+        assert client.get("/health/ready").status_code == 200
+
+
+# --- Background model load ---
+
+@pytest.fixture
+def slow_load(mock_model, tmp_path):
+    """App whose model load blocks until the returned event is set."""
+    loaded = threading.Event()
+
+    def fake_initialize():
+        loaded.wait(5)
+        tts_module._model_ready = True
+        return 0.01
+
+    with patch.object(main_module, 'initialize_model', side_effect=fake_initialize), \
+         patch.object(main_module, 'WARMUP_ENABLED', False), \
+         patch.object(main_module.length_histogram, 'path', str(tmp_path / "traffic.json")), \
+         patch.object(tts_module, '_model', mock_model), \
+         patch.object(tts_module, '_model_ready', False):
+        with TestClient(app, raise_server_exceptions=False) as c:
+            yield c, loaded
+            loaded.set()
+
+
+class TestBackgroundLoad:
+    def test_health_answers_while_loading(self, slow_load):
+        client, _ = slow_load
+        r = client.get("/health")
+        assert r.status_code == 200
+        assert r.json()["status"] == "initializing"
+
+    def test_speech_waits_for_load(self, slow_load):
+        client, loaded = slow_load
+        threading.Timer(0.2, loaded.set).start()
+        r = client.post("/v1/audio/speech", json={"input": "Hello", "stream": False})
+        assert r.status_code == 200
+        assert client.get("/health").json()["ready"] is True
+
+    def test_speech_503_after_timeout(self, slow_load):
+        client, _ = slow_load
+        with patch.object(main_module, 'READY_TIMEOUT_S', 0.05):
+            r = client.post("/v1/audio/speech", json={"input": "Hello", "stream": False})
+        assert r.status_code == 503
+        assert "retry-after" in r.headers
+
 
 # --- Voices endpoint ---
 
@@ -41,6 +109,10 @@ class TestVoicesEndpoint:
         assert isinstance(voices, list)
         assert "af_heart" in voices
 
+    def test_voices_include_metadata(self, client):
+        details = {d["id"]: d for d in client.get("/voices").json()["details"]}
+        assert details["bm_fable"] == {"id": "bm_fable", "name": "fable", "language": "en-gb", "gender": "male"}
+
     def test_voices_model_not_ready(self, client_no_model):
         r = client_no_model.get("/voices")
         assert r.status_code == 503
@@ -377,3 +449,234 @@ class TestTTSEndpointStreaming:
         })
         assert r.status_code == 200
         assert len(r.content) % 2 == 0
+
+
+# --- TTS endpoint: loudness normalization ---
+
+class TestTTSEndpointLoudness:
+    def test_streaming_reports_latency(self, client):
+        r = client.post("/v1/audio/speech", json={
+            "input": "Hello world",
+            "stream": True,
+            "normalize_loudness": True,
+        })
+        assert r.status_code == 200
+        assert float(r.headers["x-loudness-latency-ms"]) > 0
+        assert len(r.content) % 2 == 0
+
+    def test_streaming_off_by_default(self, client):
+        r = client.post("/v1/audio/speech", json={"input": "Hello world", "stream": True})
+        assert "x-loudness-latency-ms" not in r.headers
+
+    def test_normalized_length_matches_plain(self, client):
+        """Normalization changes level, never duration."""
+        body = {"input": "Hello world", "stream": False}
+        plain = client.post("/v1/audio/speech", json=body)
+        normalized = client.post("/v1/audio/speech", json={**body, "normalize_loudness": True})
+        assert normalized.status_code == 200
+        assert len(normalized.content) == len(plain.content)
+        assert normalized.content != plain.content
+
+
+# --- TTS endpoint: silence trimming ---
+
+class TestTTSEndpointTrimSilence:
+    def test_non_streaming_reports_trimmed_ms(self, client):
+        r = client.post("/v1/audio/speech", json={
+            "input": "Hello world",
+            "stream": False,
+            "trim_silence": True,
+        })
+        assert r.status_code == 200
+        assert float(r.headers["x-trimmed-ms"]) >= 0
+
+    def test_streaming_with_trim(self, client):
+        r = client.post("/v1/audio/speech", json={
+            "input": "Hello world streaming test",
+            "stream": True,
+            "trim_silence": True,
+        })
+        assert r.status_code == 200
+        assert len(r.content) > 0
+        assert len(r.content) % 2 == 0
+
+
+# --- TTS endpoint: file-backed responses ---
+
+@pytest.fixture
+def file_cache(tmp_path):
+    """Serve every non-streaming result from an isolated on-disk cache."""
+    import api.main as main_module
+    from api.cache import AudioFileCache
+    cache = AudioFileCache(directory=str(tmp_path))
+    with patch.object(main_module, "response_cache", cache), \
+         patch.object(main_module, "FILE_RESPONSE_MIN_SECONDS", 0):
+        yield cache
+
+
+class TestTTSEndpointFileResponse:
+    def test_short_clip_stays_in_memory(self, client):
+        r = client.post("/v1/audio/speech", json={"input": "Hello", "response_format": "wav"})
+        assert r.status_code == 200
+        assert "content-location" not in r.headers
+
+    def test_served_from_file(self, client, file_cache):
+        r = client.post("/v1/audio/speech", json={"input": "Hello world", "response_format": "wav"})
+        assert r.status_code == 200
+        assert r.headers["content-type"] == "audio/wav"
+        assert r.headers["x-cache"] == "MISS"
+        assert r.headers["accept-ranges"] == "bytes"
+        assert r.content[:4] == b"RIFF"
+        assert "x-generation-time" in r.headers
+        assert int(r.headers["content-length"]) == len(r.content)
+
+    def test_repeat_request_skips_inference(self, client, file_cache):
+        import api.tts as tts_module
+        body = {"input": "Hello world", "stream": False}
+        first = client.post("/v1/audio/speech", json=body)
+        calls = tts_module._model.generate_stream.call_count
+
+        second = client.post("/v1/audio/speech", json=body)
+        assert second.headers["x-cache"] == "HIT"
+        assert second.content == first.content
+        assert float(second.headers["x-audio-duration"]) == pytest.approx(float(first.headers["x-audio-duration"]))
+        assert tts_module._model.generate_stream.call_count == calls
+
+    def test_range_request(self, client, file_cache):
+        body = {"input": "Hello world", "response_format": "wav"}
+        full = client.post("/v1/audio/speech", json=body).content
+        r = client.post("/v1/audio/speech", json=body, headers={"Range": "bytes=44-143"})
+        assert r.status_code == 206
+        assert r.headers["content-range"] == f"bytes 44-143/{len(full)}"
+        assert r.content == full[44:144]
+
+    def test_get_by_content_location(self, client, file_cache):
+        r = client.post("/v1/audio/speech", json={"input": "Hello world", "response_format": "wav"})
+        location = r.headers["content-location"]
+        g = client.get(location, headers={"Range": "bytes=0-3"})
+        assert g.status_code == 206
+        assert g.content == b"RIFF"
+
+    def test_get_unknown_file(self, client, file_cache):
+        assert client.get("/v1/audio/speech/files/" + "0" * 64 + ".wav").status_code == 404
+        assert client.get("/v1/audio/speech/files/not-a-key.wav").status_code == 404
+
+
+# --- TTS endpoint: conditional requests ---
+
+class TestTTSEndpointConditional:
+    BODY = {"input": "Hello world", "response_format": "wav"}
+
+    def test_non_streaming_has_etag(self, client):
+        r = client.post("/v1/audio/speech", json=self.BODY)
+        key = r.headers["x-content-key"]
+        assert r.headers["etag"] == f'"{key}"'
+        assert r.headers["cache-control"].startswith("public, max-age=")
+
+    def test_etag_stable_and_request_specific(self, client):
+        first = client.post("/v1/audio/speech", json=self.BODY).headers["etag"]
+        assert client.post("/v1/audio/speech", json=self.BODY).headers["etag"] == first
+        other = client.post("/v1/audio/speech", json={**self.BODY, "speed": 1.25}).headers["etag"]
+        assert other != first
+
+    def test_if_none_match_returns_304_without_inference(self, client):
+        import api.tts as tts_module
+        etag = client.post("/v1/audio/speech", json=self.BODY).headers["etag"]
+        calls = tts_module._model.generate_stream.call_count
+
+        for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            r = client.post("/v1/audio/speech", json=self.BODY, headers={"If-None-Match": header})
+            assert r.status_code == 304
+            assert r.headers["etag"] == etag
+            assert r.content == b""
+        assert tts_module._model.generate_stream.call_count == calls
+
+    def test_stale_etag_regenerates(self, client):
+        r = client.post("/v1/audio/speech", json=self.BODY, headers={"If-None-Match": '"stale"'})
+        assert r.status_code == 200
+        assert r.content[:4] == b"RIFF"
+
+    def test_streaming_has_no_etag(self, client):
+        r = client.post("/v1/audio/speech", json={"input": "Hello world", "stream": True})
+        assert "etag" not in r.headers
+
+    def test_file_response_uses_content_etag(self, client, file_cache):
+        r = client.post("/v1/audio/speech", json=self.BODY)
+        etag = r.headers["etag"]
+        assert etag == f'"{r.headers["x-content-key"]}"'
+
+        location = r.headers["content-location"]
+        assert client.get(location).headers["etag"] == etag
+        assert client.get(location, headers={"If-None-Match": etag}).status_code == 304
+        # If-Range with the content ETag honours the range
+        g = client.get(location, headers={"Range": "bytes=0-3", "If-Range": etag})
+        assert g.status_code == 206
+
+
+# --- TTS endpoint: time-stretched speed changes ---
+
+class TestTTSEndpointTimeStretch:
+    TEXT = "Speed changes should not need a second inference run."
+
+    @pytest.fixture(autouse=True)
+    def _empty_base_cache(self):
+        import api.main as main_module
+        main_module.stretch_bases.clear()
+
+    def _post(self, client, speed, **extra):
+        return client.post("/v1/audio/speech", json={
+            "input": self.TEXT, "stream": False, "speed": speed, "time_stretch": True, **extra,
+        })
+
+    def test_renders_base_at_unit_speed(self, client):
+        import api.tts as tts_module
+        base = client.post("/v1/audio/speech", json={"input": self.TEXT, "stream": False})
+        r = self._post(client, 1.5)
+        assert r.status_code == 200
+        assert r.headers["x-time-stretch"] == "fast; base=render"
+        assert tts_module._model.generate_stream.call_args.kwargs["speed"] == 1.0
+        assert len(r.content) // 2 == round(len(base.content) // 2 / 1.5)
+
+    def test_speed_changes_reuse_cached_base(self, client, file_cache):
+        import api.tts as tts_module
+        client.post("/v1/audio/speech", json={"input": self.TEXT, "stream": False})
+        calls = tts_module._model.generate_stream.call_count
+
+        for speed in (1.25, 1.5):
+            r = self._post(client, speed, stretch_quality="high")
+            assert r.status_code == 200
+            assert r.headers["x-time-stretch"] == "high; base=cache"
+        assert tts_module._model.generate_stream.call_count == calls
+
+    def test_short_base_kept_in_memory(self, client):
+        import api.tts as tts_module
+        assert self._post(client, 1.5).headers["x-time-stretch"] == "fast; base=render"
+        calls = tts_module._model.generate_stream.call_count
+        r = self._post(client, 0.8)
+        assert r.headers["x-time-stretch"] == "fast; base=cache"
+        assert tts_module._model.generate_stream.call_count == calls
+
+    def test_memory_cache_evicts_least_recent(self):
+        import numpy as np
+        from api.cache import AudioMemoryCache
+        cache = AudioMemoryCache(max_mb=2 * 4000 * 4 / (1024 * 1024))  # Room for two clips
+        for key in ("a", "b"):
+            cache.put(key, np.zeros(4000, dtype=np.float32))
+        cache.get("a")
+        cache.put("c", np.zeros(4000, dtype=np.float32))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+
+    def test_distinct_etag_from_inference(self, client):
+        stretched = self._post(client, 1.5).headers["etag"]
+        synthesized = client.post("/v1/audio/speech", json={
+            "input": self.TEXT, "stream": False, "speed": 1.5,
+        }).headers["etag"]
+        assert stretched != synthesized
+
+    def test_unit_speed_ignores_stretch(self, client):
+        r = self._post(client, 1.0)
+        assert "x-time-stretch" not in r.headers
+
+    def test_invalid_quality(self, client):
+        assert self._post(client, 1.5, stretch_quality="ultra").status_code == 422
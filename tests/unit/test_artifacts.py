@@ -0,0 +1,149 @@
+"""
+Tests for api/artifacts.py — prepared model artifacts: build on first load,
+direct load afterwards, cache keys, fallbacks, and reduced-precision variants.
+"""
+
+import json
+import os
+from types import SimpleNamespace
+
+import mlx.core as mx
+import mlx.nn as nn
+import pytest
+from unittest.mock import patch
+
+import api.artifacts as artifacts
+from api.artifacts import artifact_path, load_model, resolve_model_path, set_precision
+
+
+class TinyModel(nn.Module):
+    """Stand-in for KokoroModel: a few parameters, including a list."""
+    from_pretrained_calls = 0
+
+    def __init__(self, config=None):
+        super().__init__()
+        self.linear = nn.Linear(4, 4)
+        self.alpha = [mx.zeros((1,)), mx.zeros((1,))]
+
+    @classmethod
+    def from_pretrained(cls, path):
+        cls.from_pretrained_calls += 1
+        model = cls()
+        model.linear.weight = mx.ones((4, 4))
+        model.alpha[1] = mx.array([0.5])
+        return model
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    path = tmp_path / "model"
+    (path / "voices").mkdir(parents=True)
+    (path / "config.json").write_text(json.dumps({"n_token": 178}))
+    (path / "kokoro-v1_0.safetensors").write_bytes(b"weights")
+    return path
+
+
+@pytest.fixture
+def tiny(tmp_path):
+    TinyModel.from_pretrained_calls = 0
+    with patch.object(artifacts, "KokoroModel", TinyModel):
+        yield str(tmp_path / "cache")
+
+
+class TestLoadModel:
+    def test_first_load_builds_artifact(self, model_dir, tiny):
+        tts = load_model(str(model_dir), cache_dir=tiny)
+        assert TinyModel.from_pretrained_calls == 1
+        assert os.path.exists(artifact_path(model_dir, tiny))
+        assert tts._model_path == model_dir
+
+    def test_second_load_uses_artifact(self, model_dir, tiny):
+        load_model(str(model_dir), cache_dir=tiny)
+        tts = load_model(str(model_dir), cache_dir=tiny)
+        assert TinyModel.from_pretrained_calls == 1
+        assert mx.array_equal(tts._model.linear.weight, mx.ones((4, 4))).item()
+        assert tts._model.alpha[1].item() == 0.5
+
+    def test_corrupt_artifact_rebuilt(self, model_dir, tiny):
+        path = artifact_path(model_dir, tiny)
+        os.makedirs(tiny)
+        open(path, "wb").write(b"not safetensors")
+        tts = load_model(str(model_dir), cache_dir=tiny)
+        assert TinyModel.from_pretrained_calls == 1
+        assert mx.array_equal(tts._model.linear.weight, mx.ones((4, 4))).item()
+        assert os.path.getsize(path) > len(b"not safetensors")
+
+    def test_unwritable_cache_still_loads(self, model_dir, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        with patch.object(artifacts, "KokoroModel", TinyModel):
+            tts = load_model(str(model_dir), cache_dir=str(blocker / "cache"))
+        assert tts._model is not None
+
+
+class TestArtifactKey:
+    def test_changes_with_weights(self, model_dir, tiny):
+        before = artifact_path(model_dir, tiny)
+        (model_dir / "kokoro-v1_0.safetensors").write_bytes(b"new weights")
+        assert artifact_path(model_dir, tiny) != before
+
+    def test_changes_with_runtime_version(self, model_dir, tiny):
+        before = artifact_path(model_dir, tiny)
+        with patch.object(artifacts.mx, "__version__", "0.0.0"):
+            assert artifact_path(model_dir, tiny) != before
+
+
+class TestResolveModelPath:
+    def test_local_directory(self, model_dir):
+        assert resolve_model_path(str(model_dir)) == model_dir
+
+    def test_prefers_local_hub_cache(self, tmp_path):
+        with patch("huggingface_hub.snapshot_download", return_value=str(tmp_path)) as download:
+            assert resolve_model_path("org/model") == tmp_path
+        download.assert_called_once_with(repo_id="org/model", local_files_only=True)
+
+    def test_downloads_when_not_cached(self, tmp_path):
+        def fake_download(repo_id, local_files_only=False):
+            if local_files_only:
+                raise FileNotFoundError(repo_id)
+            return str(tmp_path)
+
+        with patch("huggingface_hub.snapshot_download", side_effect=fake_download) as download:
+            assert resolve_model_path("org/model") == tmp_path
+        assert download.call_count == 2
+
+
+class Vocoded(nn.Module):
+    """Stand-in with a text-side layer and a vocoder ("decoder")."""
+
+    def __init__(self):
+        super().__init__()
+        self.text_encoder = nn.Linear(64, 64)
+        self.decoder = nn.Linear(64, 64)
+
+
+class TestSetPrecision:
+    def _tts(self):
+        return SimpleNamespace(_model=Vocoded())
+
+    def test_quantizes_all_but_vocoder(self):
+        tts = self._tts()
+        set_precision(tts, "q8")
+        assert isinstance(tts._model.text_encoder, nn.QuantizedLinear)
+        assert isinstance(tts._model.decoder, nn.Linear)
+        assert tts._model.text_encoder(mx.ones((1, 64))).shape == (1, 64)
+
+    def test_bf16_keeps_vocoder_fp32(self):
+        tts = self._tts()
+        set_precision(tts, "bf16")
+        assert tts._model.text_encoder.weight.dtype == mx.bfloat16
+        assert tts._model.decoder.weight.dtype == mx.float32
+
+    def test_fp32_unchanged(self):
+        tts = self._tts()
+        set_precision(tts, "fp32")
+        assert tts._model.text_encoder.weight.dtype == mx.float32
+
+    def test_unknown_precision(self):
+        with pytest.raises(ValueError, match="Unknown precision"):
+            set_precision(self._tts(), "int3")
@@ -0,0 +1,116 @@
+"""
+Tests for api/batch.py and the /v1/audio/speech/batch endpoint — scheduling
+order, multipart framing, per-item failures.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import api.tts as tts_module
+from api.batch import schedule_order
+
+
+def _parse_multipart(response):
+    """Split a multipart/mixed response into (headers, body) pairs."""
+    content_type = response.headers["content-type"]
+    assert content_type.startswith("multipart/mixed; boundary=")
+    boundary = content_type.split("boundary=", 1)[1].encode()
+    body = response.content
+    assert body.endswith(b"--" + boundary + b"--\r\n")
+
+    parts = []
+    for chunk in body.split(b"--" + boundary)[1:-1]:
+        head, _, payload = chunk.lstrip(b"\r\n").partition(b"\r\n\r\n")
+        headers = dict(line.split(": ", 1) for line in head.decode().split("\r\n"))
+        payload = payload[:-2]  # trailing CRLF before the next delimiter
+        assert len(payload) == int(headers["Content-Length"])
+        parts.append((headers, payload))
+    return parts
+
+
+class TestScheduleOrder:
+    def test_groups_by_voice_then_length(self):
+        items = [
+            SimpleNamespace(voice="bm_fable", speed=1.0, input="a longer input"),
+            SimpleNamespace(voice="af_heart", speed=1.0, input="long input here"),
+            SimpleNamespace(voice="bm_fable", speed=1.0, input="short"),
+            SimpleNamespace(voice="af_heart", speed=1.0, input="hi"),
+        ]
+        assert schedule_order(items) == [3, 1, 2, 0]
+
+    def test_groups_by_speed(self):
+        items = [
+            SimpleNamespace(voice="af_heart", speed=1.5, input="a"),
+            SimpleNamespace(voice="af_heart", speed=1.0, input="bbbb"),
+        ]
+        assert schedule_order(items) == [1, 0]
+
+
+class TestBatchEndpoint:
+    def test_returns_one_part_per_item(self, client):
+        items = [{"input": "Hello world.", "id": "a"}, {"input": "Second item here.", "voice": "bm_fable"}]
+        r = client.post("/v1/audio/speech/batch", json={"items": items})
+        assert r.status_code == 200
+        assert r.headers["x-batch-items"] == "2"
+
+        parts = _parse_multipart(r)
+        assert sorted(int(h["X-Item-Index"]) for h, _ in parts) == [0, 1]
+        for headers, payload in parts:
+            assert headers["X-Item-Status"] == "200"
+            assert headers["Content-Type"] == "audio/pcm"
+            assert len(payload) > 0 and len(payload) % 2 == 0
+            assert float(headers["X-Audio-Duration"]) == pytest.approx(len(payload) / 2 / 24000)
+
+        ids = {h["X-Item-Index"]: h.get("X-Item-Id") for h, _ in parts}
+        assert ids == {"0": "a", "1": None}
+
+    def test_wav_parts(self, client):
+        r = client.post("/v1/audio/speech/batch", json={"items": [{"input": "Hi."}], "response_format": "wav"})
+        [(headers, payload)] = _parse_multipart(r)
+        assert headers["Content-Type"] == "audio/wav"
+        assert payload[:4] == b"RIFF"
+
+    def test_item_failure_is_isolated(self, client):
+        model = tts_module._model
+        original = model.generate_stream.side_effect
+
+        def flaky(text, **kwargs):
+            if "fail" in text:
+                raise RuntimeError("synthesis exploded")
+            return original(text, **kwargs)
+
+        model.generate_stream.side_effect = flaky
+        r = client.post("/v1/audio/speech/batch", json={"items": [{"input": "please fail"}, {"input": "fine"}]})
+        parts = {h["X-Item-Index"]: (h, p) for h, p in _parse_multipart(r)}
+
+        failed_headers, failed_body = parts["0"]
+        assert failed_headers["X-Item-Status"] == "500"
+        assert failed_headers["Content-Type"] == "application/json"
+        assert "synthesis exploded" in json.loads(failed_body)["detail"]
+        assert parts["1"][0]["X-Item-Status"] == "200"
+
+    def test_many_items_bounded_window(self, client):
+        items = [{"input": f"Item number {i}."} for i in range(12)]
+        r = client.post("/v1/audio/speech/batch", json={"items": items})
+        parts = _parse_multipart(r)
+        assert sorted(int(h["X-Item-Index"]) for h, _ in parts) == list(range(12))
+
+    def test_empty_items_rejected(self, client):
+        r = client.post("/v1/audio/speech/batch", json={"items": []})
+        assert r.status_code == 422
+
+    @pytest.mark.parametrize("item_id", ["a\r\nX-Item-Status: 200", "", "x" * 129])
+    def test_unsafe_item_id_rejected(self, client, item_id):
+        r = client.post("/v1/audio/speech/batch", json={"items": [{"input": "Hello.", "id": item_id}]})
+        assert r.status_code == 422
+
+    def test_whitespace_item_rejected(self, client):
+        r = client.post("/v1/audio/speech/batch", json={"items": [{"input": "ok"}, {"input": "   "}]})
+        assert r.status_code == 400
+        assert "Item 1" in r.json()["detail"]
+
+    def test_model_not_ready(self, client_no_model):
+        r = client_no_model.post("/v1/audio/speech/batch", json={"items": [{"input": "hi"}]})
+        assert r.status_code == 503
@@ -0,0 +1,72 @@
+"""
+Tests for api/cache.py — content keys, file layout, LRU eviction.
+"""
+
+import os
+import struct
+
+from api.cache import AudioFileCache, content_key, file_duration
+
+
+class TestContentKey:
+    def test_deterministic(self):
+        assert content_key("Hello", "af_heart", 1.0, "wav") == content_key("Hello", "af_heart", 1.0, "wav")
+
+    def test_every_parameter_matters(self):
+        base = content_key("Hello", "af_heart", 1.0, "wav")
+        assert content_key("Hello!", "af_heart", 1.0, "wav") != base
+        assert content_key("Hello", "bm_fable", 1.0, "wav") != base
+        assert content_key("Hello", "af_heart", 1.25, "wav") != base
+        assert content_key("Hello", "af_heart", 1.0, "pcm") != base
+        assert content_key("Hello", "af_heart", 1.0, "wav", trim_silence=True) != base
+        assert content_key("Hello", "af_heart", 1.0, "wav", normalize_loudness=True) != base
+
+
+class TestAudioFileCache:
+    def test_put_wav(self, tmp_path, sample_audio):
+        cache = AudioFileCache(directory=str(tmp_path))
+        key = content_key("x", "af_heart", 1.0, "wav")
+        path = cache.put(key, "wav", sample_audio)
+
+        with open(path, "rb") as f:
+            data = f.read()
+        assert data[:4] == b"RIFF"
+        assert struct.unpack("<I", data[40:44])[0] == len(sample_audio) * 2
+        assert len(data) == 44 + len(sample_audio) * 2
+        assert file_duration(path) == 1.0
+        assert cache.get(key, "wav") == path
+        assert cache.get(key, "pcm") is None
+
+    def test_put_pcm_matches_in_memory_conversion(self, tmp_path, sample_audio):
+        from api.streaming import audio_to_pcm_bytes
+        cache = AudioFileCache(directory=str(tmp_path))
+        path = cache.put(content_key("x", "af_heart", 1.0, "pcm"), "pcm", sample_audio)
+        with open(path, "rb") as f:
+            assert f.read() == audio_to_pcm_bytes(sample_audio)
+
+    def test_rejects_unsafe_names(self, tmp_path):
+        cache = AudioFileCache(directory=str(tmp_path))
+        assert cache.path("../etc/passwd") is None
+        assert cache.path("a" * 64 + ".mp3") is None
+
+    def test_evicts_least_recently_used(self, tmp_path, sample_audio):
+        # Each 1 s clip is 48,000 bytes; room for two
+        cache = AudioFileCache(directory=str(tmp_path), max_mb=100_000 / 1024 / 1024)
+        keys = [content_key(str(i), "af_heart", 1.0, "pcm") for i in range(3)]
+
+        first = cache.put(keys[0], "pcm", sample_audio)
+        second = cache.put(keys[1], "pcm", sample_audio)
+        os.utime(first, (0, 0))
+        os.utime(second, (1, 1))
+        cache.get(keys[0], "pcm")  # touch: keys[1] is now the oldest
+        cache.put(keys[2], "pcm", sample_audio)
+
+        assert cache.get(keys[1], "pcm") is None
+        assert cache.get(keys[0], "pcm") is not None
+        assert cache.get(keys[2], "pcm") is not None
+
+    def test_never_evicts_new_file(self, tmp_path, sample_audio):
+        cache = AudioFileCache(directory=str(tmp_path), max_mb=0)
+        key = content_key("x", "af_heart", 1.0, "pcm")
+        path = cache.put(key, "pcm", sample_audio)
+        assert os.path.exists(path)
@@ -0,0 +1,157 @@
+"""
+Tests for request deadlines — expired work dropped from the queue, generation
+stopped mid-stream, abandoned streams, and the 504/timeout request surface.
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+import api.tts as tts_module
+from api.scheduler import DeadlineExceeded, deadline_after
+from api.tts import generate_audio, generate_audio_stream, get_queue_state, submit_to_worker
+
+
+@pytest.fixture
+def slow_model(mock_model):
+    """Model yielding five 50ms chunks, recording how many it produced."""
+    produced = []
+
+    def slow_stream(text, voice="af_heart", speed=1.0, **kwargs):
+        for i in range(5):
+            time.sleep(0.05)
+            produced.append(i)
+            yield np.zeros(2400, dtype=np.float32)
+
+    mock_model.generate_stream.side_effect = slow_stream
+    with patch.object(tts_module, '_model', mock_model), \
+         patch.object(tts_module, '_model_ready', True):
+        yield produced
+
+
+def _block_worker():
+    release = threading.Event()
+    started = threading.Event()
+
+    def _hold():
+        started.set()
+        release.wait(5)
+
+    submit_to_worker(_hold)
+    assert started.wait(5)
+    return release
+
+
+class TestGeneration:
+    def test_generation_stops_when_deadline_passes(self, slow_model):
+        with pytest.raises(DeadlineExceeded):
+            generate_audio("Hello", deadline=deadline_after(80))
+        assert len(slow_model) < 5
+
+    def test_queued_work_dropped_after_deadline(self, slow_model):
+        before = get_queue_state()["expired"]["queued"]
+        release = _block_worker()
+        result = {}
+
+        def _generate():
+            try:
+                generate_audio("Hello", deadline=deadline_after(20))
+            except DeadlineExceeded as e:
+                result["error"] = e
+
+        caller = threading.Thread(target=_generate)
+        caller.start()
+        time.sleep(0.05)
+        release.set()
+        caller.join(5)
+        assert isinstance(result.get("error"), DeadlineExceeded)
+        assert slow_model == []
+        assert get_queue_state()["expired"]["queued"] == before + 1
+
+    def test_stream_raises_when_dropped_from_queue(self, slow_model):
+        release = _block_worker()
+
+        async def _consume():
+            stream = generate_audio_stream("Hello", deadline=deadline_after(20))
+            await asyncio.sleep(0.05)
+            release.set()
+            return [chunk async for chunk in stream]
+
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(_consume())
+        assert slow_model == []
+
+    def test_abandoned_stream_stops_generation(self, slow_model):
+        async def _first_chunk():
+            stream = generate_audio_stream("Hello")
+            async for chunk in stream:
+                break
+            await stream.aclose()
+
+        asyncio.run(_first_chunk())
+        tts_module._mlx_executor.submit(lambda: None).result(timeout=5)  # Wait for the worker to stop
+        assert len(slow_model) < 5
+
+
+    def test_abandoned_segmented_stream_stops_running_segment(self, slow_model):
+        async def _first_segment():
+            stream = generate_audio_stream("Hello there. How are you?", short_first_segment=True)
+            async for chunk in stream:
+                break
+            await stream.aclose()
+
+        asyncio.run(_first_segment())
+        tts_module._mlx_executor.submit(lambda: None).result(timeout=5)
+        assert len(slow_model) < 10  # The second segment stopped early
+
+    def test_segmented_stream_yields_remainder_per_batch(self, slow_model):
+        async def _arrivals():
+            stream = generate_audio_stream("Hello there. How are you?", short_first_segment=True)
+            return [time.perf_counter() async for _ in stream]
+
+        start = time.perf_counter()
+        arrivals = asyncio.run(_arrivals())
+        assert len(arrivals) == 10  # Every batch of both parts, not one chunk per part
+        gaps = [b - a for a, b in zip([start] + arrivals, arrivals)]
+        assert max(gaps) < 0.15  # About one 50ms batch, never a whole 250ms part
+
+
+class TestEndpoints:
+    def test_blocking_request_times_out_with_504(self, client, slow_model):
+        r = client.post(
+            "/v1/audio/speech",
+            json={"input": "Hello", "stream": False},
+            headers={"X-Request-Timeout-Ms": "80"},
+        )
+        assert r.status_code == 504
+
+    def test_field_timeout(self, client, slow_model):
+        r = client.post("/v1/audio/speech", json={"input": "Hello", "stream": False, "timeout_ms": 80})
+        assert r.status_code == 504
+
+    def test_generous_timeout_succeeds(self, client):
+        r = client.post("/v1/audio/speech", json={"input": "Hello", "stream": False, "timeout_ms": 30000})
+        assert r.status_code == 200
+
+    def test_invalid_header(self, client):
+        r = client.post("/v1/audio/speech", json={"input": "Hello"}, headers={"X-Request-Timeout-Ms": "soon"})
+        assert r.status_code == 400
+
+    @pytest.mark.parametrize("value", ["0", "-5", "nan", "inf"])
+    def test_out_of_range_header(self, client, value):
+        r = client.post("/v1/audio/speech", json={"input": "Hello"}, headers={"X-Request-Timeout-Ms": value})
+        assert r.status_code == 400
+
+    def test_stream_ends_early_at_deadline(self, client, slow_model):
+        r = client.post("/v1/audio/speech", json={"input": "Hello", "stream": True, "timeout_ms": 80})
+        assert r.status_code == 200
+        assert 0 < len(r.content) < 5 * 2400 * 2
+
+    def test_status_counts_expired_work(self, client, slow_model):
+        client.post("/v1/audio/speech", json={"input": "Hello", "stream": False, "timeout_ms": 80})
+        expired = client.get("/status").json()["queue"]["expired"]
+        assert expired["running"] >= 1
@@ -0,0 +1,95 @@
+"""
+Tests for api/degradation.py — tier hysteresis, per-request plans and the
+tier reported on responses.
+"""
+
+import pytest
+from unittest.mock import patch
+
+import api.degradation as degradation_module
+import api.tts as tts_module
+from api.degradation import DegradationPolicy
+from tests.conftest import _make_mock_model
+
+
+@pytest.fixture
+def policy():
+    return DegradationPolicy(thresholds_ms=[100, 300], exit_ratio=0.5, variant="fast", enabled=True)
+
+
+def _plan_at(policy, wait_ms, model="kokoro-v1.0"):
+    with patch.object(degradation_module, "estimated_wait", return_value=wait_ms / 1000):
+        return policy.plan(model)
+
+
+class TestTiers:
+    def test_rises_with_wait(self, policy):
+        assert policy.update(50) == 0
+        assert policy.update(150) == 1
+        assert policy.update(400) == 2
+
+    def test_jumps_straight_to_highest_tier(self, policy):
+        assert policy.update(1000) == 2
+
+    def test_falls_one_step_below_exit_threshold(self, policy):
+        policy.update(400)
+        assert policy.update(200) == 2  # Below 300 but above the 150 exit point
+        assert policy.update(100) == 1
+        assert policy.update(60) == 1
+        assert policy.update(40) == 0
+        assert policy.to_dict()["transitions"] == 3
+
+
+class TestPlan:
+    def test_full_when_idle(self, policy):
+        plan = _plan_at(policy, 0)
+        assert (plan.tier, plan.variant, plan.short_first_segment) == ("full", "kokoro-v1.0", False)
+
+    def test_segmented_keeps_model(self, policy):
+        plan = _plan_at(policy, 150)
+        assert (plan.tier, plan.variant, plan.short_first_segment) == ("segmented", "kokoro-v1.0", True)
+
+    def test_fast_uses_loaded_variant(self, policy):
+        with patch.object(tts_module, "_variants", {"fast": _make_mock_model()}):
+            plan = _plan_at(policy, 400)
+        assert (plan.tier, plan.variant) == ("fast", "fast")
+
+    def test_fast_without_variant_keeps_model(self, policy):
+        plan = _plan_at(policy, 400)
+        assert (plan.tier, plan.variant, plan.short_first_segment) == ("fast", "kokoro-v1.0", True)
+
+    def test_explicit_variant_not_degraded(self, policy):
+        with patch.object(tts_module, "_variants", {"fast": _make_mock_model(), "fp32": _make_mock_model()}):
+            plan = _plan_at(policy, 400, model="fp32")
+        assert (plan.tier, plan.variant, plan.short_first_segment) == ("full", "fp32", False)
+        assert policy.tier == "fast"
+
+    def test_disabled(self):
+        policy = DegradationPolicy(thresholds_ms=[100, 300], enabled=False)
+        assert _plan_at(policy, 1000).tier == "full"
+
+    def test_served_counts(self, policy):
+        _plan_at(policy, 0)
+        _plan_at(policy, 150)
+        assert policy.to_dict()["served"] == {"full": 1, "segmented": 1, "fast": 0}
+        assert policy.to_dict()["estimated_wait_ms"] == 150
+
+
+class TestEndpoint:
+    def test_tier_header_and_status(self, client, policy):
+        with patch.object(degradation_module, "degradation", policy), \
+             patch("api.main.degradation", policy), \
+             patch.object(degradation_module, "estimated_wait", return_value=0.15):
+            r = client.post("/v1/audio/speech", json={"input": "Hello there. How are you?"})
+            assert r.status_code == 200
+            assert r.headers["X-Quality-Tier"] == "segmented"
+            status = client.get("/status").json()["degradation"]
+        assert status["tier"] == "segmented"
+        assert status["served"]["segmented"] == 1
+
+    def test_websocket_start_reports_tier(self, client):
+        with client.websocket_connect("/v1/audio/speech/ws") as ws:
+            ws.send_json({"input": "Hello"})
+            start = ws.receive_json()
+        assert start["type"] == "start"
+        assert start["tier"] in ("full", "segmented", "fast")
@@ -0,0 +1,176 @@
+"""
+Tests for api/jobs.py and the /v1/audio/speech/jobs endpoints — background
+execution, disk spooling, progress, cancellation, retention.
+"""
+
+import os
+import struct
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+import api.main as main_module
+import api.tts as tts_module
+from api.jobs import JobManager
+
+DOCUMENT = " ".join(f"This is sentence number {i} of the document." for i in range(8))
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    manager = JobManager(directory=str(tmp_path))
+    with patch.object(main_module, "job_manager", manager):
+        yield manager
+
+
+def _wait(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/v1/audio/speech/jobs/{job_id}").json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+class TestJobEndpoints:
+    def test_submit_poll_download_wav(self, client, jobs, tmp_path):
+        r = client.post("/v1/audio/speech/jobs", json={"input": DOCUMENT})
+        assert r.status_code == 202
+        job = r.json()
+        assert job["total_segments"] == 8
+
+        job = _wait(client, job["id"])
+        assert job["status"] == "completed"
+        assert job["completed_segments"] == 8
+        assert job["progress"] == 1.0
+        assert job["duration"] > 0
+
+        r = client.get(f"/v1/audio/speech/jobs/{job['id']}/audio")
+        assert r.status_code == 200
+        assert r.headers["content-type"] == "audio/wav"
+        assert r.content[:4] == b"RIFF"
+        data_size = struct.unpack("<I", r.content[40:44])[0]
+        assert data_size == len(r.content) - 44
+        assert data_size == round(job["duration"] * 24000) * 2
+
+        # Audio and state live on disk, no partial spool left behind
+        assert sorted(os.listdir(tmp_path)) == [f"{job['id']}.json", f"{job['id']}.wav"]
+
+    def test_pcm_format(self, client, jobs):
+        job = client.post("/v1/audio/speech/jobs", json={"input": DOCUMENT, "response_format": "pcm"}).json()
+        job = _wait(client, job["id"])
+        r = client.get(f"/v1/audio/speech/jobs/{job['id']}/audio")
+        assert r.headers["content-type"] == "audio/pcm"
+        assert len(r.content) == round(job["duration"] * 24000) * 2
+
+    def test_accepts_text_over_request_limit(self, client, jobs):
+        text = "Long sentence here. " * 600  # 12,000 chars
+        r = client.post("/v1/audio/speech/jobs", json={"input": text})
+        assert r.status_code == 202
+        assert _wait(client, r.json()["id"])["status"] == "completed"
+
+    def test_audio_not_ready_conflict(self, client, jobs):
+        release = threading.Event()
+        original = tts_module._model.generate_stream.side_effect
+
+        def blocked(text, **kwargs):
+            release.wait(timeout=5)
+            return original(text, **kwargs)
+
+        tts_module._model.generate_stream.side_effect = blocked
+        job_id = client.post("/v1/audio/speech/jobs", json={"input": DOCUMENT}).json()["id"]
+        r = client.get(f"/v1/audio/speech/jobs/{job_id}/audio")
+        release.set()
+        assert r.status_code == 409
+        assert _wait(client, job_id)["status"] == "completed"
+
+    def test_failure_reported(self, client, jobs):
+        tts_module._model.generate_stream.side_effect = RuntimeError("model crashed")
+        job = client.post("/v1/audio/speech/jobs", json={"input": DOCUMENT}).json()
+        job = _wait(client, job["id"])
+        assert job["status"] == "failed"
+        assert "model crashed" in job["error"]
+        assert client.get(f"/v1/audio/speech/jobs/{job['id']}/audio").status_code == 409
+
+    def test_delete(self, client, jobs, tmp_path):
+        job = _wait(client, client.post("/v1/audio/speech/jobs", json={"input": DOCUMENT}).json()["id"])
+        assert client.delete(f"/v1/audio/speech/jobs/{job['id']}").status_code == 204
+        assert client.get(f"/v1/audio/speech/jobs/{job['id']}").status_code == 404
+        assert os.listdir(tmp_path) == []
+
+    def test_unknown_job(self, client, jobs):
+        assert client.get("/v1/audio/speech/jobs/nope").status_code == 404
+        assert client.get("/v1/audio/speech/jobs/nope/audio").status_code == 404
+        assert client.delete("/v1/audio/speech/jobs/nope").status_code == 404
+
+    def test_wav_too_long_rejected(self, client, jobs):
+        with patch("api.jobs._WAV_MAX_SAMPLES", 24000):
+            r = client.post("/v1/audio/speech/jobs", json={"input": DOCUMENT})
+        assert r.status_code == 400
+        assert "pcm" in r.json()["detail"]
+
+    def test_wav_cap_fails_job(self, client, jobs):
+        with patch("api.jobs._WAV_MAX_SAMPLES", 50000), patch("api.jobs._WAV_CHARS_PER_SECOND", 1e6):
+            job = _wait(client, client.post("/v1/audio/speech/jobs", json={"input": DOCUMENT}).json()["id"])
+        assert job["status"] == "failed"
+        assert "pcm" in job["error"]
+
+    def test_model_not_ready(self, client_no_model, jobs):
+        assert client_no_model.post("/v1/audio/speech/jobs", json={"input": "hi"}).status_code == 503
+
+
+class TestJobManager:
+    def test_prune_expired(self, client, tmp_path):
+        manager = JobManager(directory=str(tmp_path), retention_s=0)
+        with patch.object(main_module, "job_manager", manager):
+            job_id = client.post("/v1/audio/speech/jobs", json={"input": "Short one."}).json()["id"]
+            _wait(client, job_id)
+            manager.prune()
+            assert manager.get(job_id) is None
+            assert os.listdir(tmp_path) == []
+
+    def test_visible_to_other_workers(self, client, jobs, tmp_path):
+        job_id = client.post("/v1/audio/speech/jobs", json={"input": DOCUMENT}).json()["id"]
+        _wait(client, job_id)
+        other = JobManager(directory=str(tmp_path))
+        job = other.get(job_id)
+        assert job.status == "completed"
+        assert job.completed_segments == 8
+        assert os.path.exists(job.path)
+        assert other.delete(job_id)
+        assert client.get(f"/v1/audio/speech/jobs/{job_id}").status_code == 404
+
+    def test_deleted_by_other_worker_stops(self, client, jobs, tmp_path):
+        release = threading.Event()
+        original = tts_module._model.generate_stream.side_effect
+
+        def blocked(text, **kwargs):
+            release.wait(timeout=5)
+            return original(text, **kwargs)
+
+        tts_module._model.generate_stream.side_effect = blocked
+        job_id = client.post("/v1/audio/speech/jobs", json={"input": DOCUMENT}).json()["id"]
+        assert JobManager(directory=str(tmp_path)).delete(job_id)
+        release.set()
+        deadline = time.monotonic() + 5
+        while jobs._tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not jobs._tasks
+        assert os.listdir(tmp_path) == []
+
+    def test_orphaned_job_reported_failed(self, tmp_path):
+        manager = JobManager(directory=str(tmp_path))
+        job_id = "0" * 32
+        with open(tmp_path / f"{job_id}.json", "w") as f:
+            f.write('{"id": "%s", "voice": "af_heart", "speed": 1.0, "response_format": "wav", '
+                    '"trim_silence": false, "normalize_loudness": false, "total_segments": 3, '
+                    '"status": "running", "owner_pid": 999999999, "created_at": 0}' % job_id)
+        job = manager.get(job_id)
+        assert job.status == "failed"
+        assert "exited" in job.error
+
+    def test_rejects_malformed_ids(self, tmp_path):
+        assert JobManager(directory=str(tmp_path)).get("../secrets") is None
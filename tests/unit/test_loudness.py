@@ -0,0 +1,112 @@
+"""
+Tests for api/loudness.py — BS.1770 measurement, streaming normalization and
+the lookahead true-peak limiter against the contract target
+(LUFS -16 ±1 LU, dBTP <= -1.0).
+"""
+
+import numpy as np
+import pytest
+
+from api.config import LOUDNESS_TARGET_LUFS, SAMPLE_RATE, TRUE_PEAK_CEILING_DB
+from api.loudness import (
+    LoudnessNormalizer,
+    integrated_loudness,
+    normalize_loudness,
+    true_peak_db,
+)
+
+
+def _sine(freq, seconds, amplitude, sample_rate=SAMPLE_RATE):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _speech_like(seconds=6.0, amplitude=0.02, seed=0):
+    """Amplitude-modulated noise — bursty like speech, with quiet gaps."""
+    rng = np.random.default_rng(seed)
+    n = int(SAMPLE_RATE * seconds)
+    envelope = 1 + np.sin(2 * np.pi * 3 * np.arange(n) / SAMPLE_RATE)
+    return (rng.standard_normal(n) * amplitude * envelope).astype(np.float32)
+
+
+def _run_stream(normalizer, audio, num_segments):
+    outputs = [normalizer.process(seg) for seg in np.array_split(audio, num_segments)]
+    outputs.append(normalizer.flush())
+    return np.concatenate(outputs)
+
+
+class TestMeasurement:
+    def test_full_scale_sine_reference(self):
+        """BS.1770 reference: a 0 dBFS 997 Hz sine reads about -3.01 LUFS."""
+        assert integrated_loudness(_sine(997, 5.0, 1.0)) == pytest.approx(-3.01, abs=0.1)
+
+    def test_six_db_quieter(self):
+        loud = integrated_loudness(_sine(997, 5.0, 1.0))
+        quiet = integrated_loudness(_sine(997, 5.0, 0.5))
+        assert loud - quiet == pytest.approx(6.02, abs=0.05)
+
+    def test_silence_is_negative_infinity(self):
+        assert integrated_loudness(np.zeros(SAMPLE_RATE, dtype=np.float32)) == float("-inf")
+
+    def test_short_audio_measured(self):
+        """Audio shorter than one 400ms block still gets a reading."""
+        assert np.isfinite(integrated_loudness(_sine(997, 0.2, 0.5)))
+
+    def test_true_peak_full_scale(self):
+        assert true_peak_db(_sine(997, 1.0, 1.0)) == pytest.approx(0.0, abs=0.1)
+
+    def test_true_peak_empty(self):
+        assert true_peak_db(np.array([], dtype=np.float32)) == float("-inf")
+
+
+class TestLoudnessNormalizer:
+    def test_quiet_stream_reaches_target(self):
+        out = _run_stream(LoudnessNormalizer(), _speech_like(), num_segments=4)
+        assert integrated_loudness(out) == pytest.approx(LOUDNESS_TARGET_LUFS, abs=1.0)
+
+    def test_loud_stream_reaches_target(self):
+        out = _run_stream(LoudnessNormalizer(), _speech_like(amplitude=0.3), num_segments=3)
+        assert integrated_loudness(out) == pytest.approx(LOUDNESS_TARGET_LUFS, abs=1.0)
+
+    def test_true_peak_ceiling_enforced(self):
+        audio = _speech_like()
+        audio[1000:1010] = 0.9  # transient far above the speech level
+        out = _run_stream(LoudnessNormalizer(), audio, num_segments=4)
+        assert true_peak_db(out) <= TRUE_PEAK_CEILING_DB
+
+    def test_sample_count_preserved(self):
+        audio = _speech_like(seconds=2.3)
+        out = _run_stream(LoudnessNormalizer(), audio, num_segments=5)
+        assert len(out) == len(audio)
+        assert out.dtype == np.float32
+
+    def test_holds_back_lookahead(self):
+        normalizer = LoudnessNormalizer(lookahead_ms=10)
+        head = normalizer.process(_speech_like(seconds=1.0))
+        assert len(head) == SAMPLE_RATE - int(SAMPLE_RATE * 0.010)
+        assert len(normalizer.flush()) == int(SAMPLE_RATE * 0.010)
+
+    def test_latency_reported(self):
+        assert LoudnessNormalizer(lookahead_ms=10).latency_ms == pytest.approx(10.0)
+
+    def test_silence_passes_through(self):
+        silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        out = _run_stream(LoudnessNormalizer(), silence, num_segments=2)
+        assert np.all(out == 0)
+
+    def test_gain_capped(self):
+        normalizer = LoudnessNormalizer(max_gain_db=20.0)
+        normalizer.process(_speech_like(amplitude=0.001))
+        assert normalizer.gain_db == pytest.approx(20.0)
+
+    def test_empty_segment(self):
+        assert len(LoudnessNormalizer().process(np.array([], dtype=np.float32))) == 0
+
+
+class TestNormalizeLoudness:
+    def test_whole_clip(self):
+        audio = _speech_like(amplitude=0.2)
+        out = normalize_loudness(audio)
+        assert len(out) == len(audio)
+        assert integrated_loudness(out) == pytest.approx(LOUDNESS_TARGET_LUFS, abs=1.0)
+        assert true_peak_db(out) <= TRUE_PEAK_CEILING_DB
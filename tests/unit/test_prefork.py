@@ -0,0 +1,81 @@
+"""
+Tests for multi-worker deployment — gunicorn hooks, pre-fork preparation,
+fork safety of the app import, and per-process memory reporting.
+"""
+
+import os
+import runpy
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+import api.prefork as prefork
+from api.memory import memory_usage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def gunicorn_conf():
+    return runpy.run_path(os.path.join(ROOT, "gunicorn.conf.py"))
+
+
+class TestGunicornConfig:
+    def test_preloads_app(self, gunicorn_conf):
+        assert gunicorn_conf["preload_app"] is True
+        assert gunicorn_conf["workers"] >= 1
+
+    def test_post_fork_only_logs(self, gunicorn_conf):
+        worker = MagicMock(pid=1234)
+        gunicorn_conf["post_fork"](MagicMock(), worker)
+        worker.log.info.assert_called_once()
+
+    def test_on_starting_prepares_artifacts(self, gunicorn_conf):
+        with patch.object(prefork, "prepare_in_subprocess") as prepare:
+            gunicorn_conf["on_starting"](MagicMock())
+        prepare.assert_called_once()
+
+    def test_on_starting_can_be_disabled(self, gunicorn_conf):
+        with patch.object(prefork, "prepare_in_subprocess") as prepare, \
+             patch.dict(os.environ, {"KOKORO_PREFORK_PREPARE": "false"}):
+            gunicorn_conf["on_starting"](MagicMock())
+        prepare.assert_not_called()
+
+
+class TestForkSafety:
+    def test_app_import_starts_no_threads_or_mlx(self):
+        code = (
+            "import sys, threading, api.main; "
+            "print(threading.active_count(), 'mlx.core' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+        assert result.stdout.split() == ["1", "False"]
+
+
+class TestPrepareInSubprocess:
+    def test_success(self):
+        with patch("subprocess.run") as run:
+            assert prefork.prepare_in_subprocess() is True
+        assert run.call_args[0][0][1:] == ["-m", "api.prefork"]
+
+    def test_failure_is_not_fatal(self):
+        with patch("subprocess.run", side_effect=subprocess.CalledProcessError(1, "prefork")):
+            assert prefork.prepare_in_subprocess() is False
+
+
+class TestMemoryUsage:
+    def test_fields(self):
+        usage = memory_usage()
+        assert usage["pid"] == os.getpid()
+        assert usage["rss_bytes"] > 0
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"), reason="Linux only")
+    def test_unique_and_shared_split_rss(self):
+        usage = memory_usage()
+        assert usage["unique_bytes"] > 0
+        assert abs(usage["unique_bytes"] + usage["shared_bytes"] - usage["rss_bytes"]) < usage["rss_bytes"] * 0.05
+
+    def test_status_reports_memory(self, client):
+        assert client.get("/status").json()["memory"]["pid"] == os.getpid()
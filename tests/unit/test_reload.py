@@ -0,0 +1,207 @@
+"""
+Tests for zero-downtime model reload — switch, draining in-flight streams,
+failure handling, the /admin/reload endpoint and cache key separation.
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, patch
+
+import api.main as main_module
+import api.tts as tts_module
+from api.cache import content_key
+from api.tts import generate_audio, get_model, get_model_info, reload_model
+from tests.conftest import _make_mock_model
+
+
+@pytest.fixture
+def active():
+    """A ready mock model that only the tts module references."""
+    with patch.object(tts_module, '_model', None), \
+         patch.object(tts_module, '_model_ready', True), \
+         patch.object(tts_module, '_voice_registry', None), \
+         patch.object(tts_module, '_model_info', {"id": "old", "hash": "aaaa", "loaded_at": 0.0}), \
+         patch.object(tts_module, '_reload_state', {"state": "idle"}):
+        tts_module._model = _make_mock_model()
+        yield
+
+
+def _replacement(hash_value="bbbb"):
+    model = _make_mock_model()
+    return patch.object(tts_module, '_build_model', return_value=(model, None)), \
+        patch.object(tts_module, '_model_hash', return_value=hash_value), model
+
+
+class TestReloadModel:
+    def test_switches_and_releases_previous(self, active):
+        build, model_hash, new = _replacement()
+        with build, model_hash:
+            state = reload_model("new-model", drain_timeout=5)
+        assert state["state"] == "completed"
+        assert state["previous_released"] is True
+        assert state["duration_s"] >= 0
+        assert get_model() is new
+        assert new.generate.called  # Warmed before the switch
+        info = get_model_info()
+        assert (info["id"], info["hash"]) == ("new-model", "bbbb")
+
+    def test_closes_previous_voice_registry(self, active):
+        previous = MagicMock()
+        build, model_hash, _ = _replacement()
+        with build, model_hash, patch.object(tts_module, '_voice_registry', previous):
+            reload_model("new-model", drain_timeout=1)
+        previous.close.assert_called_once()
+
+    def test_defaults_to_active_model_id(self, active):
+        build, model_hash, _ = _replacement()
+        with build as builder, model_hash:
+            reload_model(drain_timeout=1)
+        builder.assert_called_once_with("old")
+
+    def test_failure_keeps_current_model(self, active):
+        current = get_model()
+        with patch.object(tts_module, '_build_model', side_effect=OSError("missing weights")):
+            state = reload_model("broken", drain_timeout=1)
+        assert state["state"] == "failed"
+        assert state["error"] == "missing weights"
+        assert get_model() is current
+        assert get_model_info()["id"] == "old"
+
+    def test_concurrent_reload_rejected(self, active):
+        tts_module._reload_state["state"] = "loading"
+        with pytest.raises(RuntimeError, match="already in progress"):
+            reload_model("other")
+
+    def test_in_flight_stream_drains_on_previous_model(self, active):
+        old = get_model()
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_stream(text, voice="af_heart", speed=1.0, **kwargs):
+            started.set()
+            release.wait(5)
+            yield np.zeros(2400, dtype=np.float32)
+
+        old.generate_stream.side_effect = slow_stream
+        del old
+        chunks = []
+
+        async def consume():
+            async for chunk, _ in tts_module.generate_audio_stream("Hello"):
+                chunks.append(chunk)
+
+        stream = threading.Thread(target=asyncio.run, args=(consume(),))
+        stream.start()
+        assert started.wait(5)
+
+        build, model_hash, new = _replacement()
+        with build, model_hash:
+            reloading = threading.Thread(target=reload_model, args=("new-model",), kwargs={"drain_timeout": 10})
+            # Loading is queued behind the blocked stream on the single worker
+            reloading.start()
+            deadline = time.monotonic() + 5
+            while tts_module.get_queue_state()["depth"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert tts_module._reload_state["state"] == "loading"
+            release.set()
+            reloading.join(10)
+            stream.join(10)
+
+        assert len(chunks) == 1
+        assert tts_module._reload_state["state"] == "completed"
+        assert tts_module._reload_state["previous_released"] is True
+        audio, _, _ = generate_audio("Hello")
+        assert new.generate_stream.called
+        assert len(audio) > 0
+
+
+    def _hold_previous(self):
+        key = id(get_model())
+        with tts_module._in_flight_changed:
+            tts_module._in_flight[key] += 1
+
+        def release():
+            with tts_module._in_flight_changed:
+                tts_module._in_flight.pop(key, None)
+                tts_module._in_flight_changed.notify_all()
+        return release
+
+    def test_waits_for_work_queued_on_previous_model(self, active):
+        release = self._hold_previous()
+        threading.Timer(0.2, release).start()
+        build, model_hash, _ = _replacement()
+        with build, model_hash:
+            state = reload_model("new-model", drain_timeout=5)
+        assert state["previous_released"] is True
+        assert state["drain_s"] >= 0.15
+
+    def test_drain_timeout(self, active):
+        release = self._hold_previous()
+        build, model_hash, _ = _replacement()
+        try:
+            with build, model_hash:
+                state = reload_model("new-model", drain_timeout=0.05)
+        finally:
+            release()
+        assert state["state"] == "completed"
+        assert state["previous_released"] is False
+
+
+class TestCacheKeys:
+    def test_key_changes_with_model_hash(self, active):
+        before = content_key("Hello", "af_heart", 1.0, "wav")
+        with patch.object(tts_module, '_model_info', {"id": "old", "hash": "cccc", "loaded_at": 0.0}):
+            assert content_key("Hello", "af_heart", 1.0, "wav") != before
+
+
+ADMIN = {"Authorization": "Bearer secret"}
+
+
+@pytest.fixture
+def admin():
+    with patch.object(main_module, 'ADMIN_TOKEN', "secret"), \
+         patch.object(main_module, 'RELOAD_MODELS', ["old", "new-model"]):
+        yield
+
+
+class TestReloadEndpoint:
+    def test_reload_and_status(self, client, admin):
+        build, model_hash, new = _replacement("dddd")
+        with build, model_hash, \
+             patch.object(tts_module, '_reload_state', {"state": "idle"}), \
+             patch.object(tts_module, '_model_info', {"id": "old", "hash": None, "loaded_at": 0.0}), \
+             patch.object(tts_module, 'RELOAD_DRAIN_TIMEOUT_S', 0.1):
+            r = client.post("/admin/reload", json={"model": "new-model"}, headers=ADMIN)
+            assert r.status_code == 202
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                model = client.get("/status").json()["model"]
+                if model["reload"]["state"] not in ("loading", "warming_up", "draining"):
+                    break
+                time.sleep(0.02)
+        assert model["reload"]["state"] == "completed"
+        assert model["id"] == "new-model"
+        assert model["hash"] == "dddd"
+        assert model["reload"]["duration_s"] is not None
+
+    def test_reload_in_progress_conflict(self, client, admin):
+        with patch.object(tts_module, '_reload_state', {"state": "draining"}):
+            r = client.post("/admin/reload", json={}, headers=ADMIN)
+        assert r.status_code == 409
+
+    def test_requires_token(self, client, admin):
+        assert client.post("/admin/reload", json={}).status_code == 401
+        r = client.post("/admin/reload", json={}, headers={"Authorization": "Bearer wrong"})
+        assert r.status_code == 401
+
+    def test_local_only_without_token(self, client):
+        with patch.object(main_module, 'ADMIN_TOKEN', ""):
+            assert client.post("/admin/reload", json={}).status_code == 403  # TestClient is not loopback
+
+    def test_rejects_unconfigured_model(self, client, admin):
+        r = client.post("/admin/reload", json={"model": "https://example.com/evil"}, headers=ADMIN)
+        assert r.status_code == 400
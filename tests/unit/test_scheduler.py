@@ -0,0 +1,179 @@
+"""
+Tests for api/scheduler.py — priority ordering, worker naming, shutdown,
+service time and wait estimates, deadlines.
+"""
+
+import threading
+import time
+
+import pytest
+
+from api.scheduler import DeadlineExceeded, Priority, PriorityExecutor, deadline_after, deadline_passed
+
+
+def _blocked_executor():
+    """Executor whose only worker is held until the returned event is set."""
+    executor = PriorityExecutor(max_workers=1, thread_name_prefix="test")
+    release = threading.Event()
+    executor.submit(release.wait)
+    return executor, release
+
+
+class TestPriorityExecutor:
+    def test_returns_result(self):
+        executor = PriorityExecutor()
+        assert executor.submit(lambda x, y: x + y, 2, y=3).result(timeout=5) == 5
+        executor.shutdown()
+
+    def test_propagates_exception(self):
+        executor = PriorityExecutor()
+
+        def _fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            executor.submit(_fail).result(timeout=5)
+        executor.shutdown()
+
+    def test_interactive_runs_before_batch(self):
+        executor, release = _blocked_executor()
+        order = []
+        futures = [
+            executor.submit(order.append, "batch-1", priority=Priority.BATCH),
+            executor.submit(order.append, "batch-2", priority=Priority.BATCH),
+            executor.submit(order.append, "interactive", priority=Priority.INTERACTIVE),
+        ]
+        assert executor.queue_depth == 3
+        release.set()
+        for f in futures:
+            f.result(timeout=5)
+        assert order == ["interactive", "batch-1", "batch-2"]
+        executor.shutdown()
+
+    def test_thread_name_prefix(self):
+        executor = PriorityExecutor(thread_name_prefix="mlx")
+        name = executor.submit(lambda: threading.current_thread().name).result(timeout=5)
+        assert name.startswith("mlx")
+        executor.shutdown()
+
+    def test_cancelled_work_is_skipped(self):
+        executor, release = _blocked_executor()
+        ran = []
+        future = executor.submit(ran.append, 1)
+        assert future.cancel()
+        release.set()
+        executor.shutdown()
+        assert ran == []
+
+    def test_shutdown_drains_queue(self):
+        executor, release = _blocked_executor()
+        futures = [executor.submit(lambda i=i: i, priority=Priority.BATCH) for i in range(3)]
+        release.set()
+        executor.shutdown(wait=True)
+        assert [f.result(timeout=0) for f in futures] == [0, 1, 2]
+
+    def test_submit_after_shutdown_raises(self):
+        executor = PriorityExecutor()
+        executor.shutdown()
+        with pytest.raises(RuntimeError):
+            executor.submit(lambda: None)
+
+
+class TestWaitEstimate:
+    def test_zero_before_first_work(self):
+        executor = PriorityExecutor()
+        assert executor.service_time is None
+        assert executor.estimated_wait() == 0.0
+
+    def test_service_time_recorded(self):
+        executor = PriorityExecutor()
+        executor.submit(time.sleep, 0.05).result(timeout=5)
+        assert executor.service_time >= 0.05
+        executor.shutdown()
+
+    def test_counts_work_ahead_by_priority(self):
+        executor = PriorityExecutor()
+        executor.submit(lambda: None).result(timeout=5)
+        executor._service_s = 0.1
+        release = threading.Event()
+        executor.submit(release.wait)
+        deadline = time.monotonic() + 5
+        while executor._running == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for _ in range(2):
+            executor.submit(lambda: None, priority=Priority.INTERACTIVE)
+        for _ in range(3):
+            executor.submit(lambda: None, priority=Priority.BATCH)
+        # Running work counts as half an item; batch work queues behind interactive
+        assert executor.estimated_wait(Priority.INTERACTIVE) == pytest.approx(0.25)
+        assert executor.estimated_wait(Priority.BATCH) == pytest.approx(0.55)
+        release.set()
+        executor.shutdown()
+        assert executor.estimated_wait(Priority.BATCH) == pytest.approx(0.0)
+
+    def test_service_time_is_per_unit_of_cost(self):
+        executor = PriorityExecutor()
+        executor.submit(time.sleep, 0.05, cost=10).result(timeout=5)
+        assert 0.005 <= executor.service_time < 0.05
+        executor.shutdown()
+
+    def test_larger_queued_work_weighs_more(self):
+        executor = PriorityExecutor()
+        release = threading.Event()
+        executor.submit(release.wait, cost=None)
+        executor._service_s = 0.001
+        executor.submit(lambda: None, cost=100)
+        small = executor.estimated_wait()
+        executor.submit(lambda: None, cost=1000)
+        assert small == pytest.approx(0.1)
+        assert executor.estimated_wait() == pytest.approx(1.1)
+        release.set()
+        executor.shutdown()
+
+    def test_maintenance_work_does_not_move_estimate(self):
+        executor = PriorityExecutor()
+        executor.submit(lambda: None).result(timeout=5)
+        executor._service_s = 0.01
+        build = executor.submit(time.sleep, 0.1, priority=Priority.BATCH, cost=None)
+        assert executor.estimated_wait(Priority.BATCH) == 0.0
+        build.result(timeout=5)
+        executor.shutdown()
+        assert executor.service_time == 0.01
+
+
+class TestDeadlines:
+    def test_expired_queued_work_dropped(self):
+        executor, release = _blocked_executor()
+        ran = []
+        future = executor.submit(ran.append, 1, deadline=time.monotonic() + 0.01)
+        time.sleep(0.02)
+        release.set()
+        with pytest.raises(DeadlineExceeded):
+            future.result(timeout=5)
+        executor.shutdown()
+        assert ran == []
+        assert executor.expired == {"queued": 1, "running": 0}
+
+    def test_work_within_deadline_runs(self):
+        executor = PriorityExecutor()
+        assert executor.submit(lambda: 1, deadline=deadline_after(5000)).result(timeout=5) == 1
+        executor.shutdown()
+        assert executor.expired == {"queued": 0, "running": 0}
+
+    def test_work_stopped_by_deadline_counted_without_service_time(self):
+        executor = PriorityExecutor()
+
+        def _stop():
+            raise DeadlineExceeded("late")
+
+        with pytest.raises(DeadlineExceeded):
+            executor.submit(_stop).result(timeout=5)
+        executor.shutdown()
+        assert executor.expired == {"queued": 0, "running": 1}
+        assert executor.service_time is None
+
+    def test_deadline_helpers(self):
+        assert deadline_after(None) is None
+        assert not deadline_passed(None)
+        assert not deadline_passed(deadline_after(5000))
+        assert deadline_passed(time.monotonic() - 1)
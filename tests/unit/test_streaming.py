@@ -12,13 +12,16 @@ import numpy as np
 import pytest
 
 from api.streaming import (
+    SilenceTrimmer,
     audio_to_pcm_bytes,
     create_wav_header,
     get_audio_duration,
     stream_audio_chunks,
     stream_audio_chunks_live,
+    trim_silence,
 )
 from api.config import CHUNK_SIZE_SAMPLES, SAMPLE_RATE
+from api.loudness import LoudnessNormalizer
 
 
 # --- audio_to_pcm_bytes ---
@@ -231,6 +234,80 @@ class TestStreamAudioChunks:
         assert streamed == direct
 
 
+# --- SilenceTrimmer ---
+
+def _tone(seconds, amplitude=0.5):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(SAMPLE_RATE * seconds), dtype=np.float32)
+
+
+def _run_trimmer(trimmer, segments):
+    out = [trimmer.process(seg) for seg in segments]
+    out.append(trimmer.flush())
+    return np.concatenate(out)
+
+
+class TestSilenceTrimmer:
+    def test_leading_silence_trimmed_to_pad(self):
+        trimmer = SilenceTrimmer(pad_ms=10, crossfade_ms=0)
+        segment = np.concatenate([_silence(0.5), _tone(0.5)])
+        out = _run_trimmer(trimmer, [segment])
+        assert len(out) == pytest.approx(len(segment) - int(SAMPLE_RATE * 0.49), abs=2)
+        assert trimmer.leading_trimmed_ms == pytest.approx(490, abs=1)
+
+    def test_speech_starts_immediately(self):
+        trimmer = SilenceTrimmer(pad_ms=0, crossfade_ms=0)
+        first = trimmer.process(np.concatenate([_silence(0.3), _tone(0.5)]))
+        assert np.abs(first[:48]).max() > 0.01
+
+    def test_join_gap_capped(self):
+        trimmer = SilenceTrimmer(max_gap_ms=200, crossfade_ms=0)
+        seg1 = np.concatenate([_tone(0.5), _silence(0.4)])
+        seg2 = np.concatenate([_silence(0.4), _tone(0.5)])
+        out = _run_trimmer(trimmer, [seg1, seg2])
+        # 800ms of silence at the join is cut to 200ms
+        assert len(out) == pytest.approx(len(seg1) + len(seg2) - int(SAMPLE_RATE * 0.6), abs=2)
+        assert trimmer.trimmed_ms == pytest.approx(600, abs=1)
+
+    def test_short_gap_preserved(self):
+        trimmer = SilenceTrimmer(max_gap_ms=300, crossfade_ms=0)
+        seg1 = np.concatenate([_tone(0.5), _silence(0.1)])
+        seg2 = np.concatenate([_silence(0.1), _tone(0.5)])
+        out = _run_trimmer(trimmer, [seg1, seg2])
+        assert len(out) == len(seg1) + len(seg2)
+        assert trimmer.trimmed_ms == 0
+
+    def test_crossfade_overlaps_join(self):
+        trimmer = SilenceTrimmer(crossfade_ms=5)
+        out = _run_trimmer(trimmer, [_tone(0.5), _tone(0.5)])
+        assert len(out) == 2 * int(SAMPLE_RATE * 0.5) - int(SAMPLE_RATE * 0.005)
+
+    def test_crossfade_is_equal_power(self):
+        """Equal-power fade keeps a constant-level signal from dipping at the join."""
+        trimmer = SilenceTrimmer(crossfade_ms=5, threshold_db=-90)
+        dc = np.full(2400, 0.5, dtype=np.float32)
+        out = _run_trimmer(trimmer, [dc, dc])
+        assert out.min() >= 0.5 - 1e-6
+
+    def test_all_silent_segment(self):
+        trimmer = SilenceTrimmer(pad_ms=10, crossfade_ms=0)
+        out = _run_trimmer(trimmer, [_silence(0.2)])
+        assert len(out) == int(SAMPLE_RATE * 0.01)
+
+    def test_empty_segment(self):
+        assert len(SilenceTrimmer().process(np.array([], dtype=np.float32))) == 0
+
+    def test_trim_silence_whole_clip(self):
+        audio = np.concatenate([_silence(0.25), _tone(0.5)])
+        trimmed, trimmed_ms = trim_silence(audio)
+        assert trimmed_ms == pytest.approx(240, abs=1)
+        assert len(trimmed) == pytest.approx(len(audio) - int(SAMPLE_RATE * 0.24), abs=2)
+
+
 # --- get_audio_duration ---
 
 class TestGetAudioDuration:
@@ -248,7 +325,7 @@ class TestGetAudioDuration:
 # --- stream_audio_chunks_live ---
 
 class TestStreamAudioChunksLive:
-    def _collect_live(self, audio_segments):
+    def _collect_live(self, audio_segments, **kwargs):
         """Collect chunks from live streaming with a list of (audio, sr) tuples."""
         async def _gather():
             async def fake_stream():
@@ -256,7 +333,7 @@ class TestStreamAudioChunksLive:
                     yield segment, sr
 
             chunks = []
-            async for chunk in stream_audio_chunks_live(fake_stream()):
+            async for chunk in stream_audio_chunks_live(fake_stream(), **kwargs):
                 chunks.append(chunk)
             return chunks
         return asyncio.run(_gather())
@@ -310,3 +387,28 @@ class TestStreamAudioChunksLive:
         streamed = b''.join(chunks)
         direct = audio_to_pcm_bytes(full)
         assert streamed == direct
+
+    def test_normalizer_preserves_length(self, sample_audio):
+        """Normalized stream emits every sample, including the held-back tail."""
+        half = len(sample_audio) // 2
+        segments = [(sample_audio[:half] * 0.1, 24000), (sample_audio[half:] * 0.1, 24000)]
+        chunks = self._collect_live(segments, normalizer=LoudnessNormalizer())
+        assert sum(len(c) for c in chunks) == len(sample_audio) * 2
+
+    def test_normalizer_changes_level(self, sample_audio):
+        quiet = sample_audio * 0.05
+        plain = b''.join(self._collect_live([(quiet, 24000)]))
+        normalized = b''.join(self._collect_live([(quiet, 24000)], normalizer=LoudnessNormalizer()))
+        plain_peak = np.abs(np.frombuffer(plain, dtype=np.int16)).max()
+        normalized_peak = np.abs(np.frombuffer(normalized, dtype=np.int16)).max()
+        assert normalized_peak > plain_peak
+
+    def test_trimmer_removes_leading_silence(self):
+        segments = [
+            (np.concatenate([_silence(0.5), _tone(0.5)]), 24000),
+            (_tone(0.5), 24000),
+        ]
+        chunks = self._collect_live(segments, trimmer=SilenceTrimmer(pad_ms=0, crossfade_ms=0))
+        pcm = np.frombuffer(b''.join(chunks), dtype=np.int16)
+        assert len(pcm) == pytest.approx(SAMPLE_RATE, abs=2)
+        assert np.abs(pcm[:48]).max() > 100
@@ -0,0 +1,56 @@
+"""
+Tests for api/stretch.py — output length, pitch preservation, timing.
+"""
+
+import numpy as np
+import pytest
+
+from api.stretch import time_stretch
+
+SR = 24000
+
+
+def _dominant_frequency(audio):
+    spectrum = np.abs(np.fft.rfft(audio * np.hanning(len(audio))))
+    return np.argmax(spectrum) * SR / len(audio)
+
+
+@pytest.fixture
+def tone():
+    t = np.arange(SR * 3) / SR
+    return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+@pytest.mark.parametrize("quality", ["fast", "high"])
+class TestTimeStretch:
+    @pytest.mark.parametrize("rate", [0.75, 1.25, 1.5, 2.0])
+    def test_length(self, tone, quality, rate):
+        out = time_stretch(tone, rate, quality)
+        assert len(out) == round(len(tone) / rate)
+        assert out.dtype == np.float32
+
+    @pytest.mark.parametrize("rate", [0.8, 1.5])
+    def test_preserves_pitch(self, tone, quality, rate):
+        out = time_stretch(tone, rate, quality)
+        middle = out[len(out) // 4:len(out) // 4 + SR // 2]
+        assert _dominant_frequency(middle) == pytest.approx(220, abs=3)
+
+    def test_preserves_level(self, tone, quality):
+        out = time_stretch(tone, 1.25, quality)
+        middle = out[len(out) // 4:3 * len(out) // 4]
+        assert np.sqrt(np.mean(middle ** 2)) == pytest.approx(0.5 / np.sqrt(2), rel=0.05)
+
+    @pytest.mark.parametrize("rate", [0.8, 1.5])
+    def test_events_move_to_scaled_time(self, quality, rate):
+        audio = np.zeros(SR * 4, dtype=np.float32)
+        t = np.arange(SR // 10) / SR
+        audio[2 * SR:2 * SR + len(t)] = 0.5 * np.sin(2 * np.pi * 300 * t)
+        out = time_stretch(audio, rate, quality)
+        onset = np.argmax(np.abs(out) > 0.05) / SR
+        assert onset == pytest.approx(2 / rate, abs=0.01)
+
+    def test_unit_rate_is_identity(self, tone, quality):
+        assert np.array_equal(time_stretch(tone, 1.0, quality), tone)
+
+    def test_empty(self, quality):
+        assert len(time_stretch(np.array([], dtype=np.float32), 1.5, quality)) == 0
@@ -0,0 +1,66 @@
+"""
+Tests for api/text.py — sentence boundary detection on incrementally
+arriving text (LLM token streams).
+"""
+
+from api.text import SentenceBuffer, split_sentences
+
+
+class TestSentenceBuffer:
+    def test_releases_on_boundary(self):
+        buffer = SentenceBuffer()
+        assert buffer.feed("Hello there") == []
+        assert buffer.feed(".") == []  # boundary needs trailing whitespace
+        assert buffer.feed(" How are you") == ["Hello there."]
+        assert buffer.pending == "How are you"
+
+    def test_flush_releases_remainder(self):
+        buffer = SentenceBuffer()
+        buffer.feed("First. Second without end")
+        assert buffer.flush() == ["Second without end"]
+        assert buffer.flush() == []
+
+    def test_multiple_sentences_in_one_delta(self):
+        buffer = SentenceBuffer()
+        assert buffer.feed("One. Two! Three? Four") == ["One.", "Two!", "Three?"]
+
+    def test_decimal_not_split(self):
+        buffer = SentenceBuffer()
+        assert buffer.feed("Pi is 3") == []
+        assert buffer.feed(".14 roughly. Next") == ["Pi is 3.14 roughly."]
+
+    def test_abbreviation_not_split(self):
+        buffer = SentenceBuffer()
+        assert buffer.feed("Dr. Smith met Mr. Jones. Then") == ["Dr. Smith met Mr. Jones."]
+
+    def test_closing_quote_kept(self):
+        assert split_sentences('She said "stop." Then left.') == ['She said "stop."', "Then left."]
+
+    def test_newline_is_boundary(self):
+        assert split_sentences("Heading\n\nBody text") == ["Heading", "Body text"]
+
+    def test_run_on_text_force_split_at_clause(self):
+        buffer = SentenceBuffer(max_chars=40)
+        released = buffer.feed("this keeps going, and going, and going without any end")
+        assert released
+        assert all(len(s) <= 40 for s in released)
+        assert released[0].endswith(",")
+
+    def test_run_on_without_clauses_split_at_word(self):
+        buffer = SentenceBuffer(max_chars=20)
+        released = buffer.feed("word " * 10)
+        assert all(len(s) <= 20 for s in released)
+        assert all(not s.endswith("wor") for s in released)
+
+    def test_whitespace_only(self):
+        buffer = SentenceBuffer()
+        assert buffer.feed("   ") == []
+        assert buffer.flush() == []
+
+
+class TestSplitSentences:
+    def test_complete_text(self):
+        assert split_sentences("One. Two.") == ["One.", "Two."]
+
+    def test_empty(self):
+        assert split_sentences("") == []
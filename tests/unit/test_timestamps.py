@@ -0,0 +1,86 @@
+"""
+Tests for api/timestamps.py — word timing estimates within a sentence's
+synthesized audio and per-sentence tagging of the audio stream.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from api.config import SAMPLE_RATE
+from api.timestamps import (
+    WordTiming,
+    estimate_word_timings,
+    sentence_stream,
+    timed_synthesis,
+)
+
+
+def _voiced(seconds, lead=0.0, trail=0.0):
+    """Constant tone padded with leading/trailing silence."""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    tone = (0.5 * np.sin(2 * np.pi * 220 * t + 0.5)).astype(np.float32)
+    return np.concatenate([
+        np.zeros(int(SAMPLE_RATE * lead), dtype=np.float32),
+        tone,
+        np.zeros(int(SAMPLE_RATE * trail), dtype=np.float32),
+    ])
+
+
+class TestEstimateWordTimings:
+    def test_one_timing_per_word(self):
+        timings = estimate_word_timings("Hello there world", _voiced(1.0))
+        assert [t.word for t in timings] == ["Hello", "there", "world"]
+
+    def test_monotonic_and_non_overlapping(self):
+        timings = estimate_word_timings("One, two three. Four five!", _voiced(2.0))
+        for t in timings:
+            assert t.end > t.start
+        for a, b in zip(timings, timings[1:]):
+            assert b.start >= a.end
+
+    def test_spans_voiced_region_only(self):
+        timings = estimate_word_timings("Hello world", _voiced(1.0, lead=0.3, trail=0.2))
+        assert timings[0].start == pytest.approx(0.3, abs=0.001)
+        assert timings[-1].end == pytest.approx(1.3, abs=0.001)
+
+    def test_offset_applied(self):
+        timings = estimate_word_timings("Hello", _voiced(0.5), offset=2.0)
+        assert timings[0].start == pytest.approx(2.0, abs=0.001)
+        assert timings[0].end == pytest.approx(2.5, abs=0.001)
+
+    def test_longer_words_get_more_time(self):
+        a, b = estimate_word_timings("a extraordinarily", _voiced(1.0))
+        assert (b.end - b.start) > (a.end - a.start)
+
+    def test_pause_after_comma(self):
+        first, second = estimate_word_timings("Well, okay", _voiced(1.0))
+        assert second.start > first.end
+
+    def test_silent_audio_uses_full_span(self):
+        timings = estimate_word_timings("Hi", np.zeros(2400, dtype=np.float32))
+        assert timings[0].start == 0.0
+        assert timings[0].end == pytest.approx(0.1)
+
+    def test_empty_inputs(self):
+        assert estimate_word_timings("", _voiced(1.0)) == []
+        assert estimate_word_timings("Hello", np.array([], dtype=np.float32)) == []
+
+    def test_to_dict_rounds(self):
+        assert WordTiming("hi", 0.123456, 0.5).to_dict() == {"word": "hi", "start": 0.123, "end": 0.5}
+
+
+class TestTimedSynthesis:
+    def test_one_tagged_segment_per_sentence(self):
+        async def fake_synthesize(text):
+            for _ in range(3):
+                yield np.ones(100, dtype=np.float32), SAMPLE_RATE
+
+        async def _gather():
+            stream = sentence_stream(["First.", "Second."], timed_synthesis(fake_synthesize))
+            return [item async for item in stream]
+
+        items = asyncio.run(_gather())
+        assert [text for _, _, text in items] == ["First.", "Second."]
+        assert all(len(audio) == 300 for audio, _, _ in items)
@@ -0,0 +1,113 @@
+"""
+Tests for api/traffic.py — input length histogram, bucket suggestions,
+persistence, and its use by the warmup plan.
+"""
+
+import json
+
+import pytest
+from unittest.mock import patch
+
+import api.degradation as degradation_module
+import api.main as main_module
+import api.tts as tts_module
+from api.degradation import DegradationPolicy
+from api.traffic import LengthHistogram
+from api.warmup import warmup_plan
+
+
+@pytest.fixture
+def histogram(tmp_path):
+    return LengthHistogram(path=str(tmp_path / "traffic.json"))
+
+
+class TestLengthHistogram:
+    def test_quantiles(self, histogram):
+        for chars in [10] * 50 + [100] * 40 + [500] * 10:
+            histogram.record(chars)
+        assert histogram.samples == 100
+        assert histogram.quantile(0.5) == 16
+        assert histogram.quantile(0.9) == 112
+        assert histogram.quantile(0.99) == 512
+
+    def test_long_inputs_in_last_bin(self, histogram):
+        histogram.record(5000)
+        assert histogram.quantile(1.0) == 512
+
+    def test_no_suggestion_without_samples(self, histogram):
+        histogram.record(40)
+        assert histogram.suggest_buckets(min_samples=2) is None
+
+    def test_suggested_buckets_deduplicated(self, histogram):
+        for _ in range(10):
+            histogram.record(40)
+        assert histogram.suggest_buckets((0.5, 0.9), min_samples=10) == [48]
+
+    def test_save_and_load(self, histogram):
+        for chars in (20, 200, 200):
+            histogram.record(chars)
+        histogram.save()
+        saved = json.load(open(histogram.path))
+        assert saved["samples"] == 3
+
+        restored = LengthHistogram(path=histogram.path)
+        restored.load()
+        assert restored.to_dict()["counts"] == histogram.to_dict()["counts"]
+
+    def test_load_ignores_bad_file(self, histogram):
+        open(histogram.path, "w").write("not json")
+        histogram.load()
+        assert histogram.samples == 0
+
+    def test_empty_histogram_not_saved(self, histogram):
+        histogram.save()
+        with pytest.raises(FileNotFoundError):
+            open(histogram.path)
+
+
+class TestTrafficRecording:
+    def test_requests_recorded(self, client, histogram):
+        with patch.object(main_module, 'length_histogram', histogram):
+            client.post("/v1/audio/speech", json={"input": "Hello there", "stream": False})
+        assert histogram.samples == 1
+
+    def test_segmented_stream_recorded_once(self, client, histogram):
+        text = "First sentence here. Second one follows. And a third."
+        policy = DegradationPolicy(thresholds_ms=[100, 300], enabled=True)
+        with patch.object(main_module, 'length_histogram', histogram), \
+             patch.object(main_module, 'degradation', policy), \
+             patch.object(degradation_module, 'estimated_wait', return_value=0.15):
+            r = client.post("/v1/audio/speech", json={"input": text, "stream": True})
+        assert r.headers["X-Quality-Tier"] == "segmented"
+        assert histogram.samples == 1
+        assert histogram.quantile(1.0) >= len(text)
+
+    def test_websocket_utterance_recorded_once(self, client, histogram):
+        with patch.object(main_module, 'length_histogram', histogram):
+            with client.websocket_connect("/v1/audio/speech/ws") as ws:
+                ws.send_json({"input": "Hello there. Second sentence.", "timestamps": True})
+                while True:
+                    message = ws.receive()
+                    if message.get("text") and json.loads(message["text"])["type"] == "end":
+                        break
+        assert histogram.samples == 1
+
+    def test_status_reports_lengths(self, client):
+        assert "counts" in client.get("/status").json()["input_lengths"]
+
+
+class TestWarmupFromTraffic:
+    def test_plan_uses_traffic_buckets(self, mock_model, histogram):
+        for _ in range(300):
+            histogram.record(70)
+        with patch.object(tts_module, '_model', mock_model), \
+             patch.object(tts_module, '_voice_registry', None), \
+             patch('api.warmup.length_histogram', histogram):
+            assert warmup_plan(voices=["af_heart"]) == [(80, "af_heart")]
+
+    def test_plan_falls_back_to_configured_buckets(self, mock_model, histogram):
+        with patch.object(tts_module, '_model', mock_model), \
+             patch.object(tts_module, '_voice_registry', None), \
+             patch('api.warmup.length_histogram', histogram), \
+             patch('api.warmup.WARMUP_BUCKETS', [32, 64]):
+            assert warmup_plan(voices=["af_heart"]) == [(32, "af_heart"), (64, "af_heart")]
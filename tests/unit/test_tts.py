@@ -4,6 +4,9 @@ split-and-parallel streaming.
 """
 
 import asyncio
+import os
+import subprocess
+import sys
 
 import numpy as np
 import pytest
@@ -39,6 +42,29 @@ class TestModelLifecycle:
         with patch.object(tts_module, '_model', None):
             assert get_voices() == []
 
+    def test_api_import_defers_inference_stack(self):
+        code = "import sys, api.main; print(any(m in sys.modules for m in ('kokoro_mlx', 'mlx.core')))"
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+        assert result.stdout.strip() == "False"
+
+    def test_load_state_ready(self):
+        with patch.object(tts_module, '_model_ready', True):
+            state = tts_module.get_load_state()
+        assert state["phase"] == "ready"
+        assert state["progress"] == 1.0
+
+    def test_initialize_failure_reported(self):
+        with patch.object(tts_module, '_model_ready', False), \
+             patch.object(tts_module, '_load_phase', "pending"), \
+             patch.object(tts_module, '_load_error', None), \
+             patch('api.artifacts.load_model', side_effect=OSError("no weights")):
+            with pytest.raises(OSError):
+                tts_module.initialize_model()
+            state = tts_module.get_load_state()
+        assert state["phase"] == "failed"
+        assert state["error"] == "no weights"
+
     def test_get_voices_with_model(self, mock_model):
         with patch.object(tts_module, '_model', mock_model):
             voices = get_voices()
@@ -155,6 +181,13 @@ class TestGenerateAudioStream:
         # Full text passed to generate_stream in one call
         assert mock_model.generate_stream.call_count == 1
 
+    def test_short_first_segment_renders_first_sentence_alone(self, mock_model):
+        text = "First sentence here. Second sentence here. Third sentence here."
+        segments = self._collect_stream(mock_model, text, short_first_segment=True)
+        assert len(segments) >= 2
+        texts = [c.args[0] for c in mock_model.generate_stream.call_args_list]
+        assert texts == ["First sentence here.", "Second sentence here. Third sentence here."]
+
     def test_paragraph_text(self, mock_model):
         """Paragraph-length text should stream successfully."""
         text = (
@@ -271,3 +304,81 @@ class TestMLXSerialization:
             f"generate_audio_stream ran on {observed_threads[0]!r}, expected "
             f"the single 'mlx' worker thread."
         )
+
+
+class TestParallelSynthesis:
+    """Opt-in parallel segment synthesis (TTS_INFERENCE_WORKERS > 1)."""
+
+    LONG_TEXT = " ".join(f"Sentence number {i} is part of a long article." for i in range(40))
+
+    @pytest.fixture
+    def parallel(self, mock_model):
+        from api.scheduler import PriorityExecutor
+        executor = PriorityExecutor(max_workers=3, thread_name_prefix="mlx")
+        with patch.object(tts_module, '_model', mock_model), \
+             patch.object(tts_module, '_model_ready', True), \
+             patch.object(tts_module, 'INFERENCE_WORKERS', 3), \
+             patch.object(tts_module, '_mlx_executor', executor):
+            yield mock_model
+        executor.shutdown()
+
+    def test_default_is_single_worker(self):
+        from api.config import INFERENCE_WORKERS
+        assert INFERENCE_WORKERS == 1
+        assert tts_module.parallel_segments(self.LONG_TEXT) == [self.LONG_TEXT]
+
+    def test_multiple_workers_refused_on_gpu(self):
+        import mlx.core as mx
+        with patch.object(tts_module, 'INFERENCE_WORKERS', 3), \
+             patch.object(mx, 'default_device', return_value=mx.gpu):
+            with pytest.raises(RuntimeError, match="TTS_INFERENCE_WORKERS"):
+                tts_module._check_inference_workers()
+        with patch.object(tts_module, 'INFERENCE_WORKERS', 3), \
+             patch.object(mx, 'default_device', return_value=mx.cpu):
+            tts_module._check_inference_workers()
+
+    def test_segments_cover_text_in_order(self):
+        segments = tts_module.parallel_segments(self.LONG_TEXT, workers=4)
+        assert len(segments) > 4
+        assert segments[0] == "Sentence number 0 is part of a long article."
+        assert " ".join(segments) == self.LONG_TEXT
+        assert all(len(s) <= 400 for s in segments)
+
+    def test_short_text_not_split(self):
+        assert tts_module.parallel_segments("Short. Text.", workers=4) == ["Short. Text."]
+
+    def test_generate_audio_reassembles_in_order(self, parallel):
+        import threading
+        threads = set()
+
+        def tagged_stream(text, voice="af_heart", speed=1.0, **kwargs):
+            threads.add(threading.current_thread().name)
+            # Later segments finish first; output must still follow text order
+            number = int(text.split()[2])
+            import time
+            time.sleep(0.001 * (40 - number) / 10)
+            yield np.full(10, number, dtype=np.float32)
+
+        parallel.generate_stream.side_effect = tagged_stream
+        audio, _, _ = generate_audio(self.LONG_TEXT)
+
+        starts = audio[::10]
+        assert list(starts) == sorted(starts)
+        assert starts[0] == 0
+        assert len(threads) > 1
+        assert all(name.startswith("mlx") for name in threads)
+
+    def test_stream_yields_in_order(self, parallel):
+        def tagged_stream(text, voice="af_heart", speed=1.0, **kwargs):
+            yield np.full(10, int(text.split()[2]), dtype=np.float32)
+
+        parallel.generate_stream.side_effect = tagged_stream
+
+        async def collect():
+            return [s async for s, _ in generate_audio_stream(self.LONG_TEXT)]
+
+        segments = asyncio.run(collect())
+        firsts = [int(s[0]) for s in segments]
+        assert firsts == sorted(firsts)
+        assert firsts[0] == 0
+        assert len(segments) == len(tts_module.parallel_segments(self.LONG_TEXT, workers=3))
@@ -0,0 +1,150 @@
+"""
+Tests for model variants — configuration, loading with a shared voice
+registry, per-request routing and cache key separation.
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+import api.main as main_module
+import api.tts as tts_module
+from api.cache import content_key
+from api.config import _parse_variants
+from api.tts import generate_audio, get_model, get_model_info, load_variants, reload_model
+from tests.conftest import _make_mock_model
+
+
+@pytest.fixture
+def variants():
+    """A default mock model plus a loaded "fast" variant."""
+    fast = _make_mock_model()
+    with patch.object(tts_module, '_model', _make_mock_model()), \
+         patch.object(tts_module, '_model_ready', True), \
+         patch.object(tts_module, '_voice_registry', None), \
+         patch.object(tts_module, '_model_info', {"id": "base", "hash": "aaaa", "loaded_at": 0.0}), \
+         patch.object(tts_module, '_variants', {"fast": fast}), \
+         patch.object(tts_module, '_variant_info', {"fast": {"id": "base", "precision": "q8", "hash": "aaaa-q8"}}):
+        yield fast
+
+
+class TestParseVariants:
+    def test_names_models_and_precision(self):
+        with patch("api.config.MODEL_ID", "org/default"):
+            parsed = _parse_variants("fast=org/kokoro@q8, full=org/kokoro ,half=@bf16")
+        assert parsed == {
+            "fast": ("org/kokoro", "q8"),
+            "full": ("org/kokoro", "fp32"),
+            "half": ("org/default", "bf16"),
+        }
+
+    def test_ignores_malformed_entries(self):
+        assert _parse_variants("") == {}
+        assert _parse_variants("noequals,=org/kokoro") == {}
+
+
+class TestRouting:
+    def test_variant_by_name(self, variants):
+        assert get_model("fast") is variants
+
+    def test_unknown_name_uses_default(self, variants):
+        assert get_model("kokoro-v1.0") is tts_module._model
+        assert get_model() is tts_module._model
+
+    def test_generate_runs_on_variant(self, variants):
+        audio, _, _ = generate_audio("Hello", variant="fast")
+        assert len(audio) > 0
+        assert variants.generate_stream.called
+        assert not tts_module._model.generate_stream.called
+
+    def test_cache_keys_separate_variants(self, variants):
+        base = content_key("Hello", "af_heart", 1.0, "wav")
+        assert content_key("Hello", "af_heart", 1.0, "wav", model="fast") != base
+        assert content_key("Hello", "af_heart", 1.0, "wav", model="unknown") == base
+
+
+class TestLoadVariants:
+    def test_loads_with_shared_registry(self, variants):
+        registry = MagicMock()
+        loaded = _make_mock_model()
+        with patch.object(tts_module, '_variants', {}), \
+             patch.object(tts_module, '_variant_info', {}), \
+             patch.object(tts_module, '_voice_registry', registry), \
+             patch.object(tts_module, 'MODEL_VARIANTS', {"fast": ("org/kokoro", "q4")}), \
+             patch.object(tts_module, '_model_hash', return_value="bbbb"), \
+             patch("api.artifacts.load_model", return_value=loaded), \
+             patch("api.artifacts.set_precision") as set_precision:
+            threads = []
+            set_precision.side_effect = lambda *args: threads.append(threading.current_thread().name)
+            load_variants()
+            assert get_model("fast") is loaded
+            info = get_model_info()["variants"]["fast"]
+        assert threads[0].startswith("mlx")  # Built on the MLX worker
+        set_precision.assert_called_once_with(loaded, "q4")
+        assert loaded._voices is registry
+        assert loaded.generate.called  # Warmed before use
+        assert (info["id"], info["precision"], info["hash"]) == ("org/kokoro", "q4", "bbbb-q4")
+
+    def test_failed_variant_falls_back_to_default(self, variants):
+        with patch.object(tts_module, '_variants', {}), \
+             patch.object(tts_module, '_variant_info', {}), \
+             patch.object(tts_module, 'MODEL_VARIANTS', {"broken": ("org/missing", "q8")}), \
+             patch("api.artifacts.load_model", side_effect=OSError("missing weights")):
+            load_variants()
+            assert get_model("broken") is tts_module._model
+            assert get_model_info()["variants"] == {}
+
+    def test_reload_moves_variants_to_new_registry(self, variants):
+        registry = MagicMock()
+        with patch.object(tts_module, '_reload_state', {"state": "idle"}), \
+             patch.object(tts_module, '_build_model', return_value=(_make_mock_model(), registry)), \
+             patch.object(tts_module, '_model_hash', return_value="cccc"):
+            reload_model(drain_timeout=0)
+        assert variants._voices is registry
+
+
+class TestEndpoint:
+    def test_speech_routed_by_model_field(self, client):
+        fast = _make_mock_model()
+        with patch.object(tts_module, '_variants', {"fast": fast}), \
+             patch.object(tts_module, '_variant_info', {"fast": {"id": "m", "precision": "q8", "hash": None}}):
+            r = client.post("/v1/audio/speech", json={"input": "Hello", "model": "fast", "stream": False})
+        assert r.status_code == 200
+        assert fast.generate_stream.called
+
+    def test_status_lists_variants(self, client):
+        info = {"fast": {"id": "m", "precision": "q8", "hash": None, "loaded_at": 0.0}}
+        with patch.object(tts_module, '_variant_info', info):
+            model = client.get("/status").json()["model"]
+        assert model["variants"] == info
+
+    def test_ready_without_waiting_for_variants(self, tmp_path):
+        init_release, variants_release = threading.Event(), threading.Event()
+
+        def initialize():
+            init_release.wait(5)
+            tts_module._model_ready = True
+            return 0.01
+
+        with patch.object(main_module, 'initialize_model', side_effect=initialize), \
+             patch.object(main_module, 'WARMUP_ENABLED', False), \
+             patch.object(main_module, 'MODEL_VARIANTS', {"fast": ("m", "q8")}), \
+             patch.object(main_module, 'load_variants', side_effect=lambda: variants_release.wait(5)), \
+             patch.object(main_module.length_histogram, 'path', str(tmp_path / "traffic.json")), \
+             patch.object(tts_module, '_model', _make_mock_model()), \
+             patch.object(tts_module, '_model_ready', False):
+            with TestClient(main_module.app, raise_server_exceptions=False) as c:
+                result = {}
+                request = threading.Thread(target=lambda: result.update(
+                    r=c.post("/v1/audio/speech", json={"input": "Hello", "stream": False})))
+                request.start()
+                time.sleep(0.1)  # The request waits for the model load
+                init_release.set()
+                request.join(5)
+                served_while_loading = "r" in result
+                variants_release.set()
+        assert served_while_loading
+        assert result["r"].status_code == 200
@@ -0,0 +1,292 @@
+"""
+Tests for api/voices.py — voice pack loading, memory mapping, lookup, metadata.
+"""
+
+import os
+from types import SimpleNamespace
+
+import mlx.core as mx
+import numpy as np
+import pytest
+from kokoro_mlx import VoiceManager
+
+from api.voices import VoiceRegistry, blend_key, install_registry, parse_blend, voice_info
+
+VOICE_IDS = ["af_heart", "bm_fable", "jf_alpha"]
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    voices = tmp_path / "model" / "voices"
+    voices.mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    for voice_id in VOICE_IDS:
+        data = rng.standard_normal((510, 1, 256)).astype(np.float32)
+        mx.save_safetensors(str(voices / f"{voice_id}.safetensors"), {"voice": mx.array(data)})
+    return tmp_path / "model"
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "voice-cache")
+
+
+class TestVoiceInfo:
+    def test_parses_prefix(self):
+        assert voice_info("bf_emma") == {"id": "bf_emma", "name": "emma", "language": "en-gb", "gender": "female"}
+        assert voice_info("jm_kumo")["language"] == "ja"
+        assert voice_info("jm_kumo")["gender"] == "male"
+
+    def test_unknown_prefix(self):
+        info = voice_info("custom")
+        assert info["name"] == "custom"
+        assert info["language"] is None
+        assert info["gender"] is None
+
+
+class TestVoiceRegistry:
+    def test_lists_and_validates(self, model_dir, cache_dir):
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        assert registry.list_voices() == sorted(VOICE_IDS)
+        assert "af_heart" in registry
+        assert "af_nobody" not in registry
+        assert len(registry) == 3
+
+    def test_eager_keeps_mapped_pack_shared(self, model_dir, cache_dir):
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        registry.load_all()
+        assert isinstance(registry._pack, np.memmap)
+        assert registry._cache == {}  # No private copies until a voice is used
+        assert registry.load_time_ms > 0
+        registry.load_voice("bm_fable")
+        assert list(registry._cache) == ["bm_fable"]
+
+    def test_matches_kokoro_loader(self, model_dir, cache_dir):
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        registry.load_all()
+        reference = VoiceManager(model_dir)
+        for voice_id in VOICE_IDS:
+            ours = registry.load_voice(voice_id)
+            assert ours.shape == (510, 1, 256)
+            assert ours.dtype == mx.float32
+            assert np.array_equal(np.array(ours), np.array(reference.load_voice(voice_id)))
+
+    def test_pack_is_memory_mapped_on_restart(self, model_dir, cache_dir):
+        VoiceRegistry(model_dir, cache_dir=cache_dir).load_all()
+        assert len(os.listdir(cache_dir)) == 1
+
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        registry.load_all()
+        assert isinstance(registry._pack, np.memmap)
+        assert registry._pack.shape == (3, 510, 1, 256)
+
+    def test_pack_rebuilt_when_voices_change(self, model_dir, cache_dir):
+        VoiceRegistry(model_dir, cache_dir=cache_dir).load_all()
+        mx.save_safetensors(
+            str(model_dir / "voices" / "am_adam.safetensors"),
+            {"voice": mx.zeros((510, 1, 256))},
+        )
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        registry.load_all()
+        assert registry._pack.shape[0] == 4
+        assert "am_adam" in registry
+
+    def test_unwritable_cache_keeps_voices_in_memory(self, model_dir, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("not a directory")
+        registry = VoiceRegistry(model_dir, cache_dir=str(blocker))
+        registry.load_all()
+        assert not isinstance(registry._pack, np.memmap)
+        assert set(registry._cache) == set(VOICE_IDS)
+
+    def test_details(self, model_dir, cache_dir):
+        details = VoiceRegistry(model_dir, cache_dir=cache_dir).details()
+        assert [d["id"] for d in details] == sorted(VOICE_IDS)
+
+    def test_install_replaces_voice_manager(self, model_dir, cache_dir):
+        model = SimpleNamespace(_model_path=model_dir, _voices=VoiceManager(model_dir))
+        registry = install_registry(model, cache_dir=cache_dir)
+        assert model._voices is registry
+        assert registry._pack is not None
+
+
+class TestBlendSpec:
+    def test_weights_normalized_and_sorted(self):
+        assert parse_blend("bm_fable(3)+af_heart(7)") == [("af_heart", 0.7), ("bm_fable", 0.3)]
+
+    def test_bare_ids_weigh_equally(self):
+        assert parse_blend("af_heart+bm_fable") == [("af_heart", 0.5), ("bm_fable", 0.5)]
+
+    def test_duplicates_merged(self):
+        assert parse_blend("af_heart(1)+bm_fable(1)+af_heart(2)") == [("af_heart", 0.75), ("bm_fable", 0.25)]
+
+    def test_equivalent_specs_share_key(self):
+        a = blend_key(parse_blend("af_heart(0.7)+bm_fable(0.3)"))
+        b = blend_key(parse_blend(" bm_fable( 30 ) + af_heart(70)"))
+        assert a == b == "af_heart(0.7)+bm_fable(0.3)"
+
+    @pytest.mark.parametrize("spec", ["af_heart(x)+bm_fable", "af_heart+", "af_heart(0)+bm_fable(0)", "a-b+c"])
+    def test_malformed(self, spec):
+        with pytest.raises(ValueError):
+            parse_blend(spec)
+
+
+class TestVoiceBlending:
+    def test_resolve(self, model_dir, cache_dir):
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        assert registry.resolve("af_heart") == "af_heart"
+        assert registry.resolve("bm_fable(3)+af_heart(7)") == "af_heart(0.7)+bm_fable(0.3)"
+        assert registry.resolve("af_heart(1)") == "af_heart"
+        assert registry.resolve("af_heart+af_nobody") is None
+        assert registry.resolve("af_heart(") is None
+        assert registry.resolve("af_nobody") is None
+
+    def test_blend_is_weighted_sum(self, model_dir, cache_dir):
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        registry.load_all()
+        blended = registry.load_voice("af_heart(0.7)+bm_fable(0.3)")
+        expected = 0.7 * np.array(registry.load_voice("af_heart")) + 0.3 * np.array(registry.load_voice("bm_fable"))
+        assert blended.shape == (510, 1, 256)
+        assert np.allclose(np.array(blended), expected, atol=1e-6)
+
+    def test_blend_computed_once(self, model_dir, cache_dir):
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        registry.load_all()
+        spec = "af_heart(0.5)+jf_alpha(0.5)"
+        assert registry.load_voice(spec) is registry.load_voice(spec)
+
+    def test_blend_cache_is_lru(self, model_dir, cache_dir):
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir, blend_cache_size=2)
+        registry.load_all()
+        first = registry.load_voice("af_heart(0.5)+bm_fable(0.5)")
+        registry.load_voice("af_heart(0.5)+jf_alpha(0.5)")
+        registry.load_voice("af_heart(0.5)+bm_fable(0.5)")  # refresh
+        registry.load_voice("bm_fable(0.5)+jf_alpha(0.5)")  # evicts af_heart+jf_alpha
+        assert list(registry._blends) == ["af_heart(0.5)+bm_fable(0.5)", "bm_fable(0.5)+jf_alpha(0.5)"]
+        assert registry.load_voice("af_heart(0.5)+bm_fable(0.5)") is first
+
+    def test_request_uses_normalized_blend(self, model_dir, cache_dir, mock_model):
+        from unittest.mock import patch
+        import api.tts as tts_module
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        with patch.object(tts_module, "_model", mock_model), \
+             patch.object(tts_module, "_voice_registry", registry):
+            tts_module.generate_audio("Hello", voice="bm_fable(3)+af_heart(7)")
+            tts_module.generate_audio("Hello", voice="af_heart+af_nobody")
+        voices = [call.kwargs["voice"] for call in mock_model.generate_stream.call_args_list]
+        assert voices == ["af_heart(0.7)+bm_fable(0.3)", "af_heart"]
+
+
+VOICE_BYTES = 510 * 256 * 4
+
+
+class TestLazyLoading:
+    def _registry(self, model_dir, cache_dir, **kwargs):
+        kwargs.setdefault("pinned", ["af_heart"])
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir, policy="lazy", **kwargs)
+        registry.load_all()
+        return registry
+
+    def test_only_pinned_loaded_at_startup(self, model_dir, cache_dir):
+        registry = self._registry(model_dir, cache_dir)
+        assert list(registry._cache) == ["af_heart"]
+        assert registry._pack is not None
+
+    def test_loads_on_first_use(self, model_dir, cache_dir):
+        registry = self._registry(model_dir, cache_dir)
+        voice = registry.load_voice("bm_fable")
+        assert voice.shape == (510, 1, 256)
+        assert registry.is_resident("bm_fable")
+        registry.load_voice("bm_fable")
+
+        stats = {v["id"]: v for v in registry.residency()["voices"]}["bm_fable"]
+        assert stats["loads"] == 1
+        assert stats["hits"] == 1
+        assert stats["load_ms"] >= 0
+
+    def test_evicts_lru_within_budget_keeping_pinned(self, model_dir, cache_dir):
+        registry = self._registry(model_dir, cache_dir, budget_mb=2.5 * VOICE_BYTES / 1024 / 1024)
+        registry.load_voice("bm_fable")
+        registry.load_voice("jf_alpha")  # three resident > budget: bm_fable is the LRU unpinned voice
+        assert list(registry._cache) == ["af_heart", "jf_alpha"]
+
+        registry.load_voice("bm_fable")
+        assert list(registry._cache) == ["af_heart", "bm_fable"]
+        assert registry.residency()["resident_bytes"] == 2 * VOICE_BYTES
+
+    def test_prefetch_stages_in_background(self, model_dir, cache_dir):
+        import threading
+        registry = self._registry(model_dir, cache_dir)
+        threads = []
+        original = registry._stage
+
+        def recording_stage(name):
+            threads.append(threading.current_thread().name)
+            original(name)
+
+        registry._stage = recording_stage
+        registry.prefetch("af_heart(0.5)+jf_alpha(0.5)")  # af_heart is resident; only jf_alpha is read
+        registry._prefetcher.shutdown(wait=True)
+
+        assert threads == ["voice-prefetch_0"]
+        assert "jf_alpha" in registry._staged
+        expected = np.array(VoiceManager(model_dir).load_voice("jf_alpha"))
+        assert np.array_equal(np.array(registry.load_voice("jf_alpha")), expected)
+        assert "jf_alpha" not in registry._staged
+
+    def test_staged_voices_count_against_budget(self, model_dir, cache_dir):
+        registry = self._registry(model_dir, cache_dir, budget_mb=2.5 * VOICE_BYTES / 1024 / 1024)
+        for voice in ("bm_fable", "jf_alpha"):  # Neither request gets to load its voice
+            registry.prefetch(voice)
+            registry._prefetcher.submit(lambda: None).result()
+        assert list(registry._staged) == ["jf_alpha"]
+        assert list(registry._cache) == ["af_heart"]
+        assert registry.residency()["staged_bytes"] == VOICE_BYTES
+
+    def test_blends_count_against_budget(self, model_dir, cache_dir):
+        registry = self._registry(model_dir, cache_dir, budget_mb=3.5 * VOICE_BYTES / 1024 / 1024)
+        registry.load_voice("af_heart(0.5)+bm_fable(0.5)")  # af_heart, bm_fable and the blend: 3 voices' worth
+        registry.load_voice("af_heart(0.5)+jf_alpha(0.5)")
+        total = sum(v.nbytes for c in (registry._cache, registry._blends) for v in c.values())
+        assert total <= registry.budget_bytes
+        assert list(registry._blends) == ["af_heart(0.5)+jf_alpha(0.5)"]  # The older blend went first
+        assert registry.residency()["blend_bytes"] == VOICE_BYTES
+
+    def test_close_releases_prefetcher_and_pack(self, model_dir, cache_dir):
+        registry = self._registry(model_dir, cache_dir)
+        registry.prefetch("jf_alpha")
+        prefetcher = registry._prefetcher
+        prefetcher.submit(lambda: None).result()
+        registry.close()
+        assert prefetcher._shutdown
+        assert registry._staged == {} and registry._prefetching == {}
+        assert registry._pack is None
+        registry.prefetch("bm_fable")  # No-op once closed
+        assert registry._prefetcher is None
+        expected = np.array(VoiceManager(model_dir).load_voice("bm_fable"))
+        assert np.array_equal(np.array(registry.load_voice("bm_fable")), expected)
+
+    def test_prefetch_noop_when_eager(self, model_dir, cache_dir):
+        registry = VoiceRegistry(model_dir, cache_dir=cache_dir)
+        registry.load_all()
+        registry.prefetch("bm_fable")
+        assert registry._prefetcher is None
+
+    def test_residency_report(self, model_dir, cache_dir):
+        report = self._registry(model_dir, cache_dir, budget_mb=4).residency()
+        assert report["policy"] == "lazy"
+        assert report["budget_bytes"] == 4 * 1024 * 1024
+        assert report["resident_count"] == 1
+        heart = {v["id"]: v for v in report["voices"]}["af_heart"]
+        assert heart["pinned"] is True
+        assert heart["resident"] is True
+        assert heart["bytes"] == VOICE_BYTES
+
+    def test_status_reports_voice_cache(self, model_dir, cache_dir, client):
+        from unittest.mock import patch
+        import api.tts as tts_module
+        registry = self._registry(model_dir, cache_dir)
+        with patch.object(tts_module, "_voice_registry", registry):
+            data = client.get("/status").json()
+        assert data["voice_cache"]["policy"] == "lazy"
+        assert len(data["voice_cache"]["voices"]) == 3
@@ -0,0 +1,73 @@
+"""
+Tests for api/warmup.py — warmup corpus, plan construction, per-bucket
+timing report and its exposure on /status.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import patch
+
+import api.tts as tts_module
+from api.warmup import get_warmup_report, run_warmup, warmup_plan, warmup_text
+
+
+@pytest.fixture
+def loaded(mock_model):
+    with patch.object(tts_module, '_model', mock_model), \
+         patch.object(tts_module, '_voice_registry', None):
+        yield mock_model
+
+
+class TestWarmupText:
+    @pytest.mark.parametrize("chars", [16, 32, 128, 400, 2000])
+    def test_length_close_to_bucket(self, chars):
+        text = warmup_text(chars)
+        assert chars * 0.7 <= len(text) <= chars + 1
+        assert text.endswith(".")
+        assert "  " not in text
+
+
+class TestWarmupPlan:
+    def test_buckets_sorted_per_voice(self, loaded):
+        plan = warmup_plan(buckets=[128, 32, 32], voices=["af_heart", "bm_fable"])
+        assert plan == [(32, "af_heart"), (32, "bm_fable"), (128, "af_heart"), (128, "bm_fable")]
+
+    def test_unknown_voices_skipped(self, loaded):
+        assert warmup_plan(buckets=[32], voices=["nope", "af_heart"]) == [(32, "af_heart")]
+
+
+class TestRunWarmup:
+    def test_records_first_and_steady_latency(self, loaded):
+        report = asyncio.run(run_warmup([(32, "af_heart"), (128, "af_heart")], repeats=3))
+        assert report.state == "completed"
+        assert loaded.generate_stream.call_count == 6
+        assert [b.chars for b in report.buckets] == [32, 128]
+        data = get_warmup_report()
+        assert data["completed"] == data["planned"] == 2
+        assert all(b["first_ms"] >= 0 and b["steady_ms"] >= 0 for b in data["buckets"])
+        assert data["duration_s"] is not None
+
+    def test_runs_on_mlx_worker(self, loaded):
+        threads = []
+
+        def record(text, voice="af_heart", speed=1.0, **kwargs):
+            threads.append(threading.current_thread().name)
+            return iter([])
+
+        loaded.generate_stream.side_effect = record
+        asyncio.run(run_warmup([(32, "af_heart")], repeats=2))
+        assert threads and all(name.startswith("mlx") for name in threads)
+
+    def test_failure_reported(self, loaded):
+        loaded.generate_stream.side_effect = RuntimeError("out of memory")
+        report = asyncio.run(run_warmup([(32, "af_heart")], repeats=2))
+        assert report.state == "failed"
+        assert report.error == "out of memory"
+
+
+class TestWarmupStatus:
+    def test_status_includes_warmup(self, client):
+        data = client.get("/status").json()
+        assert "state" in data["warmup"]
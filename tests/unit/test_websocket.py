@@ -0,0 +1,325 @@
+"""
+Tests for the WebSocket streaming endpoint (api/websocket.py) — framing,
+sample offsets, multiple utterances per connection and mid-stream errors.
+"""
+
+import json
+
+import numpy as np
+
+from api.config import SAMPLE_RATE
+
+WS_PATH = "/v1/audio/speech/ws"
+
+
+def _receive_utterance(ws):
+    """Collect control messages and binary frames until 'end' or 'error'."""
+    messages, frames = [], []
+    while True:
+        msg = ws.receive()
+        if msg.get("bytes") is not None:
+            frames.append(msg["bytes"])
+            continue
+        data = json.loads(msg["text"])
+        messages.append(data)
+        if data["type"] in ("end", "error"):
+            return messages, frames
+
+
+class TestWebSocketFraming:
+    def test_start_segments_end(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "Hello world over a socket", "id": "u1"})
+            messages, frames = _receive_utterance(ws)
+
+        types = [m["type"] for m in messages]
+        assert types[0] == "start"
+        assert types[-1] == "end"
+        assert "segment" in types
+        assert messages[0]["sample_rate"] == SAMPLE_RATE
+        assert messages[0]["format"] == "pcm_s16le"
+        assert all(m["id"] == "u1" for m in messages)
+
+    def test_one_frame_per_segment(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "Hello world over a socket"})
+            messages, frames = _receive_utterance(ws)
+
+        segments = [m for m in messages if m["type"] == "segment"]
+        assert len(frames) == len(segments)
+        for seg, frame in zip(segments, frames):
+            assert len(frame) == seg["samples"] * 2
+
+    def test_sample_offsets_contiguous(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "A longer sentence so the mock yields several segments."})
+            messages, frames = _receive_utterance(ws)
+
+        segments = [m for m in messages if m["type"] == "segment"]
+        offset = 0
+        for i, seg in enumerate(segments):
+            assert seg["index"] == i
+            assert seg["sample_offset"] == offset
+            offset += seg["samples"]
+        end = messages[-1]
+        assert end["samples"] == offset
+        assert end["duration"] == offset / SAMPLE_RATE
+        assert end["ttfa_ms"] is not None
+
+    def test_audio_matches_http_stream(self, client):
+        text = "Same audio over both transports"
+        http = client.post("/v1/audio/speech", json={"input": text, "stream": True})
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": text})
+            _, frames = _receive_utterance(ws)
+        assert b"".join(frames) == http.content
+
+
+class TestWebSocketSession:
+    def test_multiple_utterances(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            for i in range(3):
+                ws.send_json({"input": f"Utterance number {i}"})
+                messages, frames = _receive_utterance(ws)
+                assert messages[-1]["type"] == "end"
+                assert messages[0]["id"] == i  # default ids count utterances
+                assert len(frames) > 0
+
+    def test_invalid_json_keeps_socket_open(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_text("not json")
+            messages, _ = _receive_utterance(ws)
+            assert messages[-1]["type"] == "error"
+
+            ws.send_json({"input": "Still works"})
+            messages, _ = _receive_utterance(ws)
+            assert messages[-1]["type"] == "end"
+
+    def test_binary_frame_keeps_socket_open(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_bytes(b"\x00\x01")
+            messages, _ = _receive_utterance(ws)
+            assert messages[-1]["type"] == "error"
+            assert "binary" in messages[-1]["detail"]
+
+            ws.send_json({"input": "Still works"})
+            messages, _ = _receive_utterance(ws)
+            assert messages[-1]["type"] == "end"
+
+    def test_validation_error(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"voice": "af_heart", "id": "bad"})
+            messages, _ = _receive_utterance(ws)
+        assert messages == [{"type": "error", "id": "bad", "detail": messages[0]["detail"]}]
+        assert "input" in messages[0]["detail"]
+
+    def test_whitespace_input(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "   "})
+            messages, _ = _receive_utterance(ws)
+        assert messages[-1]["type"] == "error"
+        assert "empty" in messages[-1]["detail"].lower()
+
+    def test_model_not_ready(self, client_no_model):
+        with client_no_model.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "Hello"})
+            messages, _ = _receive_utterance(ws)
+        assert messages[-1]["type"] == "error"
+        assert "not ready" in messages[-1]["detail"].lower()
+
+    def test_generation_error_mid_stream(self, client):
+        import api.tts as tts_module
+
+        def failing_stream(text, voice="af_heart", speed=1.0, **kwargs):
+            yield np.zeros(2400, dtype=np.float32)
+            raise RuntimeError("MLX crash")
+
+        model = tts_module._model
+        original = model.generate_stream.side_effect
+        model.generate_stream.side_effect = failing_stream
+        try:
+            with client.websocket_connect(WS_PATH) as ws:
+                ws.send_json({"input": "Hello"})
+                messages, frames = _receive_utterance(ws)
+        finally:
+            model.generate_stream.side_effect = original
+
+        assert [m["type"] for m in messages] == ["start", "segment", "error"]
+        assert len(frames) == 1
+        assert "MLX crash" in messages[-1]["detail"]
+
+    def test_trim_reported_in_end(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "Hello", "trim_silence": True})
+            messages, _ = _receive_utterance(ws)
+        assert "trimmed_ms" in messages[-1]
+
+
+class TestWebSocketIncrementalText:
+    def test_text_stream_synthesizes_each_sentence(self, client):
+        import api.tts as tts_module
+
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"type": "begin", "id": "llm"})
+            for delta in ["Hello th", "ere. How ", "are you", " today? Fine"]:
+                ws.send_json({"type": "text", "text": delta})
+            ws.send_json({"type": "end"})
+            messages, frames = _receive_utterance(ws)
+
+        assert messages[0]["type"] == "start"
+        assert messages[-1]["type"] == "end"
+        assert all(m["id"] == "llm" for m in messages)
+        assert len(frames) > 0
+        spoken = [call.args[0] for call in tts_module._model.generate_stream.call_args_list]
+        assert spoken[-3:] == ["Hello there.", "How are you today?", "Fine"]
+
+    def test_first_sentence_before_end(self, client):
+        """Audio for a completed sentence arrives before the client sends 'end'."""
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"type": "begin"})
+            ws.send_json({"type": "text", "text": "First sentence here. Second"})
+            assert json.loads(ws.receive_text())["type"] == "start"
+            segment = json.loads(ws.receive_text())
+            assert segment["type"] == "segment"
+            assert len(ws.receive_bytes()) == segment["samples"] * 2
+
+            ws.send_json({"type": "end"})
+            messages, _ = _receive_utterance(ws)
+            assert messages[-1]["type"] == "end"
+
+    def test_options_applied(self, client):
+        import api.tts as tts_module
+
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"type": "begin", "voice": "bm_fable", "speed": 1.5})
+            ws.send_json({"type": "text", "text": "Hello."})
+            ws.send_json({"type": "end"})
+            _receive_utterance(ws)
+
+        _, kwargs = tts_module._model.generate_stream.call_args
+        assert kwargs["voice"] == "bm_fable"
+        assert kwargs["speed"] == 1.5
+
+    def test_invalid_options(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"type": "begin", "speed": 9.0})
+            messages, _ = _receive_utterance(ws)
+        assert messages[-1]["type"] == "error"
+
+    def test_unexpected_message_in_stream(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"type": "begin"})
+            ws.send_json({"type": "bogus"})
+            messages, _ = _receive_utterance(ws)
+            assert messages[-1]["type"] == "error"
+
+            # The rest of the failed stream is discarded, not spoken
+            ws.send_json({"type": "text", "text": "Hello there. "})
+            ws.send_json({"type": "end"})
+            ws.send_json({"input": "Recovered", "id": "next"})
+            messages, _ = _receive_utterance(ws)
+            assert messages[0]["id"] == "next"
+            assert messages[-1]["type"] == "end"
+
+    def test_text_outside_stream_rejected(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"type": "text", "text": "Hello there. "})
+            messages, frames = _receive_utterance(ws)
+            assert messages[-1]["type"] == "error"
+            assert frames == []
+
+            ws.send_json({"type": "end"})
+            messages, _ = _receive_utterance(ws)
+            assert messages[-1]["type"] == "error"
+
+            ws.send_json({"input": "Recovered"})
+            messages, _ = _receive_utterance(ws)
+            assert messages[-1]["type"] == "end"
+
+    def test_sequential_text_streams(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            for _ in range(2):
+                ws.send_json({"type": "begin"})
+                ws.send_json({"type": "text", "text": "One more reply."})
+                ws.send_json({"type": "end"})
+                messages, frames = _receive_utterance(ws)
+                assert messages[-1]["type"] == "end"
+                assert len(frames) > 0
+
+
+class TestWebSocketTimestamps:
+    def test_words_follow_each_segment(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "Hello there. Second sentence here.", "timestamps": True})
+            messages, frames = _receive_utterance(ws)
+
+        segments = [m for m in messages if m["type"] == "segment"]
+        words = [m for m in messages if m["type"] == "words"]
+        assert len(segments) == 2  # one segment per sentence
+        assert [w["index"] for w in words] == [s["index"] for s in segments]
+        assert [w["word"] for w in words[0]["words"]] == ["Hello", "there."]
+        assert [w["word"] for w in words[1]["words"]] == ["Second", "sentence", "here."]
+
+    def test_word_times_within_segment(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "Hello there. Second sentence here.", "timestamps": True})
+            messages, _ = _receive_utterance(ws)
+
+        segments = {m["index"]: m for m in messages if m["type"] == "segment"}
+        for msg in (m for m in messages if m["type"] == "words"):
+            seg = segments[msg["index"]]
+            seg_start = seg["sample_offset"] / SAMPLE_RATE
+            seg_end = (seg["sample_offset"] + seg["samples"]) / SAMPLE_RATE
+            for w in msg["words"]:
+                assert seg_start - 0.001 <= w["start"] < w["end"] <= seg_end + 0.001
+
+    def test_words_follow_trimmed_and_normalized_audio(self, client):
+        import api.tts as tts_module
+        from tests.conftest import _make_audio
+        silence = np.zeros(4800, dtype=np.float32)  # 200ms either side of every sentence
+
+        def padded(text, **kwargs):
+            yield np.concatenate([silence, _make_audio(text), silence])
+
+        tts_module._model.generate_stream.side_effect = padded
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "Hello there. Second sentence here.", "timestamps": True,
+                          "trim_silence": True, "normalize_loudness": True})
+            messages, frames = _receive_utterance(ws)
+
+        sent, sent_indices, words = 0, [], []
+        for m in messages:
+            if m["type"] == "segment":
+                sent += m["samples"]
+                sent_indices.append(m["index"])
+            elif m["type"] == "words":
+                assert m["index"] == sent_indices[-1]  # Only after its audio went out
+                assert m["words"][-1]["end"] <= sent / SAMPLE_RATE + 0.001
+                words += m["words"]
+        assert [w["word"] for w in words] == ["Hello", "there.", "Second", "sentence", "here."]
+
+        # Each sentence's words span exactly its voiced audio in what was sent
+        audio = np.frombuffer(b"".join(frames), dtype="<i2")
+        voiced = np.flatnonzero(np.abs(audio) > 300)
+        breaks = np.flatnonzero(np.diff(voiced) > SAMPLE_RATE // 20)
+        spans = [(voiced[0], voiced[breaks[0]]), (voiced[breaks[0] + 1], voiced[-1])]
+        for (start, end), sentence in zip(spans, (words[:2], words[2:])):
+            assert abs(sentence[0]["start"] - start / SAMPLE_RATE) < 0.02
+            assert abs(sentence[-1]["end"] - end / SAMPLE_RATE) < 0.02
+
+    def test_incremental_with_timestamps(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"type": "begin", "timestamps": True})
+            ws.send_json({"type": "text", "text": "Streaming words arrive. Then more"})
+            ws.send_json({"type": "end"})
+            messages, _ = _receive_utterance(ws)
+
+        words = [m for m in messages if m["type"] == "words"]
+        spoken = [w["word"] for msg in words for w in msg["words"]]
+        assert spoken == ["Streaming", "words", "arrive.", "Then", "more"]
+
+    def test_no_words_by_default(self, client):
+        with client.websocket_connect(WS_PATH) as ws:
+            ws.send_json({"input": "Hello there."})
+            messages, _ = _receive_utterance(ws)
+        assert not any(m["type"] == "words" for m in messages)